@@ -0,0 +1,161 @@
+from benchmarks.generator import ProgramGenerator
+from lpppy.compiler.main import Compiler
+from lpppy.compiler.stats import Stats
+from benchmarks.report import Report, Comparison
+from types import SimpleNamespace
+from statistics import median
+import sys
+
+
+class CompilerBenchmark:
+    phases: list[str] = ["lex", "parse", "codegen", "compile", "total"]
+    scales: dict[str, dict] = {
+        "small": dict(),
+        "medium": dict(
+            declarations=100,
+            procedures=10,
+            depth=3,
+            expression=6,
+            arraySize=100,
+            statements=6,
+        ),
+        "large": dict(
+            declarations=400,
+            procedures=40,
+            depth=3,
+            expression=12,
+            arraySize=1000,
+            statements=6,
+        ),
+    }
+    sweeps: dict[str, list] = {
+        "declarations": [50, 200, 800],
+        "procedures": [5, 20, 80],
+        "depth": [1, 3, 5],
+        "expression": [4, 16, 64],
+        "arraySize": [100, 10000, 1000000],
+        "statements": [10, 15, 20],
+    }
+    seed: int = 0
+    repeat: int = 5
+    output: str = None
+    selected: list[str] = []
+
+    def __init__(self, argv: list[str]) -> None:
+        self.selected = []
+        index = 0
+        while index < len(argv):
+            arg = argv[index]
+            if arg == "--seed":
+                index += 1
+                self.seed = int(argv[index])
+            elif arg == "--repeat":
+                index += 1
+                self.repeat = int(argv[index])
+            elif arg == "-o":
+                index += 1
+                self.output = argv[index]
+            elif arg in self.points():
+                self.selected.append(arg)
+            else:
+                print(
+                    "usage: python -m benchmarks.compiler [point ...] "
+                    "[--seed N] [--repeat N] [-o out.json]\n"
+                    "       python -m benchmarks.compiler compare <old.json> "
+                    "<new.json> [--tolerance 0.1]\n"
+                    f"points: {', '.join(self.points())}"
+                )
+                exit(2)
+            index += 1
+
+    def points(self) -> dict[str, dict]:
+        points = dict(self.scales)
+        for key, values in self.sweeps.items():
+            for value in values:
+                points[f"{key}={value}"] = {key: value}
+        return points
+
+    def compile(self, source: str, memory: bool) -> Compiler:
+        config = SimpleNamespace(memory=memory)
+        compiler = Compiler(source, config)
+        compiler.run()
+        compiler.compile()
+        return compiler
+
+    def measure(self, params: dict) -> dict:
+        source = ProgramGenerator(self.seed, **params).generate()
+
+        walls = {phase: [] for phase in self.phases}
+        for _ in range(self.repeat):
+            total = Stats()
+            with total.measure("total"):
+                compiler = self.compile(source, False)
+            # the optimization passes report phases of their own
+            for phase in self.phases:
+                if phase in compiler.stats.phases:
+                    walls[phase].append(compiler.stats.phases[phase]["wall"])
+            walls["total"].append(total.phases["total"]["wall"])
+
+        # memory is traced in separate runs so it doesn't skew the timings, and
+        # the end-to-end peak apart from the per-phase ones since tracemalloc
+        # only keeps a single peak
+        compiler = self.compile(source, True)
+        total = Stats(memory=True)
+        with total.measure("total"):
+            self.compile(source, False)
+        peaks = {phase: stats["peak"] for phase, stats in compiler.stats.phases.items()}
+        peaks["total"] = total.phases["total"]["peak"]
+
+        tokens = compiler.stats.phases["lex"]["tokens"]
+        return {
+            "params": params,
+            "lines": source.count("\n"),
+            "tokens": tokens,
+            "size": len(compiler.stdout),
+            "phases": {
+                phase: {"wall": median(walls[phase]), "peak": peaks[phase]}
+                for phase in self.phases
+            },
+            # the lex peak is mostly the token list itself
+            "perToken": {
+                "ns": median(walls["lex"]) / tokens * 1e9,
+                "bytes": peaks["lex"] / tokens,
+            },
+        }
+
+    def run(self) -> int:
+        # the parser recurses once per declaration and per routine
+        sys.setrecursionlimit(max(sys.getrecursionlimit(), 10000))
+        points = self.points()
+        results = {}
+
+        print(
+            f"{'point':<24} {'lines':>7} {'tokens':>8} "
+            + " ".join(f"{phase + ' (ms)':>13}" for phase in self.phases)
+            + f" {'peak (KiB)':>11} {'ns/token':>9} {'B/token':>8}"
+        )
+        for name in self.selected or points:
+            result = self.measure(points[name])
+            results[name] = result
+            print(
+                f"{name:<24} {result['lines']:7d} {result['tokens']:8d} "
+                + " ".join(
+                    f"{result['phases'][phase]['wall'] * 1000:13.3f}"
+                    for phase in self.phases
+                )
+                + f" {result['phases']['total']['peak'] / 1024:11.1f}"
+                + f" {result['perToken']['ns']:9.1f} {result['perToken']['bytes']:8.1f}",
+                flush=True,
+            )
+
+        output = Report.save(
+            "compiler", self.output, results, seed=self.seed, repeat=self.repeat
+        )
+        print(f"\nresultados salvos em {output}")
+        return 0
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["compare"]:
+        exit(Comparison(sys.argv[2:]).run())
+    exit(CompilerBenchmark(sys.argv[1:]).run())
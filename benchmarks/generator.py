@@ -0,0 +1,129 @@
+from random import Random
+
+
+class ProgramGenerator:
+    random: Random = None
+    declarations: int = 0
+    procedures: int = 0
+    depth: int = 0
+    expression: int = 0
+    arraySize: int = 0
+    statements: int = 0
+    scalars: list[str] = []
+    arrays: list[str] = []
+    counters: list[str] = []
+    routines: list[str] = []
+
+    def __init__(
+        self,
+        seed: int = 0,
+        declarations: int = 10,
+        procedures: int = 2,
+        depth: int = 2,
+        expression: int = 3,
+        arraySize: int = 10,
+        statements: int = 5,
+    ) -> None:
+        self.random = Random(seed)
+        self.declarations = declarations
+        self.procedures = procedures
+        self.depth = depth
+        self.expression = expression
+        self.arraySize = arraySize
+        self.statements = statements
+
+    def generate(self) -> str:
+        self.scalars = [f"X{i}" for i in range(self.declarations)]
+        self.arrays = [f"V{i}" for i in range(max(1, self.declarations // 4))]
+        self.counters = [f"I{i}" for i in range(self.depth + 1)]
+        self.routines = []
+
+        lines = ["programa sintetico"]
+        for index in range(self.procedures):
+            lines += self.genProcedure(f"P{index}")
+            self.routines.append(f"P{index}")
+
+        lines.append("var")
+        for scalar in self.scalars:
+            dtype = self.random.choice(["inteiro", "real"])
+            lines.append(f"  {scalar}: {dtype}")
+        for array in self.arrays:
+            dtype = self.random.choice(["inteiro", "real"])
+            lines.append(f"  {array}: conjunto[1..{self.arraySize}] de {dtype}")
+        lines.append(f"  {', '.join(self.counters)}: inteiro")
+
+        lines.append("início")
+        lines += self.genBlock(1, self.depth)
+        lines.append("fim")
+        return "\n".join(lines) + "\n"
+
+    def genProcedure(self, name: str) -> list[str]:
+        lines = [f"procedimento {name}", "var", "  L0, L1: inteiro", "início"]
+        lines += self.genBlock(1, self.depth)
+        lines.append("fim")
+        return lines
+
+    def genBlock(self, indent: int, depth: int) -> list[str]:
+        lines = []
+        for _ in range(self.statements):
+            lines += self.genStatement(indent, depth)
+        return lines
+
+    def genStatement(self, indent: int, depth: int) -> list[str]:
+        pad = "  " * indent
+        kinds = ["assign", "assign", "array", "escreva"]
+        if self.routines:
+            kinds.append("call")
+        if depth > 0:
+            kinds += ["se", "para", "enquanto"]
+
+        match self.random.choice(kinds):
+            case "assign":
+                return [f"{pad}{self.random.choice(self.scalars)} ← {self.genExp()}"]
+            case "array":
+                target = f"{self.random.choice(self.arrays)}[{self.genIndex()}]"
+                return [f"{pad}{target} ← {self.genExp()}"]
+            case "escreva":
+                return [f'{pad}escreva "valor", {self.random.choice(self.scalars)}']
+            case "call":
+                return [f"{pad}{self.random.choice(self.routines)}"]
+            case "se":
+                lines = [f"{pad}se ({self.genExp()} > {self.genOperand()}) então"]
+                lines += self.genBlock(indent + 1, depth - 1)
+                lines.append(f"{pad}senão")
+                lines += self.genBlock(indent + 1, depth - 1)
+                lines.append(f"{pad}fim_se")
+                return lines
+            case "para":
+                counter = self.counters[depth]
+                lines = [f"{pad}para {counter} de 1 até {self.arraySize} passo 1 faça"]
+                lines += self.genBlock(indent + 1, depth - 1)
+                lines.append(f"{pad}fim_para")
+                return lines
+            case "enquanto":
+                scalar = self.random.choice(self.scalars)
+                lines = [f"{pad}enquanto ({scalar} < {self.genOperand()}) faça"]
+                lines += self.genBlock(indent + 1, depth - 1)
+                lines.append(f"{pad}{scalar} ← {scalar} + 1")
+                lines.append(f"{pad}fim_enquanto")
+                return lines
+
+    def genIndex(self) -> str:
+        if self.random.random() < 0.5:
+            return str(self.random.randint(1, self.arraySize - 1))
+        return self.random.choice(self.counters)
+
+    def genOperand(self) -> str:
+        match self.random.choice(["number", "scalar", "array"]):
+            case "number":
+                return str(self.random.randint(1, 100))
+            case "scalar":
+                return self.random.choice(self.scalars)
+            case "array":
+                return f"{self.random.choice(self.arrays)}[{self.genIndex()}]"
+
+    def genExp(self) -> str:
+        exp = self.genOperand()
+        for _ in range(self.random.randint(1, self.expression)):
+            exp += f" {self.random.choice(['+', '-', '*'])} {self.genOperand()}"
+        return exp
@@ -0,0 +1,15 @@
+def main():
+    values = [0] * 3000
+    values[1] = 7
+    for i in range(2, 3000):
+        values[i] = (values[i - 1] * 1103 + 12345) % 65536
+
+    for i in range(1, 2999):
+        for j in range(i + 1, 3000):
+            if values[i] > values[j]:
+                values[i], values[j] = values[j], values[i]
+
+    print(values[1], values[1500], values[2999])
+
+
+main()
@@ -0,0 +1,28 @@
+from dataclasses import dataclass
+
+
+@dataclass(slots=True)
+class Cliente:
+    nome: str = ""
+    idade: int = 0
+    compras: int = 0
+    saldo: float = 0.0
+
+
+def main():
+    clientes = [Cliente() for _ in range(200000)]
+    for i, cliente in enumerate(clientes):
+        cliente.idade = 18 + i % 70
+        cliente.compras = i % 13
+        cliente.saldo = i % 1000 * 1.5
+    for cliente in clientes:
+        cliente.saldo = cliente.saldo * 1.01 + cliente.compras
+    soma = 0.0
+    for cliente in clientes:
+        soma += cliente.saldo
+    total = sum(cliente.compras for cliente in clientes)
+    idosos = sum(1 for cliente in clientes if cliente.idade >= 60)
+    print(soma, total, idosos)
+
+
+main()
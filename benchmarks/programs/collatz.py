@@ -0,0 +1,11 @@
+def main():
+    steps = 0
+    for i in range(1, 30000):
+        n = i
+        while n != 1:
+            n = n // 2 if n % 2 == 0 else 3 * n + 1
+            steps += 1
+    print(steps)
+
+
+main()
@@ -0,0 +1,9 @@
+def main():
+    total = 0
+    for i in range(300000):
+        point = [(i + d) % 100 for d in range(3)]
+        total += sum(coordinate * coordinate for coordinate in point) % 7
+    print(total)
+
+
+main()
@@ -0,0 +1,13 @@
+def accumulate(a, b, total):
+    total[1] += (a * a + b * b) % 97
+
+
+def main():
+    total = [0, 0]
+    for i in range(1, 1000):
+        for j in range(1, 1000):
+            accumulate(i, j, total)
+    print(total[1])
+
+
+main()
@@ -0,0 +1,30 @@
+def main():
+    n = 501
+    x = [i % 10 for i in range(n)]
+    a = [[(i + j) % 7 for j in range(n)] for i in range(n)]
+    b = [[(i * 3 + j) % 5 for j in range(n)] for i in range(n)]
+    c = [[0] * n for _ in range(n)]
+    for i in range(1, n):
+        for j in range(1, n):
+            s = 0
+            for k in range(1, n):
+                s += a[i][k] * b[k][j]
+            c[i][j] = s
+    t = [[0] * n for _ in range(n)]
+    for i in range(1, n):
+        for j in range(1, n):
+            t[i][j] = c[j][i]
+    y = [0] * n
+    for i in range(1, n):
+        s = 0
+        for j in range(1, n):
+            s += t[i][j] * x[j]
+        y[i] = s
+    print(c[1][1])
+    print(c[250][400])
+    print(t[400][250])
+    print(y[1])
+    print(y[500])
+
+
+main()
@@ -0,0 +1,11 @@
+def main():
+    a = [i % 17 for i in range(2000)]
+    b = [i % 13 for i in range(2000)]
+    total = 0
+    for i in range(1, 2000):
+        for j in range(1, 2000):
+            total += a[i] * b[j]
+    print(total)
+
+
+main()
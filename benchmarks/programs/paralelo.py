@@ -0,0 +1,15 @@
+def main():
+    total = 0
+    primo = [0] * 200000
+    for n in range(2, 200000):
+        d = 2
+        while d * d <= n and n % d:
+            d += 1
+        if d * d > n:
+            primo[n] = 1
+            total += 1
+    print(total)
+    print(primo[199999])
+
+
+main()
@@ -0,0 +1,12 @@
+def main():
+    total = 0
+    for n in range(2, 200000):
+        d = 2
+        while d * d <= n and n % d:
+            d += 1
+        if d * d > n:
+            total += 1
+    print(total)
+
+
+main()
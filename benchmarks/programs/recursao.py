@@ -0,0 +1,9 @@
+def main():
+    factorial = 1
+    for n in range(2, 1000001):
+        factorial = factorial * n % 1000000007
+    print(factorial)
+    print(sum(range(1000000)))
+
+
+main()
@@ -0,0 +1,12 @@
+def main():
+    composite = [0] * 2000000
+    total = 0
+    for i in range(2, 2000000):
+        if not composite[i]:
+            total += 1
+            for j in range(i * i, 2000000, i):
+                composite[j] = 1
+    print(total)
+
+
+main()
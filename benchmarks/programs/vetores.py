@@ -0,0 +1,11 @@
+def main():
+    x = [i % 1000 / 8 for i in range(1000001)]
+    y = [i % 7 + 0.5 for i in range(1000001)]
+    a = 2.5
+    z = [a * x[i] + y[i] * y[i] for i in range(1000001)]
+    print(z[1])
+    print(z[500000])
+    print(z[1000000])
+
+
+main()
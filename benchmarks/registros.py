@@ -0,0 +1,133 @@
+from lpppy.compiler.main import Compiler
+from benchmarks.report import Report, Comparison
+from types import SimpleNamespace
+from statistics import median
+import tracemalloc
+import timeit
+import sys
+
+source = """programa registros
+tipo
+  PONTO = registro
+    X, Y: real
+  fim_registro
+  ALUNO = registro
+    NOME: caractere
+    IDADE: inteiro
+    MEDIA: real
+    APROVADO: lógico
+  fim_registro
+  TURMA = registro
+    CODIGO: inteiro
+    NOTAS: conjunto[1..4] de real
+  fim_registro
+var
+  P: PONTO
+  A: ALUNO
+  T: TURMA
+início
+fim
+"""
+
+
+class RegistroBenchmark:
+    registros: list[str] = ["PONTO", "ALUNO", "TURMA"]
+    count: int = 100000
+    repeat: int = 5
+    output: str = None
+    selected: list[str] = []
+
+    def __init__(self, argv: list[str]) -> None:
+        self.selected = []
+        index = 0
+        while index < len(argv):
+            arg = argv[index]
+            if arg == "-n":
+                index += 1
+                self.count = int(argv[index])
+            elif arg == "--repeat":
+                index += 1
+                self.repeat = int(argv[index])
+            elif arg == "-o":
+                index += 1
+                self.output = argv[index]
+            elif arg in self.registros:
+                self.selected.append(arg)
+            else:
+                print(
+                    "usage: python -m benchmarks.registros [registro ...] "
+                    "[-n N] [--repeat N] [-o out.json]\n"
+                    "       python -m benchmarks.registros compare <old.json> "
+                    "<new.json> [--tolerance 0.1]\n"
+                    f"registros: {', '.join(self.registros)}"
+                )
+                exit(2)
+            index += 1
+        self.selected = self.selected or self.registros
+
+    def fill(self, registro: type, names: list[str]) -> list:
+        # every field written once, as a program that uses the registro does
+        instances = [registro() for _ in range(self.count)]
+        for instance in instances:
+            for name in names:
+                setattr(instance, name, getattr(instance, name))
+        return instances
+
+    def measure(self, registro: type) -> dict:
+        names = [name for name in dir(registro) if not name.startswith("_")]
+        phases = {}
+        for phase, build in (
+            ("build", lambda: [registro() for _ in range(self.count)]),
+            ("fill", lambda: self.fill(registro, names)),
+        ):
+            walls = []
+            for _ in range(self.repeat):
+                start = timeit.default_timer()
+                instances = build()
+                walls.append(timeit.default_timer() - start)
+                del instances
+
+            tracemalloc.start()
+            instances = build()
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            del instances
+            phases[phase] = {"wall": median(walls), "peak": peak}
+        return phases
+
+    def run(self) -> int:
+        compiler = Compiler(source, SimpleNamespace())
+        compiler.run()
+        namespace = {"__name__": "__main__"}
+        exec(compiler.compile("registros.lpp"), namespace)
+
+        results = {}
+        print(
+            f"{'registro':<12} {'fase':<6} {'tempo (ms)':>11} {'ns/registro':>12} "
+            f"{'B/registro':>11}"
+        )
+        for name in self.selected:
+            phases = self.measure(namespace[name])
+            results[name] = {
+                "params": {"registro": name, "n": self.count},
+                "phases": phases,
+            }
+            for phase, stats in phases.items():
+                print(
+                    f"{name:<12} {phase:<6} {stats['wall'] * 1000:11.3f} "
+                    f"{stats['wall'] / self.count * 1e9:12.1f} "
+                    f"{stats['peak'] / self.count:11.1f}",
+                    flush=True,
+                )
+
+        output = Report.save(
+            "registros", self.output, results, repeat=self.repeat, n=self.count
+        )
+        print(f"\nresultados salvos em {output}")
+        return 0
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["compare"]:
+        exit(Comparison(sys.argv[2:]).run())
+    exit(RegistroBenchmark(sys.argv[1:]).run())
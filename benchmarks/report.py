@@ -0,0 +1,82 @@
+from datetime import datetime
+from pathlib import Path
+import subprocess
+import platform
+import json
+
+
+class Report:
+    def commit() -> str:
+        try:
+            return subprocess.run(
+                ["git", "rev-parse", "--short", "HEAD"],
+                capture_output=True,
+                text=True,
+                cwd=Path(__file__).parent,
+            ).stdout.strip()
+        except OSError:
+            return ""
+
+    def save(name: str, output: str, results: dict, **extra) -> str:
+        report = {
+            "commit": Report.commit(),
+            "date": datetime.today().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            **extra,
+            "results": results,
+        }
+        output = output or f"{name}-{report['commit'] or 'local'}.json"
+        Path(output).write_text(json.dumps(report, indent=2))
+        return output
+
+
+class Comparison:
+    old: dict = {}
+    new: dict = {}
+    tolerance: float = 0.1
+
+    def __init__(self, argv: list[str]) -> None:
+        args = []
+        index = 0
+        while index < len(argv):
+            if argv[index] == "--tolerance":
+                index += 1
+                self.tolerance = float(argv[index])
+            else:
+                args.append(argv[index])
+            index += 1
+
+        if len(args) != 2:
+            print(
+                "usage: python -m benchmarks.<suite> compare <old.json> "
+                "<new.json> [--tolerance 0.1]"
+            )
+            exit(2)
+
+        self.old = json.loads(Path(args[0]).read_text())
+        self.new = json.loads(Path(args[1]).read_text())
+
+    def run(self) -> int:
+        regressions = 0
+        print(f"{self.old['commit'] or 'old'} -> {self.new['commit'] or 'new'}")
+        print(
+            f"{'point':<24} {'phase':<8} {'old (ms)':>10} {'new (ms)':>10} {'ratio':>7}"
+        )
+        for name, new in self.new["results"].items():
+            old = self.old["results"].get(name)
+            if not old or old["params"] != new["params"]:
+                continue
+            for phase, stats in new["phases"].items():
+                if phase not in old["phases"]:
+                    continue
+                before = old["phases"][phase]["wall"]
+                ratio = stats["wall"] / before if before else 1.0
+                flag = ""
+                if ratio > 1 + self.tolerance:
+                    flag = "  regressão"
+                    regressions += 1
+                print(
+                    f"{name:<24} {phase:<8} {before * 1000:10.3f} "
+                    f"{stats['wall'] * 1000:10.3f} {ratio:7.2f}{flag}"
+                )
+        return 1 if regressions else 0
@@ -0,0 +1,142 @@
+from lpppy.compiler.main import Compiler
+from lpppy.native import NativeBuild
+from benchmarks.report import Report, Comparison
+from contextlib import redirect_stdout
+from types import SimpleNamespace, CodeType
+from statistics import median, geometric_mean
+from pathlib import Path
+import subprocess
+import timeit
+import sys
+import io
+import os
+
+
+class RuntimeBenchmark:
+    directory: Path = Path(__file__).parent / "programs"
+    repeat: int = 3
+    output: str = None
+    config: SimpleNamespace = None
+    selected: list[str] = []
+
+    def __init__(self, argv: list[str]) -> None:
+        self.selected = []
+        # recursao nests a million calls, past the Python stack at -O0
+        self.config = SimpleNamespace(depth=1000000)
+        programs = [path.stem for path in sorted(self.directory.glob("*.lpp"))]
+        index = 0
+        while index < len(argv):
+            arg = argv[index]
+            if arg == "--repeat":
+                index += 1
+                self.repeat = int(argv[index])
+            elif arg == "-o":
+                index += 1
+                self.output = argv[index]
+            elif arg in ("-O0", "-O1", "-O2"):
+                self.config.optimize = int(arg[2])
+            elif arg == "--native":
+                self.config.native = True
+            elif arg == "--workers":
+                # paralelo loops run in this many processes
+                index += 1
+                self.config.workers = int(argv[index])
+                os.environ["LPPPY_WORKERS"] = argv[index]
+            elif arg in programs:
+                self.selected.append(arg)
+            else:
+                print(
+                    "usage: python -m benchmarks.runtime [program ...] "
+                    "[--repeat N] [-O0|-O1|-O2] [--native] [--workers N] "
+                    "[-o out.json]\n"
+                    "       python -m benchmarks.runtime compare <old.json> "
+                    "<new.json> [--tolerance 0.1]\n"
+                    f"programs: {', '.join(programs)}"
+                )
+                exit(2)
+            index += 1
+        self.selected = self.selected or programs
+
+    def execute(self, code: CodeType | Path) -> tuple[float, str]:
+        if isinstance(code, Path):
+            start = timeit.default_timer()
+            result = subprocess.run([str(code)], capture_output=True, text=True)
+            return timeit.default_timer() - start, result.stdout
+
+        stdout = io.StringIO()
+        with redirect_stdout(stdout):
+            start = timeit.default_timer()
+            exec(code, {"__name__": "__main__"})
+            wall = timeit.default_timer() - start
+        return wall, stdout.getvalue()
+
+    def measure(self, name: str) -> dict:
+        source = self.directory / f"{name}.lpp"
+        baseline = self.directory / f"{name}.py"
+
+        compiler = Compiler(source.read_text(), self.config)
+        compiler.run()
+        codes = {
+            "lpp": compiler.compile(str(source)),
+            "python": compile(baseline.read_text(), str(baseline), "exec"),
+        }
+        if compiler.native:
+            build = NativeBuild()
+            codes["lpp"] = build.build(compiler.native) or codes["lpp"]
+            if build.error:
+                print(f"{name}: {build.error}", file=sys.stderr)
+        elif compiler.nativeError:
+            print(f"{name}: {compiler.nativeError}", file=sys.stderr)
+
+        walls = {phase: [] for phase in codes}
+        outputs = {}
+        for _ in range(self.repeat):
+            for phase, code in codes.items():
+                wall, outputs[phase] = self.execute(code)
+                walls[phase].append(wall)
+
+        phases = {phase: {"wall": median(walls[phase])} for phase in codes}
+        return {
+            "params": {"program": name},
+            "phases": phases,
+            "ratio": phases["lpp"]["wall"] / phases["python"]["wall"],
+            "matches": outputs["lpp"].split() == outputs["python"].split(),
+        }
+
+    def run(self) -> int:
+        results = {}
+        mismatches = 0
+
+        print(f"{'program':<16} {'lpp (ms)':>10} {'python (ms)':>12} {'slowdown':>9}")
+        for name in self.selected:
+            result = self.measure(name)
+            results[name] = result
+            flag = ""
+            if not result["matches"]:
+                flag = "  saída diferente"
+                mismatches += 1
+            print(
+                f"{name:<16} {result['phases']['lpp']['wall'] * 1000:10.3f} "
+                f"{result['phases']['python']['wall'] * 1000:12.3f} "
+                f"{result['ratio']:8.2f}x{flag}",
+                flush=True,
+            )
+
+        mean = geometric_mean(result["ratio"] for result in results.values())
+        print(f"{'média geométrica':<40} {mean:8.2f}x")
+
+        output = Report.save(
+            "runtime",
+            self.output,
+            results,
+            repeat=self.repeat,
+            config=vars(self.config),
+        )
+        print(f"\nresultados salvos em {output}")
+        return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["compare"]:
+        exit(Comparison(sys.argv[2:]).run())
+    exit(RuntimeBenchmark(sys.argv[1:]).run())
@@ -0,0 +1,154 @@
+from lpppy.compiler.main import Compiler
+from lpppy.compiler.error import CompileError
+from concurrent.futures import ProcessPoolExecutor
+from importlib.util import MAGIC_NUMBER, source_hash
+from pathlib import Path
+import hashlib
+import marshal
+import timeit
+import glob
+import json
+import sys
+import os
+
+
+class Builder:
+    files: list[Path] = []
+    base: Path = None
+    outdir: Path = Path("build")
+    jobs: int = 1
+    manifestName: str = ".lpppy-build.json"
+
+    def __init__(self, argv: list[str]) -> None:
+        args = []
+        index = 0
+        while index < len(argv):
+            if argv[index] == "-j":
+                index += 1
+                self.jobs = int(argv[index])
+            elif argv[index].startswith("-j"):
+                self.jobs = int(argv[index][2:])
+            elif argv[index] == "-o":
+                index += 1
+                self.outdir = Path(argv[index])
+            else:
+                args.append(argv[index])
+            index += 1
+
+        if not args:
+            sys.tracebacklimit = 0
+            print("usage: lpppy build <dir-or-glob> ... [-j N] [-o outdir]")
+            exit(2)
+
+        files = set()
+        for arg in args:
+            if Path(arg).is_dir():
+                files.update(Path(arg).rglob("*.lpp"))
+            else:
+                files.update(Path(path) for path in glob.glob(arg, recursive=True))
+        self.files = sorted(file.resolve() for file in files if file.is_file())
+        if self.files:
+            self.base = Path(os.path.commonpath([file.parent for file in self.files]))
+
+    def fingerprint(self) -> str:
+        # a new compiler invalidates everything it built before
+        digest = hashlib.sha256()
+        package = Path(__file__).parent / "compiler"
+        for path in sorted(package.glob("*.py")):
+            digest.update(path.read_bytes())
+        return digest.hexdigest()
+
+    def run(self) -> int:
+        start = timeit.default_timer()
+        manifestFile = self.outdir / self.manifestName
+        manifest = {}
+        if manifestFile.exists():
+            manifest = json.loads(manifestFile.read_text())
+        fingerprint = self.fingerprint()
+        if manifest.get("compiler") != fingerprint:
+            manifest = {"compiler": fingerprint, "files": {}}
+
+        tasks = []
+        digests = {}
+        skipped = 0
+        for file in self.files:
+            digest = hashlib.sha256(file.read_bytes()).hexdigest()
+            target = self.outdir / file.relative_to(self.base).with_suffix(".py")
+            if (
+                manifest["files"].get(str(file)) == digest
+                and target.exists()
+                and target.with_suffix(".pyc").exists()
+                and target.with_suffix(".map.json").exists()
+            ):
+                skipped += 1
+                continue
+            tasks.append((file, target))
+            digests[file] = digest
+
+        if self.jobs > 1 and len(tasks) > 1:
+            with ProcessPoolExecutor(self.jobs, initializer=warm) as pool:
+                results = list(pool.map(buildFile, tasks, chunksize=16))
+        else:
+            warm()
+            results = [buildFile(task) for task in tasks]
+
+        failures = []
+        for (file, target), error in zip(tasks, results):
+            if error:
+                manifest["files"].pop(str(file), None)
+                failures.append((file, error))
+            else:
+                manifest["files"][str(file)] = digests[file]
+
+        self.outdir.mkdir(parents=True, exist_ok=True)
+        manifestFile.write_text(json.dumps(manifest, indent=2))
+        self.report(failures, len(tasks), skipped, timeit.default_timer() - start)
+        return 1 if failures else 0
+
+    def report(
+        self, failures: list[tuple], built: int, skipped: int, wall: float
+    ) -> None:
+        for file, error in failures:
+            print(f"{file.relative_to(self.base)}: {error}")
+        if failures:
+            print()
+
+        compiled = built - len(failures)
+        print(
+            f"{compiled} compiled, {skipped} unchanged, {len(failures)} failed"
+            f" in {wall:.3f} s ({built / wall if wall else 0:.1f} files/s,"
+            f" -j {self.jobs}) -> {self.outdir}"
+        )
+
+
+def warm() -> None:
+    # the first compilation in a process pays for importing the compiler, so
+    # each worker does it once before taking real work
+    Compiler("programa aquecimento\nvar\n  X: inteiro\ninício\n  X ← 1\nfim\n").run()
+
+
+def buildFile(task: tuple) -> str:
+    file, target = task
+    try:
+        compiler = Compiler(file.read_text())
+        compiler.run()
+        code = compiler.compile(str(target))
+    except CompileError as error:
+        return error.report().split("\n")[0]
+    except Exception as error:
+        return f"{type(error).__name__}: {error}"
+
+    program = compiler.stdout.encode()
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_bytes(program)
+    # checked hash-based pyc (PEP 552), so it stays valid wherever the pair is
+    # copied to
+    target.with_suffix(".pyc").write_bytes(
+        MAGIC_NUMBER
+        + (0b11).to_bytes(4, "little")
+        + source_hash(program)
+        + marshal.dumps(code)
+    )
+    # lpppy run maps the tracebacks of the built program through it
+    target.with_suffix(".map.json").write_text(compiler.sourceMap.dump(str(file)))
+    return ""
@@ -0,0 +1,146 @@
+from pathlib import Path
+from types import CodeType
+from typing import Callable
+import traceback
+import hashlib
+import json
+import sys
+import io
+import os
+
+
+class Tee(io.TextIOBase):
+    def __init__(self, *streams) -> None:
+        self.streams = streams
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        for stream in self.streams:
+            stream.write(text)
+        return len(text)
+
+    def flush(self) -> None:
+        for stream in self.streams:
+            stream.flush()
+
+
+class ResultCache:
+    path: Path = None
+    maxSize: int = 0
+    nondeterministic: set[str] = {
+        "__import__",
+        "datetime",
+        "random",
+        "secrets",
+        "globals",
+        "locals",
+        "time",
+        "uuid",
+        "eval",
+        "exec",
+        "hash",
+        "open",
+        "vars",
+        "id",
+        "os",
+        "sys",
+    }
+
+    def __init__(self, path: str = None, maxSize: int = None) -> None:
+        self.path = Path(
+            path
+            or os.environ.get("LPPPY_CACHE_DIR")
+            or Path.home() / ".cache" / "lpppy" / "results"
+        )
+        self.maxSize = int(maxSize or os.environ.get("LPPPY_CACHE_SIZE", 64 << 20))
+
+    def isDeterministic(self, code: CodeType) -> bool:
+        if self.nondeterministic.intersection(code.co_names):
+            return False
+        for const in code.co_consts:
+            if isinstance(const, CodeType) and not self.isDeterministic(const):
+                return False
+        return True
+
+    def key(self, source: str, stdin: str) -> str:
+        digest = hashlib.sha256()
+        digest.update(hashlib.sha256(source.encode()).digest())
+        digest.update(hashlib.sha256(stdin.encode()).digest())
+        return digest.hexdigest()
+
+    def get(self, key: str) -> dict:
+        entry = self.path / f"{key}.json"
+        try:
+            result = json.loads(entry.read_text())
+        except (OSError, ValueError):
+            return None
+        os.utime(entry)
+        return result
+
+    def put(self, key: str, result: dict) -> None:
+        self.path.mkdir(parents=True, exist_ok=True)
+        entry = self.path / f"{key}.json"
+        temp = entry.with_suffix(f".{os.getpid()}.tmp")
+        temp.write_text(json.dumps(result))
+        os.replace(temp, entry)
+        self.evict()
+
+    def evict(self) -> None:
+        entries = []
+        for entry in self.path.glob("*.json"):
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry))
+
+        size = sum(entry[1] for entry in entries)
+        for _, entrySize, entry in sorted(entries):
+            if size <= self.maxSize:
+                break
+            entry.unlink(missing_ok=True)
+            size -= entrySize
+
+    def run(self, source: str, code: CodeType, format: Callable = None) -> int:
+        stdin = sys.stdin.read()
+        key = self.key(source, stdin)
+
+        result = self.get(key)
+        if result:
+            sys.stdout.write(result["stdout"])
+            sys.stderr.write(result["stderr"])
+            return result["status"]
+
+        stdout, stderr = io.StringIO(), io.StringIO()
+        status = 0
+
+        restore = sys.stdin, sys.stdout
+        sys.stdin, sys.stdout = io.StringIO(stdin), Tee(sys.stdout, stdout)
+        try:
+            exec(code, {"__name__": "__main__"})
+        except SystemExit as stop:
+            if isinstance(stop.code, int):
+                status = stop.code
+            else:
+                status = int(stop.code is not None)
+        except Exception as error:
+            if format:
+                stderr.write(format(error))
+            else:
+                stderr.write("".join(traceback.format_exception(error)))
+            status = 1
+        finally:
+            sys.stdin, sys.stdout = restore
+
+        sys.stderr.write(stderr.getvalue())
+        self.put(
+            key,
+            {
+                "stdout": stdout.getvalue(),
+                "stderr": stderr.getvalue(),
+                "status": status,
+            },
+        )
+        return status
@@ -0,0 +1,1007 @@
+from lpppy.compiler.symtab import Symtab
+from lpppy.compiler.token import Token, TokenKeys, TokenTypes
+from lpppy.compiler.error import Error, ErrorTypes
+import keyword
+import re
+
+
+class CCodeGen:
+    # C99 with the same output as the generated Python, or a CompileError
+    # (native_unsupported) for whatever could behave differently
+    symtab: Symtab = None
+    source: list[str] = []
+    tokens: list[Token] = []
+    index: int = 0
+    stdout: str = ""
+    level: int = 0
+    programName: str = ""
+    variables: dict[str, tuple[str, tuple]] = {}
+    scope: dict[str, tuple[str, tuple]] = None
+    routines: dict[str, list[str]] = {}
+    # the calls each routine makes, to find recursion
+    calls: dict[str, list[Token]] = {}
+    routine: str = None
+    records: list[str] = []
+    loops: int = 0
+    kinds: dict[str, str] = {
+        TokenKeys.inteiro: "int",
+        TokenKeys.real: "float",
+        TokenKeys.caractere: "str",
+        TokenKeys.logico: "bool",
+    }
+    # conjuntos de lógico hold ints, as [0] * N does
+    elements: dict[str, str] = {
+        TokenKeys.inteiro: "int",
+        TokenKeys.logico: "int",
+        TokenKeys.real: "float",
+        TokenKeys.caractere: "str",
+    }
+    ctypes: dict[str, str] = {
+        "int": "long long",
+        "float": "double",
+        "bool": "int",
+        "str": "const char *",
+    }
+    comparisons: dict[str, str] = {
+        TokenKeys.grater: ">",
+        TokenKeys.graterEq: ">=",
+        TokenKeys.less: "<",
+        TokenKeys.lessEq: "<=",
+        TokenKeys.NotEq: "!=",
+        TokenKeys.equal: "==",
+    }
+    # names the generated Python relies on
+    reserved: set[str] = {"print", "range", "input", "int", "float", "dataclass"}
+    identifier: re.Pattern = re.compile(r"[^\W\d]\w*")
+    integer: re.Pattern = re.compile(r"0|[1-9][0-9]*")
+    decimal: re.Pattern = re.compile(r"[0-9]+\.[0-9]+")
+
+    def __init__(self, symtab: Symtab, source: str = "") -> None:
+        self.symtab = symtab
+        self.source = source.split("\n")
+        self.variables = {}
+        self.routines = {}
+        self.calls = {}
+        self.records = []
+
+    def run(self, tokens: list[Token]) -> None:
+        self.tokens = tokens
+        self.gen()
+
+    def fail(self, token: Token) -> None:
+        Error(ErrorTypes.native_unsupported, token)
+
+    def name(self, token: Token, prefix: str = "v") -> str:
+        if (
+            not self.identifier.fullmatch(token.key)
+            or keyword.iskeyword(token.key)
+            or token.key in self.reserved
+        ):
+            self.fail(token)
+        return self.mangle(token.key, prefix)
+
+    def mangle(self, key: str, prefix: str = "v") -> str:
+        return f"{prefix}_" + "".join(
+            (
+                char
+                if char.isascii() and char.isalnum()
+                else "__" if char == "_" else f"_u{ord(char):x}_"
+            )
+            for char in key
+        )
+
+    def string(self, text: str) -> str:
+        escaped = "".join(
+            (
+                f"\\{char}"
+                if char in '\\"?'
+                else (
+                    f"\\{ord(char):03o}"
+                    if char.isascii() and not char.isprintable()
+                    else char
+                )
+            )
+            for char in text
+        )
+        return f'"{escaped}"'
+
+    def gen(self) -> None:
+        tokens = self.tokens
+        self.programName = tokens[0].key
+        self.index = 1
+
+        types = ""
+        if tokens[self.index].type == TokenTypes.tipo:
+            types = self.genRegistro()
+
+        units = []
+        while tokens[self.index].type in (TokenTypes.procedimento, TokenTypes.funcao):
+            units.append(self.declareRoutine())
+
+        if tokens[self.index].type != TokenTypes.var:
+            self.fail(tokens[self.index])
+        self.index += 1
+        self.declare(self.variables, TokenTypes.inicio)
+        main = self.index
+
+        self.stdout = f"/* programa {self.programName} */\n"
+        self.stdout += self.prelude.replace(
+            "/* source */",
+            ",\n\t".join(self.string(line.strip()) for line in [""] + self.source),
+        )
+        self.stdout += types
+        strings = []
+        for name, (kind, dims) in self.variables.items():
+            self.stdout += f"static {self.declaration(name, kind, dims)};\n"
+            if kind == "str" and dims:
+                count = " * ".join(str(size) for size in dims)
+                first = "[0]" * len(dims)
+                strings.append(f"lpp_strings(&{self.mangle(name)}{first}, {count});")
+
+        for name, params, scope, start in units:
+            arguments = ", ".join(
+                f"{self.ctypes[kind]} {self.name(param)}" for param, kind in params
+            )
+            self.stdout += (
+                f"static void {self.name(name, 'r')}({arguments or 'void'});\n"
+            )
+
+        for unit in units:
+            self.genRoutine(*unit)
+        self.checkRecursion()
+
+        self.scope = None
+        self.routine = None
+        self.index = main + 1
+        self.stdout += "\nint main(int argc, char **argv)\n{\n"
+        self.stdout += "\tif (argc > 1)\n\t\tlpp_file = argv[1];\n"
+        for line in strings:
+            self.stdout += f"\t{line}\n"
+        self.level = 1
+        self.genBlock()
+        if self.tokens[self.index].type != TokenTypes.fim:
+            self.fail(self.tokens[self.index])
+        self.stdout += "\treturn 0;\n}\n"
+
+    def declaration(self, name: str, kind: str, dims: tuple, prefix: str = "v") -> str:
+        ctype = self.ctypes.get(kind) or self.mangle(kind, "t")
+        storage = "".join(f"[{max(size, 1)}]" for size in dims)
+        if prefix == "v" and not dims:
+            initial = {"int": "0", "float": "0.0", "bool": "0", "str": '""'}.get(kind)
+            if initial:
+                storage += f" = {initial}"
+        return f"{ctype} {self.mangle(name, prefix)}{storage}"
+
+    def size(self, token: Token) -> int:
+        if token.type != TokenTypes.numb or not self.integer.fullmatch(token.key):
+            self.fail(token)
+        return int(token.key)
+
+    def declare(self, scope: dict, last: TokenTypes) -> None:
+        tokens = self.tokens
+        while tokens[self.index].type != last:
+            names = [tokens[self.index]]
+            while tokens[self.index + 1].type == TokenTypes.comma:
+                self.index += 2
+                names.append(tokens[self.index])
+            self.index += 1
+
+            token = tokens[self.index]
+            if token.key == TokenKeys.conjunto:
+                size = self.size(tokens[self.index + 3])
+                if tokens[self.index + 4].type == TokenTypes.comma:
+                    if len(names) > 1:
+                        self.fail(token)
+                    dims, element = (size, size), tokens[self.index + 8]
+                    self.index += 9
+                else:
+                    dims, element = (size,), tokens[self.index + 5]
+                    self.index += 6
+                if element.key not in self.elements:
+                    self.fail(element)
+                kind = self.elements[element.key]
+            elif token.key in self.kinds:
+                kind, dims = self.kinds[token.key], ()
+                self.index += 1
+            elif token.key in self.records:
+                kind, dims = token.key, ()
+                self.index += 1
+            else:
+                self.fail(token)
+
+            for name in names:
+                self.name(name)
+                if name.key in scope:
+                    self.fail(name)
+                scope[name.key] = (kind, dims)
+
+    def genRegistro(self) -> str:
+        tokens = self.tokens
+        types = ""
+        self.index += 1
+        while tokens[self.index].type != TokenTypes.var:
+            token = tokens[self.index]
+            if tokens[self.index + 2].type != TokenTypes.registro:
+                self.fail(token)
+            self.index += 3
+            fields = {}
+            self.declare(fields, TokenTypes.fimreg)
+            self.index += 1
+
+            types += "\ntypedef struct {\n"
+            for name, (kind, dims) in fields.items():
+                types += f"\t{self.declaration(name, kind, dims, 'f')};\n"
+            if not fields:
+                types += "\tchar empty;\n"
+            types += f"}} {self.name(token, 't')};\n"
+            self.records.append(token.key)
+        return types
+
+    def declareRoutine(self) -> tuple:
+        tokens = self.tokens
+        routine, token = tokens[self.index], tokens[self.index + 1]
+        params = []
+        if tokens[self.index].type == TokenTypes.procedimento:
+            self.index += 1
+        else:
+            # (A, B: real, C: inteiro)
+            self.index += 3
+            names = []
+            while tokens[self.index].type != TokenTypes.rParen:
+                if tokens[self.index].type == TokenTypes.id:
+                    names.append(tokens[self.index])
+                elif tokens[self.index].key in self.kinds:
+                    params += [
+                        (name, self.kinds[tokens[self.index].key]) for name in names
+                    ]
+                    names = []
+                elif tokens[self.index].type != TokenTypes.comma:
+                    self.fail(tokens[self.index])
+                self.index += 1
+            if names:
+                self.fail(names[0])
+
+        # the Python backend skips the token after the name or the
+        # parameters, taking it for var
+        skipped = tokens[self.index + 1]
+        if skipped.type != TokenTypes.var and (
+            skipped.type != TokenTypes.dType
+            or tokens[self.index + 2].type == TokenTypes.var
+            or routine.type == TokenTypes.procedimento
+        ):
+            self.fail(skipped)
+        self.index += 2
+        if token.key in self.routines or self.symtab.getType(token.key) not in (
+            TokenTypes.procedimento,
+            TokenTypes.funcao,
+        ):
+            self.fail(token)
+        self.routines[token.key] = [kind for name, kind in params]
+
+        scope = {name.key: (kind, ()) for name, kind in params}
+        if len(scope) < len(params):
+            self.fail(token)
+        start = self.index
+        self.declare(scope, TokenTypes.inicio)
+        while tokens[self.index].type != TokenTypes.fim:
+            self.index += 1
+        self.index += 1
+        return token, params, scope, start
+
+    def genRoutine(self, token: Token, params: list, scope: dict, start: int) -> None:
+        self.scope = scope
+        self.routine = token.key
+        arguments = ", ".join(
+            f"{self.ctypes[kind]} {self.name(param)}" for param, kind in params
+        )
+        self.stdout += (
+            f"\nstatic void {self.name(token, 'r')}({arguments or 'void'})\n{{\n"
+        )
+        self.stdout += "\tconst char *caller = lpp_frame;\n"
+        arrays = []
+        for name, (kind, dims) in scope.items():
+            if any(name == param.key for param, _ in params):
+                continue
+            if not dims:
+                self.stdout += f"\t{self.declaration(name, kind, dims)};\n"
+                continue
+            # a new list on every call
+            ctype = self.ctypes[kind]
+            self.stdout += (
+                f"\t{ctype} *{self.mangle(name)} ="
+                f" lpp_alloc({dims[0]}, sizeof({ctype}));\n"
+            )
+            if kind == "str":
+                self.stdout += f"\tlpp_strings({self.mangle(name)}, {dims[0]});\n"
+            arrays.append(name)
+
+        self.stdout += f"\tlpp_frame = {self.string(token.key)};\n"
+        self.index = start
+        while self.tokens[self.index].type != TokenTypes.inicio:
+            self.index += 1
+        self.index += 1
+        self.level = 1
+        self.genBlock()
+        if self.tokens[self.index].type != TokenTypes.fim:
+            self.fail(self.tokens[self.index])
+        for name in arrays:
+            self.stdout += f"\tfree((void *){self.mangle(name)});\n"
+        self.stdout += "\tlpp_frame = caller;\n}\n"
+
+    def emit(self, token: Token, code: str) -> None:
+        self.stdout += "\t" * self.level + f"lpp_line = {token.line}; {code}\n"
+
+    def genBlock(self) -> None:
+        while True:
+            token = self.tokens[self.index]
+            match token.type:
+                case (
+                    TokenTypes.fim
+                    | TokenTypes.fimse
+                    | TokenTypes.senao
+                    | TokenTypes.fimpara
+                    | TokenTypes.fimenq
+                ):
+                    return
+                case TokenTypes.leia:
+                    self.genLeia()
+                case TokenTypes.escreva:
+                    self.genEscreva()
+                case TokenTypes.id:
+                    self.genId()
+                case TokenTypes.se:
+                    self.genSe()
+                case TokenTypes.para:
+                    self.genPara()
+                case TokenTypes.enquanto:
+                    self.genEnquanto()
+                case _:
+                    self.fail(token)
+
+    def expect(self, type: TokenTypes) -> None:
+        if self.tokens[self.index].type != type:
+            self.fail(self.tokens[self.index])
+        self.index += 1
+
+    def genSe(self) -> None:
+        token = self.tokens[self.index]
+        self.index += 1
+        condition = self.truth(*self.genExp())
+        self.expect(TokenTypes.entao)
+        self.emit(token, f"if ({condition}) {{")
+        self.level += 1
+        self.genBlock()
+        if self.tokens[self.index].type == TokenTypes.senao:
+            self.index += 1
+            self.stdout += "\t" * (self.level - 1) + "} else {\n"
+            self.genBlock()
+        self.expect(TokenTypes.fimse)
+        self.level -= 1
+        self.stdout += "\t" * self.level + "}\n"
+
+    def genEnquanto(self) -> None:
+        token = self.tokens[self.index]
+        self.index += 1
+        condition = self.truth(*self.genExp())
+        self.expect(TokenTypes.faca)
+        # the condition is checked again after the body's lines
+        self.stdout += (
+            "\t" * self.level + f"while ((lpp_line = {token.line}, {condition})) {{\n"
+        )
+        self.level += 1
+        self.genBlock()
+        self.expect(TokenTypes.fimenq)
+        self.level -= 1
+        self.stdout += "\t" * self.level + "}\n"
+
+    def genPara(self) -> None:
+        # range(start, stop, step), with stop and step numbers
+        tokens = self.tokens
+        token = tokens[self.index]
+        counter = self.target(tokens[self.index + 1], "int")
+        self.index += 2
+        if tokens[self.index].type == TokenTypes.numb:
+            start, kind = self.genLiteral(tokens[self.index])
+            self.index += 1
+        else:
+            start, kind = self.genExp()
+        if kind not in ("int", "bool"):
+            self.fail(token)
+        self.expect(TokenTypes.ate)
+        stop = self.size(tokens[self.index])
+        self.index += 1
+        self.expect(TokenTypes.passo)
+        step = self.size(tokens[self.index])
+        self.index += 1
+        self.expect(TokenTypes.faca)
+        # paralelo loops run in order
+        if tokens[self.index].type == TokenTypes.paralelo:
+            self.index += 1
+        if step == 0 or stop > 2**63 - 1 - step:
+            self.fail(token)
+
+        self.loops += 1
+        loop = f"lpp_for{self.loops}"
+        self.emit(
+            token,
+            f"for (long long {loop} = {start}; {loop} < {stop}LL;"
+            f" {loop} += {step}LL) {{",
+        )
+        self.level += 1
+        self.stdout += "\t" * self.level + f"{counter} = {loop};\n"
+        self.genBlock()
+        self.expect(TokenTypes.fimpara)
+        self.level -= 1
+        self.stdout += "\t" * self.level + "}\n"
+
+    def lookup(self, token: Token) -> tuple[str, tuple]:
+        if token.type != TokenTypes.id:
+            self.fail(token)
+        if self.scope is not None and token.key in self.scope:
+            return self.scope[token.key]
+        if token.key not in self.variables:
+            self.fail(token)
+        return self.variables[token.key]
+
+    def target(self, token: Token, kind: str) -> str:
+        # a routine only assigns its own names: Python makes any other one
+        # local to it
+        if self.scope is not None and token.key not in self.scope:
+            self.fail(token)
+        if self.lookup(token) != (kind, ()):
+            self.fail(token)
+        return self.name(token)
+
+    def genSubscript(self, token: Token, store: bool = False) -> tuple[str, str]:
+        # A[I] or A[I, J], from the token after the name
+        kind, dims = self.lookup(token)
+        self.expect(TokenTypes.lSquare)
+        indexes = [self.tokens[self.index]]
+        self.index += 1
+        if self.tokens[self.index].type == TokenTypes.comma:
+            indexes.append(self.tokens[self.index + 1])
+            self.index += 2
+        self.expect(TokenTypes.rSquare)
+        if len(indexes) != len(dims):
+            self.fail(token)
+
+        code = self.name(token)
+        for position, (index, size) in enumerate(zip(indexes, dims)):
+            last = store and position == len(dims) - 1
+            if index.type == TokenTypes.numb:
+                value = self.size(index)
+                if value < size:
+                    code += f"[{value}]"
+                    continue
+                subscript = f"{value}LL"
+            elif self.lookup(index)[1] or self.lookup(index)[0] not in ("int", "bool"):
+                self.fail(index)
+            else:
+                subscript = self.name(index)
+            code += f"[lpp_index({subscript}, {size}, {int(last)})]"
+        return code, kind
+
+    def genLiteral(self, token: Token) -> tuple[str, str]:
+        if token.type == TokenTypes.str:
+            text = token.key[1:-1]
+            if len(token.key) < 2 or not token.key.endswith('"') or "\\" in text:
+                self.fail(token)
+            if "\n" in text:
+                self.fail(token)
+            return self.string(text), "str"
+        if self.integer.fullmatch(token.key):
+            if int(token.key) > 2**63 - 1:
+                self.fail(token)
+            return f"{token.key}LL", "int"
+        if self.decimal.fullmatch(token.key):
+            return token.key, "float"
+        self.fail(token)
+
+    def genPrimary(self) -> tuple[str, str]:
+        token = self.tokens[self.index]
+        if token.type in (TokenTypes.numb, TokenTypes.str):
+            self.index += 1
+            return self.genLiteral(token)
+        if token.type == TokenTypes.lParen:
+            self.index += 1
+            code, kind = self.genExp()
+            self.expect(TokenTypes.rParen)
+            return f"({code})", kind
+
+        kind, dims = self.lookup(token)
+        self.index += 1
+        if self.tokens[self.index].type == TokenTypes.lSquare:
+            return self.genSubscript(token)
+        if dims or kind not in self.ctypes:
+            self.fail(token)
+        return self.name(token), kind
+
+    def truth(self, code: str, kind: str) -> str:
+        return f"*{code}" if kind == "str" else code
+
+    def isOperator(self, *keys: str) -> bool:
+        token = self.tokens[self.index]
+        return (
+            token.type in (TokenTypes.mathOps, TokenTypes.logicalOps)
+            and token.key in keys
+        )
+
+    def genExp(self) -> tuple[str, str]:
+        # Python's precedence over the flat token list: .OU., .E., .NÃO.,
+        # comparisons (chained), + -, * / %, ↑
+        code, kind = self.genAnd()
+        while self.isOperator(TokenKeys._or):
+            self.index += 1
+            right, other = self.genAnd()
+            code = f"({self.truth(code, kind)} || {self.truth(right, other)})"
+            kind = "bool" if kind == other == "bool" else "cond"
+        return code, kind
+
+    def genAnd(self) -> tuple[str, str]:
+        code, kind = self.genNot()
+        while self.isOperator(TokenKeys._and):
+            self.index += 1
+            right, other = self.genNot()
+            code = f"({self.truth(code, kind)} && {self.truth(right, other)})"
+            kind = "bool" if kind == other == "bool" else "cond"
+        return code, kind
+
+    def genNot(self) -> tuple[str, str]:
+        if self.isOperator(TokenKeys._not):
+            self.index += 1
+            code, kind = self.genNot()
+            return f"(!{self.truth(code, kind)})", "bool"
+        return self.genComparison()
+
+    def genComparison(self) -> tuple[str, str]:
+        left = self.genSum()
+        parts = []
+        while self.isOperator(*self.comparisons):
+            operator = self.comparisons[self.tokens[self.index].key]
+            token = self.tokens[self.index]
+            self.index += 1
+            right = self.genSum()
+            kinds = {left[1], right[1]}
+            if kinds == {"str"}:
+                parts.append(f"(strcmp({left[0]}, {right[0]}) {operator} 0)")
+            elif kinds <= {"int", "float", "bool"}:
+                parts.append(f"({left[0]} {operator} {right[0]})")
+            else:
+                self.fail(token)
+            left = right
+        if not parts:
+            return left
+        return f"({' && '.join(parts)})", "bool"
+
+    def genSum(self) -> tuple[str, str]:
+        code, kind = self.genTerm()
+        while self.isOperator(TokenKeys.plus, TokenKeys.minus):
+            token = self.tokens[self.index]
+            self.index += 1
+            code, kind = self.genArithmetic(token, (code, kind), self.genTerm())
+        return code, kind
+
+    def genTerm(self) -> tuple[str, str]:
+        code, kind = self.genPower()
+        while self.isOperator(TokenKeys.mult, TokenKeys.div, TokenKeys.mod):
+            token = self.tokens[self.index]
+            self.index += 1
+            code, kind = self.genArithmetic(token, (code, kind), self.genPower())
+        return code, kind
+
+    def genPower(self) -> tuple[str, str]:
+        code, kind = self.genPrimary()
+        if self.isOperator(TokenKeys.exponent):
+            token = self.tokens[self.index]
+            self.index += 1
+            return self.genArithmetic(token, (code, kind), self.genPower())
+        return code, kind
+
+    def genArithmetic(self, token: Token, left: tuple, right: tuple) -> tuple[str, str]:
+        (a, first), (b, second) = left, right
+        if not {first, second} <= {"int", "float", "bool"}:
+            self.fail(token)
+        floating = "float" in (first, second)
+        match token.key:
+            case TokenKeys.plus | TokenKeys.minus | TokenKeys.mult if floating:
+                return f"({a} {token.key} {b})", "float"
+            case TokenKeys.plus:
+                return f"lpp_add({a}, {b})", "int"
+            case TokenKeys.minus:
+                return f"lpp_sub({a}, {b})", "int"
+            case TokenKeys.mult:
+                return f"lpp_mul({a}, {b})", "int"
+            case TokenKeys.div:
+                return f"lpp_{'f' if floating else 'i'}div({a}, {b})", "float"
+            case TokenKeys.mod:
+                return f"lpp_{'f' if floating else 'i'}mod({a}, {b})", (
+                    "float" if floating else "int"
+                )
+            case TokenKeys.exponent:
+                return f"lpp_{'f' if floating else 'i'}pow({a}, {b})", (
+                    "float" if floating else "int"
+                )
+        self.fail(token)
+
+    def genId(self) -> None:
+        token = self.tokens[self.index]
+        if self.symtab.getType(token.key) in (
+            TokenTypes.procedimento,
+            TokenTypes.funcao,
+        ):
+            return self.genCall()
+
+        self.index += 1
+        if self.tokens[self.index].type == TokenTypes.lSquare:
+            target, kind = self.genSubscript(token, True)
+        else:
+            kind = self.lookup(token)[0]
+            target = self.target(token, kind)
+        self.expect(TokenTypes.rArrow)
+        code, other = self.genExp()
+        # Python would change the variable's type
+        if other != kind:
+            self.fail(token)
+        self.emit(token, f"{target} = {code};")
+
+    def genCall(self) -> None:
+        token = self.tokens[self.index]
+        if token.key not in self.routines:
+            self.fail(token)
+        params = self.routines[token.key]
+        self.index += 1
+        arguments = []
+        if self.tokens[self.index].type == TokenTypes.lParen:
+            self.index += 1
+            while self.tokens[self.index].type != TokenTypes.rParen:
+                argument = self.tokens[self.index]
+                # A[I, J] is a tuple index in the Python backend
+                if argument.type == TokenTypes.id and len(self.lookup(argument)[1]) > 1:
+                    self.fail(argument)
+                code, kind = self.genPrimary()
+                if len(arguments) >= len(params) or kind != params[len(arguments)]:
+                    self.fail(argument)
+                arguments.append(code)
+                if self.tokens[self.index].type == TokenTypes.comma:
+                    self.index += 1
+            self.index += 1
+        if len(arguments) != len(params):
+            self.fail(token)
+        if self.routine:
+            self.calls.setdefault(self.routine, []).append(token)
+        self.emit(token, f"{self.name(token, 'r')}({', '.join(arguments)});")
+
+    def checkRecursion(self) -> None:
+        # the C stack has no limit like --max-depth, so deep recursion would
+        # crash where Python raises RecursionError
+        for routine, calls in self.calls.items():
+            for call in calls:
+                seen = set()
+                pending = [call.key]
+                while pending:
+                    callee = pending.pop()
+                    if callee == routine:
+                        self.fail(call)
+                    if callee not in seen:
+                        seen.add(callee)
+                        pending += [token.key for token in self.calls.get(callee, [])]
+
+    def genLeia(self) -> None:
+        token = self.tokens[self.index]
+        self.index += 1
+        while True:
+            name = self.tokens[self.index]
+            # the Python backend casts by the first declaration of the name
+            kind = {TokenKeys.inteiro: "int", TokenKeys.real: "float"}.get(
+                self.symtab.getType(name.key), "str"
+            )
+            self.index += 1
+            if self.tokens[self.index].type == TokenTypes.lSquare:
+                target, element = self.genSubscript(name, True)
+                if element != kind:
+                    self.fail(name)
+            else:
+                target = self.target(name, kind)
+            self.emit(token, f"{target} = lpp_read_{kind}();")
+            if self.tokens[self.index].type != TokenTypes.comma:
+                return
+            self.index += 1
+
+    def genEscreva(self) -> None:
+        token = self.tokens[self.index]
+        self.index += 1
+        items = [self.genPrimary()]
+        while self.tokens[self.index].type == TokenTypes.mathOps:
+            self.index += 1
+            items.append(self.genPrimary())
+        while self.tokens[self.index].type == TokenTypes.comma:
+            self.index += 1
+            items.append(self.genPrimary())
+
+        calls = []
+        for code, kind in items:
+            if kind not in self.ctypes:
+                self.fail(token)
+            calls.append(f"lpp_write_{kind}({code});")
+        self.emit(token, " lpp_space(); ".join(calls) + " lpp_newline();")
+
+    prelude: str = r"""#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+#include <math.h>
+#include <ctype.h>
+#include <errno.h>
+
+static const char *const lpp_source[] = {
+	/* source */
+};
+static const char *lpp_file = "<lpp>";
+static const char *lpp_frame = "<module>";
+static int lpp_line = 0;
+
+static void lpp_fail(const char *error)
+{
+	fflush(stdout);
+	fprintf(stderr, "Traceback (most recent call last):\n"
+		"  File \"%s\", line %d, in %s\n    %s\n%s\n",
+		lpp_file, lpp_line, lpp_frame, lpp_source[lpp_line], error);
+	exit(1);
+}
+
+static void lpp_overflow(void)
+{
+	lpp_fail("OverflowError: inteiro maior que 64 bits no backend nativo");
+}
+
+static long long lpp_add(long long a, long long b)
+{
+	long long result;
+	if (__builtin_add_overflow(a, b, &result))
+		lpp_overflow();
+	return result;
+}
+
+static long long lpp_sub(long long a, long long b)
+{
+	long long result;
+	if (__builtin_sub_overflow(a, b, &result))
+		lpp_overflow();
+	return result;
+}
+
+static long long lpp_mul(long long a, long long b)
+{
+	long long result;
+	if (__builtin_mul_overflow(a, b, &result))
+		lpp_overflow();
+	return result;
+}
+
+static double lpp_idiv(long long a, long long b)
+{
+	const long long exact = 1LL << 53;
+	if (b == 0)
+		lpp_fail("ZeroDivisionError: division by zero");
+	if (a > -exact && a < exact && b > -exact && b < exact)
+		return (double)a / (double)b;
+	return (double)((long double)a / (long double)b);
+}
+
+static double lpp_fdiv(double a, double b)
+{
+	if (b == 0)
+		lpp_fail("ZeroDivisionError: float division by zero");
+	return a / b;
+}
+
+static long long lpp_imod(long long a, long long b)
+{
+	long long result;
+	if (b == 0)
+		lpp_fail("ZeroDivisionError: integer modulo by zero");
+	if (b == -1)
+		return 0;
+	result = a % b;
+	return result != 0 && (result < 0) != (b < 0) ? result + b : result;
+}
+
+static double lpp_fmod(double a, double b)
+{
+	double result;
+	if (b == 0)
+		lpp_fail("ZeroDivisionError: float modulo");
+	result = fmod(a, b);
+	if (result == 0)
+		return copysign(0.0, b);
+	return (result < 0) != (b < 0) ? result + b : result;
+}
+
+static long long lpp_ipow(long long a, long long b)
+{
+	long long result = 1;
+	if (b < 0)
+		lpp_fail("ValueError: expoente negativo em potência de inteiros no backend nativo");
+	while (b) {
+		if (b & 1)
+			result = lpp_mul(result, a);
+		b >>= 1;
+		if (b)
+			a = lpp_mul(a, a);
+	}
+	return result;
+}
+
+static double lpp_fpow(double a, double b)
+{
+	double result;
+	if (a == 0 && b < 0)
+		lpp_fail("ZeroDivisionError: 0.0 cannot be raised to a negative power");
+	if (a < 0 && isfinite(a) && isfinite(b) && b != floor(b))
+		lpp_fail("ValueError: potência com resultado complexo no backend nativo");
+	result = pow(a, b);
+	if (isinf(result) && isfinite(a) && isfinite(b))
+		lpp_fail("OverflowError: (34, 'Numerical result out of range')");
+	return result;
+}
+
+static long long lpp_index(long long index, long long size, int store)
+{
+	if (index >= 0 ? index < size : index >= -size)
+		return index < 0 ? index + size : index;
+	lpp_fail(store ? "IndexError: list assignment index out of range"
+		: "IndexError: list index out of range");
+	return 0;
+}
+
+static void *lpp_alloc(long long count, size_t size)
+{
+	void *memory = calloc(count ? count : 1, size);
+	if (!memory)
+		lpp_fail("MemoryError");
+	return memory;
+}
+
+static void lpp_strings(const char **strings, long long count)
+{
+	while (count--)
+		*strings++ = "";
+}
+
+static void lpp_space(void)
+{
+	putchar(' ');
+}
+
+static void lpp_newline(void)
+{
+	putchar('\n');
+}
+
+static void lpp_write_int(long long value)
+{
+	printf("%lld", value);
+}
+
+static void lpp_write_bool(int value)
+{
+	fputs(value ? "True" : "False", stdout);
+}
+
+static void lpp_write_str(const char *value)
+{
+	fputs(value, stdout);
+}
+
+/* repr(): the shortest digits that read back the same value */
+static void lpp_write_float(double value)
+{
+	char text[40], digits[20], *cursor = text;
+	int precision, exponent, length = 0, point, i;
+	if (isnan(value)) {
+		fputs("nan", stdout);
+		return;
+	}
+	if (isinf(value)) {
+		fputs(value > 0 ? "inf" : "-inf", stdout);
+		return;
+	}
+	for (precision = 1; precision < 17; precision++) {
+		snprintf(text, sizeof text, "%.*e", precision - 1, value);
+		if (strtod(text, NULL) == value)
+			break;
+	}
+	snprintf(text, sizeof text, "%.*e", precision - 1, value);
+	if (*cursor == '-') {
+		putchar('-');
+		cursor++;
+	}
+	for (; *cursor != 'e'; cursor++)
+		if (*cursor != '.')
+			digits[length++] = *cursor;
+	exponent = atoi(cursor + 1);
+	while (length > 1 && digits[length - 1] == '0')
+		length--;
+
+	point = exponent + 1;
+	if (point > 16 || point < -3) {
+		putchar(digits[0]);
+		if (length > 1) {
+			putchar('.');
+			fwrite(digits + 1, 1, length - 1, stdout);
+		}
+		printf("e%c%02d", exponent < 0 ? '-' : '+', abs(exponent));
+	} else if (point <= 0) {
+		fputs("0.", stdout);
+		for (i = point; i < 0; i++)
+			putchar('0');
+		fwrite(digits, 1, length, stdout);
+	} else if (point < length) {
+		fwrite(digits, 1, point, stdout);
+		putchar('.');
+		fwrite(digits + point, 1, length - point, stdout);
+	} else {
+		fwrite(digits, 1, length, stdout);
+		for (i = length; i < point; i++)
+			putchar('0');
+		fputs(".0", stdout);
+	}
+}
+
+/* input(): one line, without its newline */
+static char *lpp_read_str(void)
+{
+	size_t size = 64, length = 0;
+	char *line = malloc(size);
+	int c;
+	fflush(stdout);
+	while ((c = getchar()) != EOF && c != '\n') {
+		if (length + 1 == size)
+			line = realloc(line, size *= 2);
+		line[length++] = (char)c;
+	}
+	if (c == EOF && length == 0)
+		lpp_fail("EOFError: EOF when reading a line");
+	line[length] = 0;
+	return line;
+}
+
+static void lpp_invalid(const char *format, const char *line)
+{
+	char error[256];
+	snprintf(error, sizeof error, format, line);
+	lpp_fail(error);
+}
+
+/* int() and float() take surrounding blanks, but nothing else */
+static char *lpp_blanks(char *text)
+{
+	while (isspace((unsigned char)*text))
+		text++;
+	return text;
+}
+
+static long long lpp_read_int(void)
+{
+	char *line = lpp_read_str(), *text = lpp_blanks(line), *end;
+	long long value;
+	errno = 0;
+	value = strtoll(text, &end, 10);
+	if (end == text || *lpp_blanks(end) || !isdigit((unsigned char)text[*text == '+' || *text == '-']))
+		lpp_invalid("ValueError: invalid literal for int() with base 10: '%.200s'", line);
+	if (errno == ERANGE)
+		lpp_overflow();
+	free(line);
+	return value;
+}
+
+static double lpp_read_float(void)
+{
+	char *line = lpp_read_str(), *text = lpp_blanks(line), *end;
+	double value = strtod(text, &end);
+	if (end == text || *lpp_blanks(end) || strpbrk(text, "xX("))
+		lpp_invalid("ValueError: could not convert string to float: '%.200s'", line);
+	free(line);
+	return value;
+}
+
+"""
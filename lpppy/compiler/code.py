@@ -1,6 +1,7 @@
 from lpppy.compiler.symtab import Symtab
 from lpppy.compiler.token import Token, TokenKeys, TokenTypes
 from lpppy.compiler.error import Error, ErrorTypes
+from typing import Callable
 
 
 class CodeGen:
@@ -10,18 +11,129 @@ class CodeGen:
     stdout: str = ""
     level: int = 0
     programName: str = ""
+    marks: list[tuple[int, int, int]] = []
+    sourceMap: dict[int, tuple[int, int]] = {}
+    libs: list[str] = []
+    prefix: int = 0
+    cache: dict = None
+    units: dict = {}
+    reused: int = 0
+    # entries in the cache of each pure função, none with 0
+    memo: int = 1024
+    # calls deeper than this on the stack of recursion.run fail
+    depth: int = 1000000
+    routine: str = ""
+    blockEnds: list[TokenTypes] = [
+        TokenTypes.fimse,
+        TokenTypes.senao,
+        TokenTypes.fimpara,
+        TokenTypes.fimenq,
+    ]
 
     def __init__(self, symtab: Symtab) -> None:
         self.symtab = symtab
+        self.marks = []
+        self.libs = []
+        self.units = {}
 
     def run(self, tokens: list[Token]):
         self.tokens = tokens
         self.gen()
+        self.sourceMap = self.mapLines()
+
+    def mark(self, token: Token) -> None:
+        self.marks.append((len(self.stdout), token.line, token.column))
+
+    def mapLines(self) -> dict[int, tuple[int, int]]:
+        lines = {}
+        line, offset = 1, 0
+        for mark, lppLine, column in sorted(self.marks, key=lambda mark: mark[0]):
+            line += self.stdout.count("\n", offset, mark)
+            offset = mark
+            lines.setdefault(line, (lppLine, column))
+        return lines
 
     def importLib(self, lib: str) -> None:
         stdout = self.stdout
         self.stdout = f"{lib}\n"
         self.stdout += stdout
+        self.marks = [
+            (offset + len(lib) + 1, line, column) for offset, line, column in self.marks
+        ]
+        self.libs.append(lib)
+        self.prefix += len(lib) + 1
+
+    def context(self) -> tuple:
+        return (
+            tuple(
+                (symbol["token"].key, symbol["dtype"]) for symbol in self.symtab.symbols
+            )
+            + tuple(dtype.key for dtype in self.symtab.dtypes)
+            + tuple(self.symtab.vectors.items())
+            + tuple(self.symtab.shared.items())
+            + (
+                tuple(self.symtab.pure),
+                self.memo,
+                tuple(self.symtab.recursive.items()),
+                tuple(self.symtab.loops),
+                self.depth,
+                tuple(self.symtab.columns.items()),
+            )
+        )
+
+    def genUnit(
+        self, gen: Callable[[], None], last: TokenTypes, inclusive: bool = True
+    ) -> None:
+        if self.cache is None:
+            gen()
+            return
+
+        # a unit runs up to its last token, or to the end of the program; its
+        # output only depends on its tokens (relative to its first line) and on
+        # the declarations, which the symbol table holds
+        start = stop = self.index
+        if last:
+            while self.tokens[stop].type != last:
+                stop += 1
+            stop += inclusive
+        else:
+            stop = len(self.tokens)
+        line = self.tokens[start].line
+        key = (
+            tuple(
+                (token.type, token.key, token.line - line, token.column)
+                for token in self.tokens[start:stop]
+            ),
+            self.context(),
+        )
+
+        if key in self.cache:
+            chunk, marks, libs = self.cache[key]
+            for lib in libs:
+                self.importLib(lib)
+            offset = len(self.stdout)
+            self.marks += [
+                (offset + mark, line + lppLine, column)
+                for mark, lppLine, column in marks
+            ]
+            self.stdout += chunk
+            self.index = stop
+            self.units[key] = self.cache[key]
+            self.reused += 1
+            return
+
+        offset, prefix = len(self.stdout), self.prefix
+        count, libs = len(self.marks), len(self.libs)
+        gen()
+        offset += self.prefix - prefix
+        self.units[key] = (
+            self.stdout[offset:],
+            [
+                (mark - offset, lppLine - line, column)
+                for mark, lppLine, column in self.marks[count:]
+            ],
+            self.libs[libs:],
+        )
 
     def getDType(self, key: str) -> str:
         if self.symtab.checkDType(key):
@@ -81,6 +193,16 @@ class CodeGen:
                             return f"[0.0] * {size}"
                         else:
                             return "[0.0]"
+                    case _ if self.symtab.checkDType(_keytype):
+                        if matrix and size:
+                            return (
+                                f"[[{_keytype}() for _ in range({size})] "
+                                f"for _ in range({size})]"
+                            )
+                        elif size:
+                            return f"[{_keytype}() for _ in range({size})]"
+                        else:
+                            return f"[{_keytype}()]"
                     case _:
                         if matrix:
                             return f"[0][0]"
@@ -89,6 +211,25 @@ class CodeGen:
                         else:
                             return "[]"
 
+    def getVector(self, key: str, size: int) -> str:
+        # numpy only warns where Python raises, on division by zero
+        lib = 'import numpy\nnumpy.seterr(divide="raise", invalid="raise")'
+        if lib not in self.libs:
+            self.importLib(lib)
+        return f"numpy.zeros({size}, dtype=numpy.{self.symtab.vectors[key]}64)"
+
+    def getShared(self, key: str, size: int) -> str:
+        if "from lpppy import parallel" not in self.libs:
+            self.importLib("from lpppy import parallel")
+        typecode = "q" if self.symtab.shared[key] == "int" else "d"
+        return f'parallel.array("{typecode}", {size})'
+
+    def getColumn(self, key: str, size: int) -> str:
+        # a real field of a conjunto of registros that only holds reals
+        if "import array" not in self.libs:
+            self.importLib("import array")
+        return f'array.array("{self.symtab.columns[key]}", [0.0]) * {size}'
+
     def getInputCast(self, key: str) -> str:
         type = self.symtab.getType(key)
         match type:
@@ -125,122 +266,166 @@ class CodeGen:
         self.index += 1
 
         if self.tokens[self.index].key == TokenKeys.tipo:
-            self.genRegistro()
+            self.genUnit(self.genRegistro, TokenTypes.var, False)
 
         while self.tokens[self.index].key == TokenKeys.procedimento:
-            self.stdout += "\ndef "
-            self.index += 1
-            self.stdout += f"{self.tokens[self.index].key}():\n"
-            self.index += 2
-            self.level += 1
-            self.genProcedimento()
-            self.index += 1
-            self.level -= 1
+            self.genUnit(self.genProcedimentoUnit, TokenTypes.fim)
 
         while self.tokens[self.index].key == TokenKeys.funcao:
-            self.stdout += "\ndef "
-            self.index += 1
-            self.stdout += f"{self.tokens[self.index].key}("
-            self.index += 1
-            self.index += 1
+            self.genUnit(self.genFuncaoUnit, TokenTypes.fim)
 
-            while self.tokens[self.index].key != TokenKeys.rParen:
-                self.stdout += self.tokens[self.index].key
-                self.index += 1
-
-                if self.tokens[self.index].type == TokenTypes.dType:
-                    self.stdout += ": "
-                    self.stdout += self.getDType(self.tokens[self.index].key)
-                    self.index += 1
+        self.genUnit(self.genMain, None)
 
-                if self.tokens[self.index].key == TokenKeys.comma:
-                    self.stdout += ", "
-                    self.index += 1
+    def genProcedimentoUnit(self) -> None:
+        self.stdout += "\ndef "
+        self.mark(self.tokens[self.index])
+        self.index += 1
+        self.routine = self.tokens[self.index].key
+        self.stdout += f"{self.routine}():\n"
+        self.index += 2
+        self.level += 1
+        self.genRoutine()
+        self.index += 1
+        self.level -= 1
+        self.routine = ""
+
+    def genFuncaoUnit(self) -> None:
+        self.routine = self.tokens[self.index + 1].key
+        if self.memo and self.routine in self.symtab.pure:
+            if self.routine in self.symtab.recursive:
+                self.importRecursion()
+                self.stdout += f"\n@recursion.memo({self.memo})"
+            else:
+                if "import functools" not in self.libs:
+                    self.importLib("import functools")
+                self.stdout += (
+                    f"\n@functools.lru_cache(maxsize={self.memo}, typed=True)"
+                )
+        self.stdout += "\ndef "
+        self.mark(self.tokens[self.index])
+        self.index += 1
+        self.stdout += f"{self.tokens[self.index].key}("
+        self.index += 1
+        self.index += 1
 
-            self.stdout += ")"
-            self.index += 2
-            self.level += 1
+        while self.tokens[self.index].key != TokenKeys.rParen:
+            self.stdout += self.tokens[self.index].key
+            self.index += 1
 
             if self.tokens[self.index].type == TokenTypes.dType:
-                self.stdout += f" -> {self.getDType(self.tokens[self.index].key)}:\n"
+                self.stdout += ": "
+                self.stdout += self.getDType(self.tokens[self.index].key)
                 self.index += 1
-            else:
-                self.stdout += f" -> None:\n"
 
-            self.genProcedimento()
+            if self.tokens[self.index].key == TokenKeys.comma:
+                self.stdout += ", "
+                self.index += 1
+
+        self.stdout += ")"
+        self.index += 2
+        self.level += 1
+
+        if self.tokens[self.index].type == TokenTypes.dType:
+            self.stdout += f" -> {self.getDType(self.tokens[self.index].key)}:\n"
             self.index += 1
+        else:
+            self.stdout += f" -> None:\n"
+
+        self.genRoutine()
+        self.index += 1
+        self.level -= 1
+        self.routine = ""
+
+    def genRoutine(self) -> None:
+        # the self tail calls the recursion pass turned into continue start
+        # the body over
+        loop = self.routine in self.symtab.loops
+        if loop:
+            self.stdout += "\t" * self.level + "while True:\n"
+            self.level += 1
+        self.genProcedimento()
+        if loop:
+            self.stdout += "return\n"
             self.level -= 1
 
+    def importRecursion(self) -> None:
+        if "from lpppy import recursion" not in self.libs:
+            self.importLib("from lpppy import recursion")
+
+    def genMain(self) -> None:
         self.stdout += "\n# var\n"
         self.index += 1
         self.genVarBlock()
 
     def genRegistro(self) -> None:
-        self.importLib("from dataclasses import dataclass")
+        self.importLib("from dataclasses import dataclass, field")
         self.index += 1
         while self.tokens[self.index].type != TokenTypes.var:
-            self.stdout += f"\n@dataclass\nclass {self.tokens[self.index].key}:\n"
+            self.stdout += "\n@dataclass(slots=True)\n"
+            self.mark(self.tokens[self.index])
+            self.stdout += f"class {self.tokens[self.index].key}:\n"
             self.index += 3
             self.genRegistroBlock()
             self.index += 1
 
     def genRegistroBlock(self) -> None:
+        # one annotated field for each name, so every instance gets its own
+        # values; conjuntos are built again for each one
         while self.tokens[self.index].type != TokenTypes.fimreg:
-            if self.tokens[self.index + 1].key == TokenKeys.conjunto:
-                if self.tokens[self.index + 5].type == TokenTypes.comma:
-                    self.stdout += f"\t{self.tokens[self.index].key} = {self.getAssigDType(self.tokens[self.index + 1].key, self.tokens[self.index + 4].key, True, self.tokens[self.index + 9].key)}\n"
-                    self.index += 8
-                else:
-                    self.stdout += f"\t{self.tokens[self.index].key} = {self.getAssigDType(self.tokens[self.index + 1].key, self.tokens[self.index + 4].key, False, self.tokens[self.index + 6].key)}\n"
-                    self.index += 5
-
-            elif self.tokens[self.index + 1].key == TokenKeys.comma:
-                contents = 1
-                self.stdout += "\t"
-
-                while True:
-                    self.stdout += self.tokens[self.index].key
-                    if self.tokens[self.index + 1].type == TokenTypes.dType:
-                        self.index += 1
-                        break
-                    else:
-                        contents += 1
-                        self.stdout += ", "
-                        self.index += 2
-
-                if self.tokens[self.index].key == TokenKeys.conjunto:
-                    self.stdout += " = "
-
-                    for x in range(0, contents):
-                        self.stdout += f"{self.getAssigDType(self.tokens[self.index].key, self.tokens[self.index + 3].key, False, self.tokens[self.index + 5].key)}"
-                        if x < contents - 1:
-                            self.stdout += ", "
-
-                    self.stdout += "\n"
-                    self.index += 4
-
-                else:
-                    self.stdout += " = "
-
-                    for x in range(0, contents):
-                        self.stdout += f"{self.getAssigDType(self.tokens[self.index].key, 0, False, None)}"
-                        if x < contents - 1:
-                            self.stdout += ", "
-
-                    self.stdout += "\n"
-                    self.index -= 1
+            self.mark(self.tokens[self.index])
+            names = [self.tokens[self.index].key]
+            while self.tokens[self.index + 1].type == TokenTypes.comma:
+                self.index += 2
+                names.append(self.tokens[self.index].key)
+            self.index += 1
 
+            key = self.tokens[self.index].key
+            if key == TokenKeys.conjunto:
+                close = self.index
+                while self.tokens[close].type != TokenTypes.rSquare:
+                    close += 1
+                value = self.getAssigDType(
+                    key,
+                    self.tokens[self.index + 3].key,
+                    self.tokens[self.index + 4].type == TokenTypes.comma,
+                    self.tokens[close + 1].key,
+                )
+                declaration = f"list = field(default_factory=lambda: {value})"
+                self.index = close + 1
             else:
-                self.stdout += f"\t{self.tokens[self.index].key} = {self.getAssigDType(self.tokens[self.index + 1].key, 0, False, None)}\n"
+                declaration = (
+                    f"{self.getDType(key)} = {self.getAssigDType(key, 0, False, None)}"
+                )
 
-            self.index += 2
+            for name in names:
+                self.stdout += f"\t{name}: {declaration}\n"
+            self.index += 1
 
     def genVarBlock(self) -> None:
         while self.tokens[self.index].type != TokenTypes.inicio:
+            self.mark(self.tokens[self.index])
             if self.tokens[self.index + 1].key == TokenKeys.conjunto:
                 if self.tokens[self.index + 5].type == TokenTypes.comma:
                     self.stdout += f"{self.tokens[self.index].key} = {self.getAssigDType(self.tokens[self.index + 1].key, self.tokens[self.index + 4].key, True, self.tokens[self.index + 9].key)}\n"
                     self.index += 8
+                elif self.tokens[self.index].key in self.symtab.shared:
+                    shared = self.getShared(
+                        self.tokens[self.index].key, self.tokens[self.index + 4].key
+                    )
+                    self.stdout += f"{self.tokens[self.index].key} = {shared}\n"
+                    self.index += 5
+                elif self.tokens[self.index].key in self.symtab.vectors:
+                    vector = self.getVector(
+                        self.tokens[self.index].key, self.tokens[self.index + 4].key
+                    )
+                    self.stdout += f"{self.tokens[self.index].key} = {vector}\n"
+                    self.index += 5
+                elif self.tokens[self.index].key in self.symtab.columns:
+                    column = self.getColumn(
+                        self.tokens[self.index].key, self.tokens[self.index + 4].key
+                    )
+                    self.stdout += f"{self.tokens[self.index].key} = {column}\n"
+                    self.index += 5
                 else:
                     self.stdout += f"{self.tokens[self.index].key} = {self.getAssigDType(self.tokens[self.index + 1].key, self.tokens[self.index + 4].key, False, self.tokens[self.index + 6].key)}\n"
                     self.index += 5
@@ -289,13 +474,14 @@ class CodeGen:
 
     def genProcedimento(self) -> None:
         while self.tokens[self.index].type != TokenTypes.inicio:
+            self.mark(self.tokens[self.index])
             if self.tokens[self.index + 1].key == TokenKeys.conjunto:
-                self.stdout += "\t"
+                self.stdout += "\t" * self.level
                 self.stdout += f"{self.tokens[self.index].key} = {self.getAssigDType(self.tokens[self.index + 1].key, self.tokens[self.index + 4].key, False, self.tokens[self.index + 6].key)}\n"
                 self.index += 5
 
             elif self.tokens[self.index + 1].key == TokenKeys.comma:
-                self.stdout += "\t"
+                self.stdout += "\t" * self.level
                 contents = 1
 
                 while True:
@@ -331,7 +517,7 @@ class CodeGen:
                     self.index -= 1
 
             else:
-                self.stdout += "\t"
+                self.stdout += "\t" * self.level
                 self.stdout += f"{self.tokens[self.index].key} = {self.getAssigDType(self.tokens[self.index + 1].key, 0, False, None)}\n"
 
             self.index += 2
@@ -344,6 +530,9 @@ class CodeGen:
         while True:
             token = self.tokens[self.index]
 
+            if token.type != TokenTypes.fim:
+                self.mark(token)
+
             match token.type:
                 case TokenTypes.fim:
                     self.stdout += "# fim\n"
@@ -360,6 +549,8 @@ class CodeGen:
                     self.genPara()
                 case TokenTypes.enquanto:
                     self.genEnquanto()
+                case TokenTypes.python:
+                    self.genPython()
                 case _:
                     Error(ErrorTypes.code_internal_error_not_implemented_yet, token)
 
@@ -371,6 +562,9 @@ class CodeGen:
             for i in range(self.level):
                 self.stdout += "\t"
 
+            if token.type != TokenTypes.fim:
+                self.mark(token)
+
             match token.type:
                 case TokenTypes.fim:
                     break
@@ -386,6 +580,8 @@ class CodeGen:
                     self.genPara()
                 case TokenTypes.enquanto:
                     self.genEnquanto()
+                case TokenTypes.python:
+                    self.genPython()
                 case _:
                     Error(ErrorTypes.code_internal_error_not_implemented_yet, token)
 
@@ -397,8 +593,16 @@ class CodeGen:
             for i in range(self.level):
                 self.stdout += "\t"
 
+            if token.type not in self.blockEnds:
+                self.mark(token)
+
             match token.type:
-                case TokenTypes.fimse | TokenTypes.senao | TokenTypes.fimpara | TokenTypes.fimenq:
+                case (
+                    TokenTypes.fimse
+                    | TokenTypes.senao
+                    | TokenTypes.fimpara
+                    | TokenTypes.fimenq
+                ):
                     self.stdout = self.stdout[:-1]
                     break
                 case TokenTypes.leia:
@@ -413,6 +617,8 @@ class CodeGen:
                     self.genPara()
                 case TokenTypes.enquanto:
                     self.genEnquanto()
+                case TokenTypes.python:
+                    self.genPython()
                 case _:
                     Error(ErrorTypes.code_internal_error_not_implemented_yet, token)
 
@@ -435,6 +641,7 @@ class CodeGen:
                 self.index += 1
 
             self.index += 1
+        self.genField()
 
         self.genExp()
         self.index += 1
@@ -444,6 +651,7 @@ class CodeGen:
         while self.tokens[self.index].type != TokenTypes.fimse:
             self.genBlock()
             if self.tokens[self.index].type == TokenTypes.senao:
+                self.mark(self.tokens[self.index])
                 self.stdout += "else:"
                 self.index += 1
                 self.genBlock()
@@ -453,11 +661,10 @@ class CodeGen:
         self.index += 1
 
     def genPara(self) -> None:
-        self.stdout += "for "
+        token = self.tokens[self.index]
         self.index += 1
-        self.stdout += self.tokens[self.index].key
+        counter = self.tokens[self.index].key
         self.index += 1
-        self.stdout += " in "
 
         if self.tokens[self.index].type == TokenTypes.numb:
             range_start = self.tokens[self.index].key
@@ -465,7 +672,6 @@ class CodeGen:
             range_end = self.tokens[self.index].key
             self.index += 2
             range_step = self.tokens[self.index].key
-            self.stdout += f"range({range_start}, {range_end}, {range_step}):"
             self.index += 2
 
         elif self.tokens[self.index].type == TokenTypes.id:
@@ -481,9 +687,13 @@ class CodeGen:
             range_end = self.tokens[self.index].key
             self.index += 2
             range_step = self.tokens[self.index].key
-            self.stdout += f"range({range_start}, {range_end}, {range_step}):"
             self.index += 2
 
+        iterations = f"range({range_start}, {range_end}, {range_step})"
+        if self.tokens[self.index].type == TokenTypes.paralelo:
+            return self.genParalelo(token, counter, iterations)
+
+        self.stdout += f"for {counter} in {iterations}:"
         self.level += 1
 
         if self.tokens[self.index].type != TokenTypes.fimpara:
@@ -491,14 +701,43 @@ class CodeGen:
 
         self.level -= 1
         self.index += 1
-        if not self.level:
-            self.stdout += "\n"
+        self.stdout += "\n"
+
+    def genParalelo(self, token: Token, counter: str, iterations: str) -> None:
+        # the body becomes a function over part of the iterations, which
+        # parallel.run splits between the workers; the parallel pass lists the
+        # accumulated scalars, with their operator, and the ones the last
+        # iteration sets
+        if "from lpppy import parallel" not in self.libs:
+            self.importLib("from lpppy import parallel")
+        names = self.tokens[self.index].key.split()
+        accumulators = "".join(name[-1] for name in names if name[-1] in "+*")
+        scalars = ", ".join(name.rstrip("+*") for name in names)
+        values = f"{scalars}," if len(names) == 1 else scalars
+        indent = "\t" * self.level
+        self.stdout += f"def lpp_paralelo(lpp_range, {scalars}):\n"
+        self.stdout += f"{indent}\tfor {counter} in lpp_range:"
+        self.index += 1
+
+        self.level += 2
+        if self.tokens[self.index].type != TokenTypes.fimpara:
+            self.genBlock()
+
+        self.level -= 2
+        self.index += 1
+        self.stdout += f"\n{indent}\treturn {values}\n"
+        self.mark(token)
+        self.stdout += (
+            f"{indent}{values} = parallel.run(lpp_paralelo, {iterations},"
+            f" ({values}), {accumulators!r})\n"
+        )
 
     def genEnquanto(self) -> None:
         self.stdout += "while ("
         self.index += 2
         self.stdout += self.tokens[self.index].key
         self.index += 1
+        self.genField()
 
         self.genExp()
         self.stdout += ":"
@@ -512,6 +751,18 @@ class CodeGen:
         self.index += 1
         self.stdout += "\n"
 
+    def genPython(self) -> None:
+        # the imports it needs come first
+        lines = self.tokens[self.index].key.split("\n")
+        for lib in lines:
+            if lib.startswith("import ") and lib not in self.libs:
+                self.importLib(lib)
+        indent = "\n" + "\t" * self.level
+        self.stdout += (
+            indent.join(line for line in lines if not line.startswith("import ")) + "\n"
+        )
+        self.index += 1
+
     def genVarAssign(self) -> None:
         self.index += 1
         self.stdout += " = "
@@ -540,6 +791,7 @@ class CodeGen:
                 self.index += 1
 
             self.index += 1
+        self.genField()
 
         if (
             self.tokens[self.index].type == TokenTypes.mathOps
@@ -553,6 +805,14 @@ class CodeGen:
     def genId(self) -> None:
         dtype = self.symtab.getType(self.tokens[self.index].key)
         if dtype == TokenTypes.procedimento or dtype == TokenTypes.funcao:
+            # calls within a cycle of recursive routines go to the stack of
+            # recursion.run, the one that enters the cycle starts it
+            cycle = self.symtab.recursive.get(self.tokens[self.index].key)
+            if cycle and cycle == self.symtab.recursive.get(self.routine):
+                self.stdout += "yield "
+            elif cycle:
+                self.importRecursion()
+                self.stdout += "recursion.run("
             self.stdout += f"{self.tokens[self.index].key}("
 
             self.index += 1
@@ -566,7 +826,10 @@ class CodeGen:
                         self.stdout += ", "
                         self.index += 1
                 self.index += 1
-            self.stdout += ")\n"
+            self.stdout += ")"
+            if cycle and cycle != self.symtab.recursive.get(self.routine):
+                self.stdout += f", {self.depth})"
+            self.stdout += "\n"
 
         else:
             self.stdout += self.tokens[self.index].key
@@ -585,10 +848,27 @@ class CodeGen:
                 self.index += 1
 
             self.index += 1
+        self.genField()
 
         if self.tokens[self.index].type == TokenTypes.rArrow:
             self.genVarAssign()
 
+    def genField(self) -> None:
+        if self.tokens[self.index].type == TokenTypes.field:
+            self.stdout += self.tokens[self.index].key
+            self.index += 1
+            if self.tokens[self.index].type == TokenTypes.lSquare:
+                self.index += 1
+                self.stdout += f"[{self.tokens[self.index].key}]"
+                self.index += 1
+
+                if self.tokens[self.index].type == TokenTypes.comma:
+                    self.index += 1
+                    self.stdout += f"[{self.tokens[self.index].key}]"
+                    self.index += 1
+
+                self.index += 1
+
     def genExp(self) -> None:
         while self.tokens[self.index].type == TokenTypes.lParen:
             self.stdout += "("
@@ -632,6 +912,7 @@ class CodeGen:
                             self.index += 1
 
                         self.index += 1
+                    self.genField()
 
                 while self.tokens[self.index].type == TokenTypes.lParen:
                     self.stdout += "("
@@ -682,6 +963,7 @@ class CodeGen:
                             self.index += 1
 
                         self.index += 1
+                    self.genField()
 
                 while self.tokens[self.index].type == TokenTypes.lParen:
                     self.stdout += "("
@@ -716,19 +998,23 @@ class CodeGen:
                 self.stdout += f"{self.tokens[self.index + 1].key} = {self.getInputCast(self.tokens[self.index + 1].key)}\n"
                 self.index += 2
 
-        elif self.tokens[self.index].type == TokenTypes.lSquare:
-            self.index += 1
-            input_var_array_index = self.tokens[self.index].key
-            self.index += 1
-            if self.tokens[self.index].type == TokenTypes.comma:
+        else:
+            if self.tokens[self.index].type == TokenTypes.lSquare:
                 self.index += 1
-                self.stdout += f"{input_var}[{input_var_array_index}][{self.tokens[self.index].key}] = {input_cast}\n"
-                self.index += 2
-            else:
-                self.stdout += f"{input_var}[{input_var_array_index}] = {input_cast}\n"
+                input_var += f"[{self.tokens[self.index].key}]"
                 self.index += 1
-        else:
-            self.stdout += f"{input_var} = {input_cast}\n"
+                if self.tokens[self.index].type == TokenTypes.comma:
+                    self.index += 1
+                    input_var += f"[{self.tokens[self.index].key}]"
+                    self.index += 1
+                self.index += 1
+
+            # a field is read with the type it has in the registro
+            if self.tokens[self.index].type == TokenTypes.field:
+                input_cast = self.getInputCast(self.tokens[self.index].key[1:])
+            self.stdout += input_var
+            self.genField()
+            self.stdout += f" = {input_cast}\n"
 
     def genEscreva(self) -> None:
         self.index += 1
@@ -748,6 +1034,7 @@ class CodeGen:
                 self.index += 1
 
             self.index += 1
+        self.genField()
 
         while self.tokens[self.index].type == TokenTypes.mathOps:
             self.index += 1
@@ -758,4 +1045,5 @@ class CodeGen:
             while self.tokens[self.index].type == TokenTypes.comma:
                 self.stdout += f", {self.tokens[self.index + 1].key}"
                 self.index += 2
+                self.genField()
         self.stdout += ")\n"
@@ -1,4 +1,3 @@
-import sys
 from enum import Enum
 from lpppy.compiler.token import Token
 
@@ -7,23 +6,36 @@ class ErrorTypes(Enum):
     lexer_unexpected_token = 1
     parser_unexpected_token = 2
     code_internal_error_not_implemented_yet = 3
+    code_syntax_error = 4
+    native_unsupported = 5
 
 
-class Error:
+class CompileError(Exception):
+    type: ErrorTypes = None
+    token: Token = None
+
     def __init__(self, type: ErrorTypes, token: Token) -> None:
-        if not token:
-            exit(1)
-        print(
-            f"{self.getMsg(type)} '{token.key}' na linha {token.line};\nSinta-se livre para reportar ou tirar dúvidas em https://github.com/leozamboni/LPPPy/issues.\n",
-            file=sys.stderr,
-        )
-        exit(1)
-
-    def getMsg(self, type: ErrorTypes) -> str:
-        match type:
+        self.type = type
+        self.token = token or Token("eof", None, 0)
+        super().__init__(f"{self.getMsg()} '{self.token.key}'")
+
+    def getMsg(self) -> str:
+        match self.type:
             case ErrorTypes.lexer_unexpected_token:
                 return "LEXER: token inesperado"
             case ErrorTypes.parser_unexpected_token:
                 return "PARSER: token inesperado"
             case ErrorTypes.code_internal_error_not_implemented_yet:
                 return "CODE(erro interno): funcionalidade ainda não implementada"
+            case ErrorTypes.code_syntax_error:
+                return "CODE: expressão inválida em"
+            case ErrorTypes.native_unsupported:
+                return "NATIVO: não suportado pelo backend C"
+
+    def report(self) -> str:
+        return f"{self} na linha {self.token.line};\nSinta-se livre para reportar ou tirar dúvidas em https://github.com/leozamboni/LPPPy/issues.\n"
+
+
+class Error:
+    def __init__(self, type: ErrorTypes, token: Token) -> None:
+        raise CompileError(type, token)
@@ -0,0 +1,91 @@
+from lpppy.compiler.symtab import Symtab
+from lpppy.compiler.token import Token, TokenKeys, TokenTypes
+import timeit
+import sys
+import io
+
+
+class BudgetExceeded(Exception):
+    pass
+
+
+class Evaluator:
+    budget: int = 0
+    steps: int = 0
+    # a single line can take long, so the time is bounded too
+    timeout: float = 2.0
+    deadline: float = 0.0
+
+    def __init__(self, budget: int) -> None:
+        self.budget = budget
+
+    def isInputFree(self, tokens: list[Token], symtab: Symtab) -> bool:
+        for index, token in enumerate(tokens):
+            if token.type == TokenTypes.leia:
+                return False
+            # calls to names the symbol table does not know can't be proven
+            # input free
+            if (
+                token.type == TokenTypes.lParen
+                and tokens[index - 1].type == TokenTypes.id
+                and symtab.getType(tokens[index - 1].key) is None
+            ):
+                return False
+        return True
+
+    def isBounded(self, tokens: list[Token]) -> bool:
+        # the budget only counts lines: the bulk operations of the optimization
+        # passes, paralelo loops that fork and building conjuntos run in one
+        # line each
+        elements = 0
+        costs = {}
+        registro = None
+        for index, token in enumerate(tokens):
+            if token.type in (TokenTypes.python, TokenTypes.paralelo):
+                return False
+            if token.type == TokenTypes.registro:
+                registro = tokens[index - 2].key
+                costs[registro] = 1
+            elif token.type == TokenTypes.fimreg:
+                registro = None
+            elif token.key == TokenKeys.conjunto:
+                close = index
+                while tokens[close].type != TokenTypes.rSquare:
+                    close += 1
+                try:
+                    count = int(tokens[index + 3].key)
+                except ValueError:
+                    return False
+                if close == index + 7:
+                    count *= count
+                # a conjunto of registros builds every conjunto field too
+                if registro:
+                    costs[registro] += count
+                else:
+                    elements += count * costs.get(tokens[close + 1].key, 1)
+        return elements <= self.budget
+
+    def run(self, source: str) -> str:
+        self.steps = 0
+        self.deadline = timeit.default_timer() + self.timeout
+        stdout = io.StringIO()
+
+        restore = sys.stdout, sys.gettrace()
+        sys.stdout = stdout
+        sys.settrace(self.trace)
+        try:
+            exec(compile(source, "<lpp>", "exec"), {"__name__": "__main__"})
+        except Exception:
+            return None
+        finally:
+            sys.settrace(restore[1])
+            sys.stdout = restore[0]
+
+        return stdout.getvalue()
+
+    def trace(self, frame, event, arg):
+        if event == "line":
+            self.steps += 1
+            if self.steps > self.budget or timeit.default_timer() > self.deadline:
+                raise BudgetExceeded()
+        return self.trace
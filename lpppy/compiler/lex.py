@@ -1,11 +1,16 @@
 from lpppy.compiler.error import Error, ErrorTypes
 from lpppy.compiler.token import Token, TokenTypes, TokenKeys
+import sys
+import re
 
 
 class Lexer:
     stdin: str = ""
     index: int = 0
     line: int = 1
+    lineStart: int = 0
+    tokens: list[Token] = []
+    position: int = 0
 
     keyWords: TokenKeys = [
         TokenKeys.programa,
@@ -49,6 +54,7 @@ class Lexer:
         TokenKeys.logico,
         TokenKeys.falso,
         TokenKeys.verdadeiro,
+        TokenKeys.paralelo,
     ]
     keyChars: TokenKeys = [
         TokenKeys.mod,
@@ -67,9 +73,24 @@ class Lexer:
         TokenKeys.exponent,
     ]
     chars: list[str] = ["\n"]
+    keyWordTypes: dict[str, TokenTypes] = {key: Token.getType(key) for key in keyWords}
+    keyCharTypes: dict[str, TokenTypes] = {
+        key[0]: Token.getType(key) for key in keyChars
+    }
+    # same characters as isAlphaOrOP() or str.isnumeric()
+    alpha: re.Pattern = re.compile(r"[\w=<>]*")
+    blank: re.Pattern = re.compile(r"[ \t\r]*")
+    word: re.Pattern = re.compile(r"\w*")
 
     def __init__(self, stdin: str) -> None:
         self.stdin = stdin
+        self.tokens = []
+
+    def run(self) -> None:
+        token = self.scan()
+        while token:
+            self.tokens.append(token)
+            token = self.scan()
 
     def lex_dotwords(self) -> Token:
         start = self.index
@@ -85,7 +106,23 @@ class Lexer:
         token = self.lex_keyword(key)
         if token:
             return token
-        return Token(key, TokenTypes.id, self.line)
+        return Token(sys.intern(key), TokenTypes.id, self.line)
+
+    def lex_field(self) -> Token:
+        # P.CAMPO or V[I].CAMPO, with the dot right after the name or the ],
+        # unless it starts an operator as in X.E.Y
+        start = self.index
+        before = self.stdin[start - 1] if start else " "
+        if not (before in "]_" or before.isalnum()):
+            return None
+        end = self.word.match(self.stdin, start + 1).end()
+        if end == start + 1 or self.stdin[start + 1].isnumeric():
+            return None
+        if self.stdin[start : end + 1] in self.keyWordTypes:
+            return None
+
+        self.index = end
+        return Token(sys.intern(self.stdin[start:end]), TokenTypes.field, self.line)
 
     def lex_string(self) -> Token:
         start = self.index
@@ -103,19 +140,13 @@ class Lexer:
 
     def lex_alpha(self) -> Token:
         start = self.index
-        while (
-            self.isAlphaOrOP(self.stdin[self.index])
-            or self.stdin[self.index].isnumeric()
-        ):
-            self.index += 1
-            if len(self.stdin) <= self.index:
-                break
+        self.index = self.alpha.match(self.stdin, start).end()
 
         key = self.stdin[start : self.index]
         token = self.lex_keyword(key)
         if token:
             return token
-        return Token(key, TokenTypes.id, self.line)
+        return Token(sys.intern(key), TokenTypes.id, self.line)
 
     def lex_number(self) -> Token:
         start = self.index
@@ -131,33 +162,61 @@ class Lexer:
         return Token(key, TokenTypes.numb, self.line)
 
     def lex_keyword(self, key: str) -> Token:
-        for keyWord in self.keyWords:
-            if key == keyWord:
-                return Token(key, Token.getType(key), self.line)
+        type = self.keyWordTypes.get(key)
+        if type:
+            return Token(sys.intern(key), type, self.line)
 
     def lex_keychar(self, key: str) -> Token:
-        for keyChar in self.keyChars:
-            if key == keyChar[0]:
-                self.index += 1
-                return Token(key, Token.getType(key), self.line)
+        type = self.keyCharTypes.get(key)
+        if type:
+            self.index += 1
+            return Token(sys.intern(key), type, self.line)
 
     def lex_chars(self, key: str) -> Token:
         for char in self.chars:
             if key == char:
                 if key == "\n":
                     self.line += 1
+                    self.lineStart = self.index + 1
                     break
 
     def isAlphaOrOP(self, key: str) -> bool:
         return key.isalpha() or key == "=" or key == "<" or key == ">" or key == "_"
 
     def lex(self) -> Token:
-        if len(self.stdin) <= self.index:
-            Error(ErrorTypes.lexer_unexpected_token, {"key": "eof", "line": self.line})
+        if self.position < len(self.tokens):
+            token = self.tokens[self.position]
+        else:
+            token = self.scan()
+            if not token:
+                Error(
+                    ErrorTypes.lexer_unexpected_token,
+                    Token("eof", None, self.line),
+                )
+            self.tokens.append(token)
+
+        self.position += 1
+        return token
+
+    def scan(self) -> Token:
+        # blanks never start a token, skip them without going through scanKey
+        self.index = self.blank.match(self.stdin, self.index).end()
+        while len(self.stdin) > self.index:
+            start = self.index
+            token = self.scanKey(self.stdin[start])
+            if token:
+                token.column = start - self.lineStart + 1
+                return token
 
-        key = self.stdin[self.index]
+            self.lex_chars(self.stdin[self.index])
+            self.index = self.blank.match(self.stdin, self.index + 1).end()
 
+    def scanKey(self, key: str) -> Token:
         if key == ".":
+            token = self.lex_field()
+            if token:
+                return token
+
             token = self.lex_dotwords()
             if token.key == TokenKeys.falso:
                 token = Token("0", TokenTypes.numb, self.line)
@@ -184,13 +243,4 @@ class Lexer:
             if token:
                 return token
 
-        token = self.lex_keychar(key)
-        if token:
-            return token
-
-        token = self.lex_chars(key)
-        if token:
-            return token
-
-        self.index += 1
-        return self.lex()
+        return self.lex_keychar(key)
@@ -1,30 +1,113 @@
 from lpppy.compiler.lex import Lexer
 from lpppy.compiler.parse import Parse
 from lpppy.compiler.code import CodeGen
+from lpppy.compiler.ccode import CCodeGen
 from lpppy.compiler.symtab import Symtab
+from lpppy.compiler.evaluate import Evaluator
+from lpppy.compiler.passes import PassManager
+from lpppy.compiler.stats import Stats
+from lpppy.compiler.sourcemap import SourceMap
+from lpppy.compiler.error import CompileError, ErrorTypes
+from lpppy.compiler.token import Token
+from types import SimpleNamespace, CodeType
 import timeit
+import marshal
 from datetime import datetime
 
 
 class Compiler:
-    startTime = timeit.default_timer()
+    startTime = 0.0
+    config = SimpleNamespace(
+        evaluate=False,
+        budget=100000,
+        timings=None,
+        memory=False,
+        optimize=0,
+        dumpAfter=None,
+        native=False,
+        memo=1024,
+        depth=None,
+    )
     stdin = ""
     stdout = ""
+    code = None
     lexer = None
     parser = None
     codegen = None
+    passes = None
+    tokens = None
     symtab = None
+    stats = None
+    sourceMap = None
+    native = None
+    nativeError = None
 
-    def __init__(self, stdin: str) -> None:
+    def __init__(self, stdin: str, config: SimpleNamespace = None) -> None:
         self.stdin = stdin
+        self.config = SimpleNamespace(**vars(self.config))
+        if config:
+            vars(self.config).update(vars(config))
+        self.stats = Stats(memory=self.config.memory)
         self.symtab = Symtab()
         self.lexer = Lexer(stdin)
         self.parser = Parse(self.lexer, self.symtab)
         self.codegen = CodeGen(self.symtab)
+        self.codegen.memo = self.config.memo
+        self.codegen.depth = self.config.depth or self.codegen.depth
+        self.passes = PassManager(
+            self.config.optimize,
+            self.config.dumpAfter,
+            self.stats,
+            ["recursion"] if self.config.depth else [],
+        )
 
     def run(self) -> None:
-        self.parser.run()
-        self.codegen.run(self.parser.tokens)
+        self.startTime = timeit.default_timer()
+
+        with self.stats.measure("lex") as stats:
+            self.lexer.run()
+            stats["tokens"] = len(self.lexer.tokens)
+
+        with self.stats.measure("parse") as stats:
+            self.parser.run()
+            stats["nodes"] = len(self.parser.tokens)
+            stats["symbols"] = len(self.symtab.symbols)
+
+        self.tokens = self.passes.run(self.parser.tokens, self.symtab)
+
+        with self.stats.measure("codegen") as stats:
+            self.codegen.run(self.tokens)
+            program = self.codegen.stdout
+            lines = self.codegen.sourceMap
+            stats["size"] = len(program)
+            if self.codegen.cache is not None:
+                stats["reused"] = self.codegen.reused
+
+        if self.config.native:
+            with self.stats.measure("native") as stats:
+                ccode = CCodeGen(self.symtab, self.stdin)
+                try:
+                    ccode.run(self.parser.tokens)
+                    self.native = ccode.stdout
+                    stats["size"] = len(self.native)
+                except CompileError as error:
+                    self.nativeError = error
+
+        if self.config.evaluate:
+            with self.stats.measure("evaluate") as stats:
+                evaluator = Evaluator(self.config.budget)
+                if evaluator.isInputFree(
+                    self.tokens, self.symtab
+                ) and evaluator.isBounded(self.tokens):
+                    output = evaluator.run(program)
+                    stats["steps"] = evaluator.steps
+                    if output is not None:
+                        # print, not sys.stdout, so --cache can keep the result
+                        program = "# avaliado em tempo de compilação\n\n"
+                        program += f"print({output!r}, end='')\n"
+                        lines = {}
+                stats["size"] = len(program)
+
         header = """# coding: utf-8
 # +-------------------------------------------------------+
 #  Gerado por LPPPy (https://github.com/leozamboni/LPPPy).
@@ -40,4 +123,47 @@ class Compiler:
         )
         self.stdout = header
         self.stdout += f"# programa {self.codegen.programName}\n"
-        self.stdout += self.codegen.stdout
+        self.sourceMap = SourceMap(lines, self.stdout.count("\n"))
+        self.stdout += program
+
+    def check(self) -> list[CompileError]:
+        # every parse error instead of stopping at the first; the parser lets
+        # expressions through as they are, so a clean parse is also compiled
+        with self.stats.measure("lex") as stats:
+            self.lexer.run()
+            stats["tokens"] = len(self.lexer.tokens)
+
+        with self.stats.measure("parse") as stats:
+            self.parser.recover = True
+            self.parser.run()
+            stats["errors"] = len(self.parser.errors)
+        if self.parser.errors:
+            return self.parser.errors
+
+        self.tokens = self.passes.run(self.parser.tokens, self.symtab)
+        with self.stats.measure("codegen"):
+            try:
+                self.codegen.run(self.tokens)
+            except CompileError as error:
+                return [error]
+
+        with self.stats.measure("compile"):
+            try:
+                compile(self.codegen.stdout, "<lpp>", "exec")
+            except SyntaxError as error:
+                return [self.syntaxError(error)]
+        return []
+
+    def syntaxError(self, error: SyntaxError) -> CompileError:
+        # the statement the Python line came from
+        position = SourceMap(self.codegen.sourceMap).lookup(error.lineno or 0)
+        if not position:
+            position = self.tokens[-1].line, self.tokens[-1].column
+        line = self.stdin.split("\n")[position[0] - 1].strip()
+        return CompileError(ErrorTypes.code_syntax_error, Token(line, None, *position))
+
+    def compile(self, filename: str = "<lpp>") -> CodeType:
+        with self.stats.measure("compile") as stats:
+            self.code = compile(self.stdout, filename, "exec")
+            stats["size"] = len(marshal.dumps(self.code))
+        return self.code
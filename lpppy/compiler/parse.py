@@ -1,6 +1,6 @@
 from lpppy.compiler.lex import Lexer
 from lpppy.compiler.symtab import Symtab
-from lpppy.compiler.error import Error, ErrorTypes
+from lpppy.compiler.error import Error, ErrorTypes, CompileError
 from lpppy.compiler.token import Token, TokenKeys, TokenTypes
 
 
@@ -14,13 +14,66 @@ class Parse:
         TokenTypes.dPeriod,
         TokenTypes.de,
     ]
+    closers: list[TokenTypes] = [
+        TokenTypes.fimse,
+        TokenTypes.senao,
+        TokenTypes.fim,
+        TokenTypes.fimenq,
+        TokenTypes.fimpara,
+    ]
+    recover: bool = False
+    errors: list[CompileError] = []
 
     def __init__(self, lexer: Lexer, symtab: Symtab) -> None:
         self.lexer = lexer
         self.symtab = symtab
+        self.tokens = []
+        self.errors = []
 
     def run(self) -> None:
-        self.parse()
+        try:
+            self.parse()
+        except CompileError as error:
+            if not self.recover:
+                raise
+            self.record(error)
+
+    def record(self, error: CompileError) -> None:
+        # a token that ends one construct can fail the enclosing one too
+        if not self.errors or self.errors[-1].token is not error.token:
+            self.errors.append(error)
+
+    def synchronize(self, error: CompileError, start: int) -> None:
+        # with recover set, the error is recorded and the lexer is left before
+        # the first token of the next statement or declaration: a closer, or
+        # the first token of a later line
+        if not self.recover or error.token.type is None:
+            raise error
+        self.record(error)
+
+        index = self.lexer.position - 1
+        token = self.lexer.tokens[index]
+        line = token.line
+        if index > start and (
+            token.type in self.closers or self.lexer.tokens[index - 1].line < line
+        ):
+            self.lexer.position = index
+            return
+
+        token = self.lexer.lex()
+        while token.line == line and token.type not in self.closers:
+            token = self.lexer.lex()
+        self.lexer.position -= 1
+
+    def skipTo(self, error: CompileError, expectedType: TokenTypes) -> Token:
+        if not self.recover or error.token.type is None:
+            raise error
+        self.record(error)
+
+        token = self.lexer.tokens[self.lexer.position - 1]
+        while token.type != expectedType:
+            token = self.lexer.lex()
+        return token
 
     def eatToken(self, token: Token, expectedType: TokenTypes) -> None:
         if not token or token.type != expectedType:
@@ -35,69 +88,78 @@ class Parse:
         token = self.lexer.lex()
 
         while token.type == TokenTypes.procedimento:
-            self.eatToken(token, TokenTypes.procedimento)
-            token = self.lexer.lex()
-            self.symtab.push(token, TokenTypes.procedimento)
-            self.eatToken(token, TokenTypes.id)
-            token = self.lexer.lex()
-
-            if token.type == TokenTypes.var:
-                self.eatToken(token, TokenTypes.var)
+            try:
+                self.eatToken(token, TokenTypes.procedimento)
+                token = self.lexer.lex()
+                self.symtab.push(token, TokenTypes.procedimento)
+                self.eatToken(token, TokenTypes.id)
                 token = self.lexer.lex()
 
-            token = self.parseProcedimento(token)
-            self.eatToken(token, TokenTypes.fim)
-            token = self.lexer.lex()
+                if token.type == TokenTypes.var:
+                    self.eatToken(token, TokenTypes.var)
+                    token = self.lexer.lex()
 
-        while token.type == TokenTypes.funcao:
-            self.eatToken(token, TokenTypes.funcao)
+                token = self.parseProcedimento(token)
+                self.eatToken(token, TokenTypes.fim)
+            except CompileError as error:
+                self.skipTo(error, TokenTypes.fim)
             token = self.lexer.lex()
-            self.symtab.push(token, TokenTypes.funcao)
-            self.eatToken(token, TokenTypes.id)
-            self.eatToken(self.lexer.lex(), TokenTypes.lParen)
 
-            token = self.lexer.lex()
-            while token.type != TokenTypes.rParen:
+        while token.type == TokenTypes.funcao:
+            try:
+                self.eatToken(token, TokenTypes.funcao)
+                token = self.lexer.lex()
+                self.symtab.push(token, TokenTypes.funcao)
                 self.eatToken(token, TokenTypes.id)
+                self.eatToken(self.lexer.lex(), TokenTypes.lParen)
+
                 token = self.lexer.lex()
+                while token.type != TokenTypes.rParen:
+                    self.eatToken(token, TokenTypes.id)
+                    token = self.lexer.lex()
 
-                if token.type == TokenTypes.colon:
-                    self.eatToken(token, TokenTypes.colon)
-                    self.eatToken(self.lexer.lex(), TokenTypes.dType)
+                    if token.type == TokenTypes.colon:
+                        self.eatToken(token, TokenTypes.colon)
+                        self.eatToken(self.lexer.lex(), TokenTypes.dType)
 
-                if token.type == TokenTypes.comma:
-                    self.eatToken(token, TokenTypes.comma)
+                    if token.type == TokenTypes.comma:
+                        self.eatToken(token, TokenTypes.comma)
 
-                token = self.lexer.lex()
+                    token = self.lexer.lex()
 
-            self.eatToken(token, TokenTypes.rParen)
+                self.eatToken(token, TokenTypes.rParen)
 
-            token = self.lexer.lex()
-            if token.type == TokenTypes.colon:
-                self.eatToken(token, TokenTypes.colon)
-                self.eatToken(self.lexer.lex(), TokenTypes.dType)
                 token = self.lexer.lex()
+                if token.type == TokenTypes.colon:
+                    self.eatToken(token, TokenTypes.colon)
+                    self.eatToken(self.lexer.lex(), TokenTypes.dType)
+                    token = self.lexer.lex()
 
-            if token.type == TokenTypes.var:
-                self.eatToken(token, TokenTypes.var)
-                token = self.lexer.lex()
+                if token.type == TokenTypes.var:
+                    self.eatToken(token, TokenTypes.var)
+                    token = self.lexer.lex()
 
-            token = self.parseProcedimento(token)
-            self.eatToken(token, TokenTypes.fim)
+                token = self.parseProcedimento(token)
+                self.eatToken(token, TokenTypes.fim)
+            except CompileError as error:
+                self.skipTo(error, TokenTypes.fim)
             token = self.lexer.lex()
 
         if token.type == TokenTypes.tipo:
-            self.eatToken(token, TokenTypes.tipo)
-            token = self.lexer.lex()
-            while token.type != TokenTypes.var:
-                self.symtab.pushDType(token)
-                self.eatToken(token, TokenTypes.id)
-                token = self.lexer.lex()
-                if token.key == TokenKeys.equal:
-                    self.eatToken(token, TokenTypes.logicalOps)
-                    self.eatToken(self.lexer.lex(), TokenTypes.registro)
-                    self.parseRegistro(self.lexer.lex())
+            try:
+                self.eatToken(token, TokenTypes.tipo)
                 token = self.lexer.lex()
+                while token.type != TokenTypes.var:
+                    self.symtab.pushDType(token)
+                    self.eatToken(token, TokenTypes.id)
+                    token = self.lexer.lex()
+                    if token.key == TokenKeys.equal:
+                        self.eatToken(token, TokenTypes.logicalOps)
+                        self.eatToken(self.lexer.lex(), TokenTypes.registro)
+                        self.parseRegistro(self.lexer.lex())
+                    token = self.lexer.lex()
+            except CompileError as error:
+                token = self.skipTo(error, TokenTypes.var)
 
         self.eatToken(token, TokenTypes.var)
         self.parseVar(self.lexer.lex())
@@ -107,54 +169,61 @@ class Parse:
             self.eatToken(token, TokenTypes.inicio)
             return self.parseInicio()
 
-        self.eatToken(token, TokenTypes.id)
+        start = self.lexer.position - 1
+        try:
+            self.eatToken(token, TokenTypes.id)
 
-        _symtokens = []
-        _symtokens.append(token)
+            _symtokens = []
+            _symtokens.append(token)
 
-        token = self.lexer.lex()
-        if token.type == TokenTypes.comma:
-            while token.type == TokenTypes.comma:
-                self.eatToken(token, TokenTypes.comma)
-                token = self.lexer.lex()
-                _symtokens.append(token)
-                self.eatToken(token, TokenTypes.id)
-                token = self.lexer.lex()
+            token = self.lexer.lex()
+            if token.type == TokenTypes.comma:
+                while token.type == TokenTypes.comma:
+                    self.eatToken(token, TokenTypes.comma)
+                    token = self.lexer.lex()
+                    _symtokens.append(token)
+                    self.eatToken(token, TokenTypes.id)
+                    token = self.lexer.lex()
 
-        self.eatToken(token, TokenTypes.colon)
+            self.eatToken(token, TokenTypes.colon)
 
-        _symtype = 0
+            _symtype = 0
 
-        token = self.lexer.lex()
-        _symtype = token.key
-        if token.type == TokenTypes.id:
-            if self.symtab.checkDType(token.key):
-                self.eatToken(token, TokenTypes.id)
+            token = self.lexer.lex()
+            _symtype = token.key
+            if token.type == TokenTypes.id:
+                if self.symtab.checkDType(token.key):
+                    self.eatToken(token, TokenTypes.id)
+                else:
+                    self.eatToken(token, TokenTypes.dType)
             else:
                 self.eatToken(token, TokenTypes.dType)
-        else:
-            self.eatToken(token, TokenTypes.dType)
-        if token.key == TokenKeys.conjunto:
-            self.eatToken(self.lexer.lex(), TokenTypes.lSquare)
-            self.eatToken(self.lexer.lex(), TokenTypes.numb)
-            self.eatToken(self.lexer.lex(), TokenTypes.dPeriod)
-            self.eatToken(self.lexer.lex(), TokenTypes.numb)
-            token = self.lexer.lex()
-            if token.type == TokenTypes.comma:
-                self.eatToken(token, TokenTypes.comma)
+            if token.key == TokenKeys.conjunto:
+                self.eatToken(self.lexer.lex(), TokenTypes.lSquare)
                 self.eatToken(self.lexer.lex(), TokenTypes.numb)
                 self.eatToken(self.lexer.lex(), TokenTypes.dPeriod)
                 self.eatToken(self.lexer.lex(), TokenTypes.numb)
                 token = self.lexer.lex()
-            self.eatToken(token, TokenTypes.rSquare)
-            self.eatToken(self.lexer.lex(), TokenTypes.de)
-            token = self.lexer.lex()
+                if token.type == TokenTypes.comma:
+                    self.eatToken(token, TokenTypes.comma)
+                    self.eatToken(self.lexer.lex(), TokenTypes.numb)
+                    self.eatToken(self.lexer.lex(), TokenTypes.dPeriod)
+                    self.eatToken(self.lexer.lex(), TokenTypes.numb)
+                    token = self.lexer.lex()
+                self.eatToken(token, TokenTypes.rSquare)
+                self.eatToken(self.lexer.lex(), TokenTypes.de)
+                token = self.lexer.lex()
 
-            _symtype = token.key
-            self.eatToken(token, TokenTypes.dType)
+                _symtype = token.key
+                if token.type == TokenTypes.id and self.symtab.checkDType(token.key):
+                    self.eatToken(token, TokenTypes.id)
+                else:
+                    self.eatToken(token, TokenTypes.dType)
 
-        for _token in _symtokens:
-            self.symtab.push(_token, _symtype)
+            for _token in _symtokens:
+                self.symtab.push(_token, _symtype)
+        except CompileError as error:
+            self.synchronize(error, start)
 
         self.parseVar(self.lexer.lex())
 
@@ -162,48 +231,52 @@ class Parse:
         if token.type == TokenTypes.fimreg:
             return self.eatToken(token, TokenTypes.fimreg)
 
-        self.eatToken(token, TokenTypes.id)
+        start = self.lexer.position - 1
+        try:
+            self.eatToken(token, TokenTypes.id)
 
-        _symtokens = []
-        _symtokens.append(token)
+            _symtokens = []
+            _symtokens.append(token)
 
-        token = self.lexer.lex()
-        if token.type == TokenTypes.comma:
-            while token.type == TokenTypes.comma:
-                self.eatToken(token, TokenTypes.comma)
-                token = self.lexer.lex()
-                _symtokens.append(token)
-                self.eatToken(token, TokenTypes.id)
-                token = self.lexer.lex()
+            token = self.lexer.lex()
+            if token.type == TokenTypes.comma:
+                while token.type == TokenTypes.comma:
+                    self.eatToken(token, TokenTypes.comma)
+                    token = self.lexer.lex()
+                    _symtokens.append(token)
+                    self.eatToken(token, TokenTypes.id)
+                    token = self.lexer.lex()
 
-        self.eatToken(token, TokenTypes.colon)
+            self.eatToken(token, TokenTypes.colon)
 
-        _symtype = 0
+            _symtype = 0
 
-        token = self.lexer.lex()
-        _symtype = token.key
-        self.eatToken(token, TokenTypes.dType)
-        if token.key == TokenKeys.conjunto:
-            self.eatToken(self.lexer.lex(), TokenTypes.lSquare)
-            self.eatToken(self.lexer.lex(), TokenTypes.numb)
-            self.eatToken(self.lexer.lex(), TokenTypes.dPeriod)
-            self.eatToken(self.lexer.lex(), TokenTypes.numb)
             token = self.lexer.lex()
-            if token.type == TokenTypes.comma:
-                self.eatToken(token, TokenTypes.comma)
+            _symtype = token.key
+            self.eatToken(token, TokenTypes.dType)
+            if token.key == TokenKeys.conjunto:
+                self.eatToken(self.lexer.lex(), TokenTypes.lSquare)
                 self.eatToken(self.lexer.lex(), TokenTypes.numb)
                 self.eatToken(self.lexer.lex(), TokenTypes.dPeriod)
                 self.eatToken(self.lexer.lex(), TokenTypes.numb)
                 token = self.lexer.lex()
-            self.eatToken(token, TokenTypes.rSquare)
-            self.eatToken(self.lexer.lex(), TokenTypes.de)
-            token = self.lexer.lex()
+                if token.type == TokenTypes.comma:
+                    self.eatToken(token, TokenTypes.comma)
+                    self.eatToken(self.lexer.lex(), TokenTypes.numb)
+                    self.eatToken(self.lexer.lex(), TokenTypes.dPeriod)
+                    self.eatToken(self.lexer.lex(), TokenTypes.numb)
+                    token = self.lexer.lex()
+                self.eatToken(token, TokenTypes.rSquare)
+                self.eatToken(self.lexer.lex(), TokenTypes.de)
+                token = self.lexer.lex()
 
-            _symtype = token.key
-            self.eatToken(token, TokenTypes.dType)
+                _symtype = token.key
+                self.eatToken(token, TokenTypes.dType)
 
-        for _token in _symtokens:
-            self.symtab.push(_token, _symtype)
+            for _token in _symtokens:
+                self.symtab.push(_token, _symtype)
+        except CompileError as error:
+            self.synchronize(error, start)
 
         self.parseRegistro(self.lexer.lex())
 
@@ -212,193 +285,235 @@ class Parse:
             self.eatToken(token, TokenTypes.inicio)
             return self.parseBlock()
 
-        self.eatToken(token, TokenTypes.id)
+        start = self.lexer.position - 1
+        try:
+            self.eatToken(token, TokenTypes.id)
 
-        _symtokens = []
-        _symtokens.append(token)
+            _symtokens = []
+            _symtokens.append(token)
 
-        token = self.lexer.lex()
-        if token.type == TokenTypes.comma:
-            while token.type == TokenTypes.comma:
-                self.eatToken(token, TokenTypes.comma)
-                token = self.lexer.lex()
-                _symtokens.append(token)
-                self.eatToken(token, TokenTypes.id)
-                token = self.lexer.lex()
+            token = self.lexer.lex()
+            if token.type == TokenTypes.comma:
+                while token.type == TokenTypes.comma:
+                    self.eatToken(token, TokenTypes.comma)
+                    token = self.lexer.lex()
+                    _symtokens.append(token)
+                    self.eatToken(token, TokenTypes.id)
+                    token = self.lexer.lex()
 
-        self.eatToken(token, TokenTypes.colon)
+            self.eatToken(token, TokenTypes.colon)
 
-        _symtype = 0
+            _symtype = 0
 
-        token = self.lexer.lex()
-        _symtype = token.key
-        self.eatToken(token, TokenTypes.dType)
-        if token.key == TokenKeys.conjunto:
-            self.eatToken(self.lexer.lex(), TokenTypes.lSquare)
-            self.eatToken(self.lexer.lex(), TokenTypes.numb)
-            self.eatToken(self.lexer.lex(), TokenTypes.dPeriod)
-            self.eatToken(self.lexer.lex(), TokenTypes.numb)
-            self.eatToken(self.lexer.lex(), TokenTypes.rSquare)
-            self.eatToken(self.lexer.lex(), TokenTypes.de)
             token = self.lexer.lex()
-
             _symtype = token.key
             self.eatToken(token, TokenTypes.dType)
+            if token.key == TokenKeys.conjunto:
+                self.eatToken(self.lexer.lex(), TokenTypes.lSquare)
+                self.eatToken(self.lexer.lex(), TokenTypes.numb)
+                self.eatToken(self.lexer.lex(), TokenTypes.dPeriod)
+                self.eatToken(self.lexer.lex(), TokenTypes.numb)
+                self.eatToken(self.lexer.lex(), TokenTypes.rSquare)
+                self.eatToken(self.lexer.lex(), TokenTypes.de)
+                token = self.lexer.lex()
+
+                _symtype = token.key
+                self.eatToken(token, TokenTypes.dType)
 
-        for _token in _symtokens:
-            self.symtab.push(_token, _symtype)
+            for _token in _symtokens:
+                self.symtab.push(_token, _symtype)
+        except CompileError as error:
+            self.synchronize(error, start)
 
         return self.parseProcedimento(self.lexer.lex())
 
     def parseInicio(self) -> None:
         token = self.lexer.lex()
         while True:
-            match token.type:
-                case TokenTypes.fim:
-                    return self.eatToken(token, TokenTypes.fim)
-                case TokenTypes.id:
-                    token = self.parseId(token)
-                case TokenTypes.leia:
-                    token = self.parseLeia(token)
-                case TokenTypes.escreva:
-                    token = self.parseEscreva(token)
-                case TokenTypes.se:
-                    token = self.parseSe(token)
-                case TokenTypes.enquanto:
-                    token = self.parseEnquanto(token)
-                case TokenTypes.para:
-                    token = self.parsePara(token)
-                case _:
-                    Error(ErrorTypes.parser_unexpected_token, token)
+            start = self.lexer.position - 1
+            try:
+                match token.type:
+                    case TokenTypes.fim:
+                        return self.eatToken(token, TokenTypes.fim)
+                    case TokenTypes.id:
+                        token = self.parseId(token)
+                    case TokenTypes.leia:
+                        token = self.parseLeia(token)
+                    case TokenTypes.escreva:
+                        token = self.parseEscreva(token)
+                    case TokenTypes.se:
+                        token = self.parseSe(token)
+                    case TokenTypes.enquanto:
+                        token = self.parseEnquanto(token)
+                    case TokenTypes.para:
+                        token = self.parsePara(token)
+                    case _:
+                        Error(ErrorTypes.parser_unexpected_token, token)
+            except CompileError as error:
+                self.synchronize(error, start)
+                token = self.lexer.lex()
 
     def parseBlock(self) -> None:
         token = self.lexer.lex()
         while True:
-            match token.type:
-                case TokenTypes.fimse | TokenTypes.senao | TokenTypes.fim | TokenTypes.fimenq | TokenTypes.fimpara:
-                    return token
-                case TokenTypes.id:
-                    token = self.parseId(token)
-                case TokenTypes.leia:
-                    token = self.parseLeia(token)
-                case TokenTypes.escreva:
-                    token = self.parseEscreva(token)
-                case TokenTypes.se:
-                    token = self.parseSe(token)
-                case TokenTypes.para:
-                    token = self.parsePara(token)
-                case TokenTypes.enquanto:
-                    token = self.parseEnquanto(token)
-                case _:
-                    Error(ErrorTypes.parser_unexpected_token, token)
+            start = self.lexer.position - 1
+            try:
+                match token.type:
+                    case (
+                        TokenTypes.fimse
+                        | TokenTypes.senao
+                        | TokenTypes.fim
+                        | TokenTypes.fimenq
+                        | TokenTypes.fimpara
+                    ):
+                        return token
+                    case TokenTypes.id:
+                        token = self.parseId(token)
+                    case TokenTypes.leia:
+                        token = self.parseLeia(token)
+                    case TokenTypes.escreva:
+                        token = self.parseEscreva(token)
+                    case TokenTypes.se:
+                        token = self.parseSe(token)
+                    case TokenTypes.para:
+                        token = self.parsePara(token)
+                    case TokenTypes.enquanto:
+                        token = self.parseEnquanto(token)
+                    case _:
+                        Error(ErrorTypes.parser_unexpected_token, token)
+            except CompileError as error:
+                self.synchronize(error, start)
+                token = self.lexer.lex()
 
     def parseSe(self, token) -> None:
-        self.eatToken(token, TokenTypes.se)
-        self.eatToken(self.lexer.lex(), TokenTypes.lParen)
-
-        token = self.lexer.lex()
-        if token.type == TokenTypes.numb:
-            self.eatToken(token, TokenTypes.numb)
-            token = self.lexer.lex()
-        elif token.type == TokenTypes.id:
-            self.eatToken(token, TokenTypes.id)
+        start = self.lexer.position - 1
+        try:
+            self.eatToken(token, TokenTypes.se)
+            self.eatToken(self.lexer.lex(), TokenTypes.lParen)
 
             token = self.lexer.lex()
-            if token.type == TokenTypes.lSquare:
-                self.eatToken(token, TokenTypes.lSquare)
-
+            if token.type == TokenTypes.numb:
+                self.eatToken(token, TokenTypes.numb)
                 token = self.lexer.lex()
-                if token.type == TokenTypes.numb:
-                    self.eatToken(token, TokenTypes.numb)
-                else:
-                    self.eatToken(token, TokenTypes.id)
+            elif token.type == TokenTypes.id:
+                self.eatToken(token, TokenTypes.id)
 
-                self.eatToken(self.lexer.lex(), TokenTypes.rSquare)
                 token = self.lexer.lex()
+                if token.type == TokenTypes.lSquare:
+                    self.eatToken(token, TokenTypes.lSquare)
 
-        elif token.type == TokenTypes.str:
-            self.eatToken(token, TokenTypes.str)
-            token = self.lexer.lex()
+                    token = self.lexer.lex()
+                    if token.type == TokenTypes.numb:
+                        self.eatToken(token, TokenTypes.numb)
+                    else:
+                        self.eatToken(token, TokenTypes.id)
+
+                    self.eatToken(
+                        self.parseColumn(self.lexer.lex()), TokenTypes.rSquare
+                    )
+                    token = self.lexer.lex()
+                token = self.parseField(token)
+
+            elif token.type == TokenTypes.str:
+                self.eatToken(token, TokenTypes.str)
+                token = self.lexer.lex()
 
-        token = self.parseExp(token)
+            token = self.parseExp(token)
 
-        self.eatToken(token, TokenTypes.entao)
+            self.eatToken(token, TokenTypes.entao)
+        except CompileError as error:
+            self.synchronize(error, start)
 
-        while token.type != TokenTypes.fimse:
+        token = self.parseBlock()
+        while token.type == TokenTypes.senao:
+            self.eatToken(token, TokenTypes.senao)
             token = self.parseBlock()
-            if token.type == TokenTypes.senao:
-                self.eatToken(token, TokenTypes.senao)
 
         self.eatToken(token, TokenTypes.fimse)
         return self.lexer.lex()
 
     def parseEnquanto(self, token: Token) -> None:
-        self.eatToken(token, TokenTypes.enquanto)
-        self.eatToken(self.lexer.lex(), TokenTypes.lParen)
-
-        token = self.lexer.lex()
-        if token.type == TokenTypes.numb:
-            self.eatToken(token, TokenTypes.numb)
-            token = self.lexer.lex()
-        elif token.type == TokenTypes.id:
-            self.eatToken(token, TokenTypes.id)
+        start = self.lexer.position - 1
+        try:
+            self.eatToken(token, TokenTypes.enquanto)
+            self.eatToken(self.lexer.lex(), TokenTypes.lParen)
 
             token = self.lexer.lex()
-            if token.type == TokenTypes.lSquare:
-                self.eatToken(token, TokenTypes.lSquare)
-
+            if token.type == TokenTypes.numb:
+                self.eatToken(token, TokenTypes.numb)
                 token = self.lexer.lex()
-                if token.type == TokenTypes.numb:
-                    self.eatToken(token, TokenTypes.numb)
-                else:
-                    self.eatToken(token, TokenTypes.id)
+            elif token.type == TokenTypes.id:
+                self.eatToken(token, TokenTypes.id)
 
-                self.eatToken(self.lexer.lex(), TokenTypes.rSquare)
                 token = self.lexer.lex()
+                if token.type == TokenTypes.lSquare:
+                    self.eatToken(token, TokenTypes.lSquare)
 
-        elif token.type == TokenTypes.str:
-            self.eatToken(token, TokenTypes.str)
-            token = self.lexer.lex()
+                    token = self.lexer.lex()
+                    if token.type == TokenTypes.numb:
+                        self.eatToken(token, TokenTypes.numb)
+                    else:
+                        self.eatToken(token, TokenTypes.id)
 
-        token = self.parseExp(token)
+                    self.eatToken(
+                        self.parseColumn(self.lexer.lex()), TokenTypes.rSquare
+                    )
+                    token = self.lexer.lex()
+                token = self.parseField(token)
 
-        self.eatToken(token, TokenTypes.faca)
+            elif token.type == TokenTypes.str:
+                self.eatToken(token, TokenTypes.str)
+                token = self.lexer.lex()
 
-        if token.type != TokenTypes.fimenq:
-            token = self.parseBlock()
+            token = self.parseExp(token)
+
+            self.eatToken(token, TokenTypes.faca)
+        except CompileError as error:
+            self.synchronize(error, start)
+
+        token = self.parseBlock()
 
         self.eatToken(token, TokenTypes.fimenq)
         return self.lexer.lex()
 
     def parsePara(self, token: Token) -> None:
-        self.eatToken(token, TokenTypes.para)
-        self.eatToken(self.lexer.lex(), TokenTypes.id)
-        self.eatToken(self.lexer.lex(), TokenTypes.de)
+        start = self.lexer.position - 1
+        try:
+            self.eatToken(token, TokenTypes.para)
+            self.eatToken(self.lexer.lex(), TokenTypes.id)
+            self.eatToken(self.lexer.lex(), TokenTypes.de)
 
-        token = self.lexer.lex()
-        if token.type == TokenTypes.numb:
-            self.eatToken(token, TokenTypes.numb)
-        else:
-            self.eatToken(token, TokenTypes.id)
+            token = self.lexer.lex()
+            if token.type == TokenTypes.numb:
+                self.eatToken(token, TokenTypes.numb)
+            else:
+                self.eatToken(token, TokenTypes.id)
 
-        token = self.lexer.lex()
-        if (
-            token.type == TokenTypes.mathOps
-            or token.type == TokenTypes.lParen
-            or token.type == TokenTypes.rParen
-        ):
-            token = self.parseExp(token)
+            token = self.lexer.lex()
+            if (
+                token.type == TokenTypes.mathOps
+                or token.type == TokenTypes.lParen
+                or token.type == TokenTypes.rParen
+            ):
+                token = self.parseExp(token)
 
-        self.eatToken(token, TokenTypes.ate)
-        self.eatToken(self.lexer.lex(), TokenTypes.numb)
-        self.eatToken(self.lexer.lex(), TokenTypes.passo)
-        self.eatToken(self.lexer.lex(), TokenTypes.numb)
+            self.eatToken(token, TokenTypes.ate)
+            self.eatToken(self.lexer.lex(), TokenTypes.numb)
+            self.eatToken(self.lexer.lex(), TokenTypes.passo)
+            self.eatToken(self.lexer.lex(), TokenTypes.numb)
 
-        token = self.lexer.lex()
-        self.eatToken(token, TokenTypes.faca)
+            token = self.lexer.lex()
+            self.eatToken(token, TokenTypes.faca)
 
-        while token.type != TokenTypes.fimpara:
-            token = self.parseBlock()
+            token = self.lexer.lex()
+            if token.type == TokenTypes.paralelo:
+                self.eatToken(token, TokenTypes.paralelo)
+            else:
+                self.lexer.position -= 1
+        except CompileError as error:
+            self.synchronize(error, start)
+
+        token = self.parseBlock()
 
         self.eatToken(token, TokenTypes.fimpara)
         return self.lexer.lex()
@@ -416,8 +531,9 @@ class Parse:
             else:
                 self.eatToken(token, TokenTypes.id)
 
-            self.eatToken(self.lexer.lex(), TokenTypes.rSquare)
+            self.eatToken(self.parseColumn(self.lexer.lex()), TokenTypes.rSquare)
             token = self.lexer.lex()
+        token = self.parseField(token)
 
         if token.type == TokenTypes.rArrow:
             token = self.parseVarAssign(token)
@@ -443,7 +559,9 @@ class Parse:
                         else:
                             self.eatToken(token, TokenTypes.id)
 
-                        self.eatToken(self.lexer.lex(), TokenTypes.rSquare)
+                        self.eatToken(
+                            self.parseColumn(self.lexer.lex()), TokenTypes.rSquare
+                        )
                         token = self.lexer.lex()
                     elif token.type == TokenTypes.comma:
                         self.eatToken(token, TokenTypes.comma)
@@ -495,8 +613,9 @@ class Parse:
             elif token.type == TokenTypes.id:
                 self.eatToken(token, TokenTypes.id)
 
-            self.eatToken(self.lexer.lex(), TokenTypes.rSquare)
+            self.eatToken(self.parseColumn(self.lexer.lex()), TokenTypes.rSquare)
             token = self.lexer.lex()
+        token = self.parseField(token)
 
         if (
             token.type == TokenTypes.mathOps
@@ -507,6 +626,37 @@ class Parse:
 
         return token
 
+    def parseColumn(self, token: Token) -> Token:
+        # the second index of conjunto[..,..]
+        if token.type == TokenTypes.comma:
+            self.eatToken(token, TokenTypes.comma)
+            token = self.lexer.lex()
+            if token.type == TokenTypes.numb:
+                self.eatToken(token, TokenTypes.numb)
+            else:
+                self.eatToken(token, TokenTypes.id)
+            token = self.lexer.lex()
+        return token
+
+    def parseField(self, token: Token) -> Token:
+        # P.CAMPO, or V[I].CAMPO for a conjunto of registros, and P.CAMPO[J]
+        # for a conjunto field
+        if token.type == TokenTypes.field:
+            self.eatToken(token, TokenTypes.field)
+            token = self.lexer.lex()
+            if token.type == TokenTypes.lSquare:
+                self.eatToken(token, TokenTypes.lSquare)
+
+                token = self.lexer.lex()
+                if token.type == TokenTypes.numb:
+                    self.eatToken(token, TokenTypes.numb)
+                else:
+                    self.eatToken(token, TokenTypes.id)
+
+                self.eatToken(self.parseColumn(self.lexer.lex()), TokenTypes.rSquare)
+                token = self.lexer.lex()
+        return token
+
     def parseExp(self, token: Token) -> None:
         while token.type == TokenTypes.lParen:
             self.eatToken(token, TokenTypes.lParen)
@@ -546,8 +696,11 @@ class Parse:
                         else:
                             self.eatToken(token, TokenTypes.id)
 
-                        self.eatToken(self.lexer.lex(), TokenTypes.rSquare)
+                        self.eatToken(
+                            self.parseColumn(self.lexer.lex()), TokenTypes.rSquare
+                        )
                         token = self.lexer.lex()
+                    token = self.parseField(token)
 
                 while token.type == TokenTypes.lParen:
                     self.eatToken(token, TokenTypes.lParen)
@@ -594,8 +747,11 @@ class Parse:
                         else:
                             self.eatToken(token, TokenTypes.id)
 
-                        self.eatToken(self.lexer.lex(), TokenTypes.rSquare)
+                        self.eatToken(
+                            self.parseColumn(self.lexer.lex()), TokenTypes.rSquare
+                        )
                         token = self.lexer.lex()
+                    token = self.parseField(token)
 
                 while token.type == TokenTypes.lParen:
                     self.eatToken(token, TokenTypes.lParen)
@@ -641,7 +797,9 @@ class Parse:
                 token = self.lexer.lex()
 
             self.eatToken(token, TokenTypes.rSquare)
-            token = self.lexer.lex()
+            token = self.parseField(self.lexer.lex())
+        else:
+            token = self.parseField(token)
 
         return token
 
@@ -693,6 +851,7 @@ class Parse:
 
                 self.eatToken(token, TokenTypes.rSquare)
                 token = self.lexer.lex()
+            token = self.parseField(token)
 
         if token.type == TokenTypes.comma:
             while token.type == TokenTypes.comma:
@@ -703,6 +862,6 @@ class Parse:
                 elif token.type == TokenTypes.id:
                     self.eatToken(token, TokenTypes.id)
 
-                token = self.lexer.lex()
+                token = self.parseField(self.lexer.lex())
 
         return token
@@ -0,0 +1,1784 @@
+from lpppy.compiler.symtab import Symtab
+from lpppy.compiler.stats import Stats
+from lpppy.compiler.token import Token, TokenKeys, TokenTypes
+import importlib.util
+
+
+class Pass:
+    name: str = ""
+    level: int = 1
+
+    # rewrites tokens in place and returns how many nodes it changed
+    def run(self, tokens: list[Token], symtab: Symtab) -> int:
+        return 0
+
+
+class ConstantFolding(Pass):
+    name: str = "fold"
+    level: int = 1
+    precedence: dict[str, int] = {
+        TokenKeys.plus: 1,
+        TokenKeys.minus: 1,
+        TokenKeys.mult: 2,
+        TokenKeys.div: 2,
+        TokenKeys.mod: 2,
+        TokenKeys.exponent: 3,
+    }
+    # tokens after which a number starts an operand of its own
+    starts: list[TokenTypes] = [
+        TokenTypes.rArrow,
+        TokenTypes.lParen,
+        TokenTypes.logicalOps,
+    ]
+
+    def run(self, tokens: list[Token], symtab: Symtab) -> int:
+        changed = 0
+        index = 1
+        while index + 2 < len(tokens):
+            if (
+                tokens[index].type == TokenTypes.lParen
+                and tokens[index + 1].type == TokenTypes.numb
+                and tokens[index + 2].type == TokenTypes.rParen
+                and self.canUnwrap(
+                    tokens[index - 1],
+                    tokens[index + 3] if index + 3 < len(tokens) else None,
+                    tokens[index + 1].key[0] == "-",
+                )
+            ):
+                # codegen can't continue an expression after "(6)", unwrap it
+                del tokens[index + 2]
+                del tokens[index]
+                changed += 1
+                index = max(index - 2, 1)
+                continue
+
+            value = self.fold(tokens, index)
+            if value is None:
+                index += 1
+                continue
+
+            left = tokens[index]
+            tokens[index : index + 3] = [
+                Token(repr(value), TokenTypes.numb, left.line, left.column)
+            ]
+            changed += 1
+            index = max(index - 2, 1)
+        return changed
+
+    def canUnwrap(self, before: Token, after: Token, negative: bool) -> bool:
+        # only parentheses inside expressions, se/enquanto headers and calls
+        # need theirs; "(-3) ↑ 2" is not "-3 ↑ 2"
+        return before.type in self.starts + [TokenTypes.mathOps] and not (
+            negative and after and after.key == TokenKeys.exponent
+        )
+
+    def fold(self, tokens: list[Token], index: int) -> int | float:
+        left, operator, right = tokens[index : index + 3]
+        if (
+            left.type != TokenTypes.numb
+            or operator.type != TokenTypes.mathOps
+            or right.type != TokenTypes.numb
+            or tokens[index - 1].type not in self.starts
+        ):
+            return None
+
+        # a following operator that binds tighter takes the right operand, and ↑
+        # is right associative
+        after = tokens[index + 3] if index + 3 < len(tokens) else None
+        precedence = self.precedence[operator.key]
+        if after and after.type == TokenTypes.mathOps:
+            if self.precedence[after.key] > precedence or (
+                after.key == TokenKeys.exponent and operator.key == TokenKeys.exponent
+            ):
+                return None
+
+        try:
+            a, b = self.number(left.key), self.number(right.key)
+            match operator.key:
+                case TokenKeys.plus:
+                    value = a + b
+                case TokenKeys.minus:
+                    value = a - b
+                case TokenKeys.mult:
+                    value = a * b
+                case TokenKeys.div:
+                    value = a / b
+                case TokenKeys.mod:
+                    value = a % b
+                case TokenKeys.exponent:
+                    if abs(b) > 64:
+                        return None
+                    value = a**b
+        except (ValueError, ArithmeticError):
+            return None
+
+        if type(value) not in (int, float) or abs(value) >= 2**63:
+            return None
+        # folding into "(6)" is only useful if it can be unwrapped, codegen
+        # can't continue an expression after it
+        if (
+            tokens[index - 1].type == TokenTypes.lParen
+            and index + 3 < len(tokens)
+            and tokens[index + 3].type == TokenTypes.rParen
+            and tokens[index - 2].type not in (TokenTypes.se, TokenTypes.enquanto)
+            and not self.canUnwrap(
+                tokens[index - 2],
+                tokens[index + 4] if index + 4 < len(tokens) else None,
+                value < 0,
+            )
+        ):
+            return None
+        return value
+
+    def number(self, key: str) -> int | float:
+        return float(key) if "." in key else int(key)
+
+
+class RoutinePass(Pass):
+    # what the routine passes know about procedimentos and funções: the kind,
+    # name, first token, início and fim of each
+    tokens: list[Token] = []
+    units: list[tuple[TokenTypes, str, int, int, int]] = []
+    routines: set[str] = set()
+    registros: set[str] = set()
+
+    def analyse(self, tokens: list[Token], symtab: Symtab) -> None:
+        self.tokens = tokens
+        self.registros = {dtype.key for dtype in symtab.dtypes}
+        self.units = []
+        index = 1
+        while index < len(tokens):
+            if tokens[index].type in (TokenTypes.procedimento, TokenTypes.funcao):
+                inicio = index
+                while tokens[inicio].type != TokenTypes.inicio:
+                    inicio += 1
+                stop = inicio
+                while tokens[stop].type != TokenTypes.fim:
+                    stop += 1
+                self.units.append(
+                    (tokens[index].type, tokens[index + 1].key, index, inicio, stop)
+                )
+                index = stop
+            index += 1
+        self.routines = {name for _, name, _, _, _ in self.units}
+
+    def parameters(self, start: int) -> tuple[int, int]:
+        # the tokens between the parentheses of a função, none for a
+        # procedimento
+        if self.tokens[start].type == TokenTypes.procedimento:
+            return start + 2, start + 2
+        close = start
+        while self.tokens[close].type != TokenTypes.rParen:
+            close += 1
+        return start + 3, close
+
+    def declarations(self, start: int, stop: int) -> dict[str, str]:
+        # parameters or variables with their type, None when it isn't given
+        tokens = self.tokens
+        declared = {}
+        names = []
+        index = start
+        while index < stop:
+            token = tokens[index]
+            if token.type == TokenTypes.id and token.key not in self.registros:
+                names.append(token.key)
+            elif token.type in (TokenTypes.dType, TokenTypes.id):
+                declared.update(dict.fromkeys(names, token.key))
+                names = []
+                if token.key == TokenKeys.conjunto:
+                    while tokens[index].type != TokenTypes.rSquare:
+                        index += 1
+                    index += 1
+            index += 1
+        declared.update(dict.fromkeys(names))
+        return declared
+
+    def calls(self, start: int, stop: int) -> list[tuple[int, int]]:
+        # where each call to a routine starts and ends
+        tokens = self.tokens
+        calls = []
+        index = start
+        while index < stop:
+            if (
+                tokens[index].type == TokenTypes.id
+                and tokens[index].key in self.routines
+            ):
+                end = index + 1
+                if tokens[end].type == TokenTypes.lParen:
+                    while tokens[end].type != TokenTypes.rParen:
+                        end += 1
+                    end += 1
+                calls.append((index, end))
+                index = end
+                continue
+            index += 1
+        return calls
+
+    def arguments(self, call: tuple[int, int]) -> list[Token]:
+        index, end = call
+        return [
+            token
+            for token in self.tokens[index + 2 : end - 1]
+            if token.type != TokenTypes.comma
+        ]
+
+
+class Memoize(RoutinePass):
+    name: str = "memoize"
+    level: int = 1
+    # what a call that comes from the cache would skip
+    effects: list[TokenTypes] = [
+        TokenTypes.leia,
+        TokenTypes.escreva,
+        TokenTypes.python,
+    ]
+    scalars: list[str] = [
+        TokenKeys.inteiro,
+        TokenKeys.real,
+        TokenKeys.caractere,
+        TokenKeys.logico,
+    ]
+
+    def run(self, tokens: list[Token], symtab: Symtab) -> int:
+        # funções only see their scalar parameters and their own variables, so
+        # a call with the same arguments does the same thing again
+        self.analyse(tokens, symtab)
+        main = max(
+            index
+            for index, token in enumerate(tokens)
+            if token.type == TokenTypes.inicio
+        )
+        var = max(
+            index for index in range(main) if tokens[index].type == TokenTypes.var
+        )
+        program = self.declarations(var + 1, main)
+        calls = [(call, program) for call in self.calls(main, len(tokens))]
+
+        pure = set()
+        callees = {}
+        for kind, name, start, inicio, stop in self.units:
+            first, last = self.parameters(start)
+            parameters = self.declarations(first, last)
+            scope = parameters | self.declarations(last, inicio)
+            routine = self.calls(inicio, stop)
+            callees[name] = {tokens[index].key for index, _ in routine}
+            calls += [(call, program | scope) for call in routine]
+            if (
+                kind == TokenTypes.funcao
+                and self.contained(inicio, stop, scope)
+                and all(dtype in self.scalars for dtype in parameters.values())
+            ):
+                pure.add(name)
+
+        # the arguments are the cache key, so they have to be hashable
+        for call, scope in calls:
+            if not all(
+                argument.type != TokenTypes.id
+                or scope.get(argument.key) in self.scalars
+                for argument in self.arguments(call)
+            ):
+                pure.discard(tokens[call[0]].key)
+
+        changed = True
+        while changed:
+            changed = False
+            for name in list(pure):
+                if not callees[name] <= pure:
+                    pure.discard(name)
+                    changed = True
+
+        symtab.pure = [name for _, name, _, _, _ in self.units if name in pure]
+        return len(symtab.pure)
+
+    def contained(self, start: int, stop: int, scope: dict[str, str]) -> bool:
+        # only touches names in scope, besides the routines it calls
+        return all(
+            token.type not in self.effects
+            and (
+                token.type != TokenTypes.id
+                or token.key in scope
+                or token.key in self.routines
+            )
+            for token in self.tokens[start:stop]
+        )
+
+
+class Recursion(RoutinePass):
+    name: str = "recursion"
+    # -O0 keeps plain Python recursion unless --max-depth asks for the stack
+    level: int = 1
+
+    def run(self, tokens: list[Token], symtab: Symtab) -> int:
+        self.analyse(tokens, symtab)
+        # a call to the routine itself with nothing left to run after it
+        # starts the routine over, in a loop
+        tails = []
+        edges = {name: set() for name in self.routines}
+        for _, name, start, inicio, stop in self.units:
+            first, last = self.parameters(start)
+            parameters = [
+                token.key for token in tokens[first:last] if token.type == TokenTypes.id
+            ]
+            for call in self.calls(inicio, stop):
+                callee = tokens[call[0]].key
+                if (
+                    callee == name
+                    and self.isTail(call[1])
+                    and len(self.arguments(call)) == len(parameters)
+                ):
+                    tails.append((name, call, parameters))
+                else:
+                    edges[name].add(callee)
+
+        # the routines that still call themselves, directly or through others,
+        # run on an explicit stack; each cycle is known by its first routine
+        reach = {name: self.reach(name, edges) for name in edges}
+        symtab.recursive = {}
+        for _, name, _, _, _ in self.units:
+            if name in reach[name]:
+                symtab.recursive[name] = next(
+                    other
+                    for _, other, _, _, _ in self.units
+                    if other in reach[name] and name in reach[other]
+                )
+
+        for _, call, parameters in reversed(tails):
+            index, end = call
+            code = "continue"
+            if parameters:
+                arguments = [argument.key for argument in self.arguments(call)]
+                code = f"{', '.join(parameters)} = {', '.join(arguments)}\n{code}"
+            token = tokens[index]
+            tokens[index:end] = [
+                Token(code, TokenTypes.python, token.line, token.column)
+            ]
+        symtab.loops = list(dict.fromkeys(name for name, _, _ in tails))
+        return len(tails) + len(symtab.recursive)
+
+    def isTail(self, index: int) -> bool:
+        # nothing runs after the statement that ends at index
+        tokens = self.tokens
+        while tokens[index].type != TokenTypes.fim:
+            if tokens[index].type == TokenTypes.senao:
+                depth = 0
+                while depth or tokens[index].type != TokenTypes.fimse:
+                    depth += (tokens[index].type == TokenTypes.se) - (
+                        tokens[index].type == TokenTypes.fimse
+                    )
+                    index += 1
+            elif tokens[index].type != TokenTypes.fimse:
+                return False
+            index += 1
+        return True
+
+    def reach(self, name: str, edges: dict[str, set[str]]) -> set[str]:
+        reached = set()
+        pending = list(edges[name])
+        while pending:
+            callee = pending.pop()
+            if callee not in reached:
+                reached.add(callee)
+                pending += edges[callee]
+        return reached
+
+
+class LoopPass(Pass):
+    # what the loop passes know about the main program
+    dtypes: dict[str, str] = {TokenKeys.inteiro: "int", TokenKeys.real: "float"}
+    tokens: list[Token] = []
+    main: int = 0
+    # scalar and conjunto element types, None when not known to stay the same
+    types: dict[str, str] = {}
+    arrays: dict[str, tuple[str, int]] = {}
+    # conjunto[..,..], stored as size x size lists
+    matrices: dict[str, tuple[str, int]] = {}
+
+    def analyse(self, tokens: list[Token], symtab: Symtab) -> None:
+        self.tokens = tokens
+        self.types = {}
+        self.arrays = {}
+        self.matrices = {}
+        self.main = max(
+            index
+            for index, token in enumerate(tokens)
+            if token.type == TokenTypes.inicio
+        )
+        self.declare(symtab)
+        self.infer()
+        # conjuntos shared with paralelo workers stay in shared memory
+        for name in symtab.shared:
+            self.arrays.pop(name, None)
+
+    def declare(self, symtab: Symtab) -> None:
+        tokens = self.tokens
+        var = max(
+            index for index in range(self.main) if tokens[index].type == TokenTypes.var
+        )
+        counts = {}
+        for symbol in symtab.symbols:
+            key = symbol["token"].key
+            counts[key] = counts.get(key, 0) + 1
+
+        index = var + 1
+        while index < self.main:
+            names = [tokens[index].key]
+            index += 1
+            while tokens[index].type == TokenTypes.comma:
+                names.append(tokens[index + 1].key)
+                index += 2
+
+            dtype = tokens[index].key
+            if dtype == TokenKeys.conjunto:
+                close = index + 1
+                while tokens[close].type != TokenTypes.rSquare:
+                    close += 1
+                element = tokens[close + 1].key
+                if (
+                    len(names) == 1
+                    and counts[names[0]] == 1
+                    and close in (index + 4, index + 7)
+                    and element in self.dtypes
+                ):
+                    conjuntos = self.arrays if close == index + 4 else self.matrices
+                    conjuntos[names[0]] = (
+                        self.dtypes[element],
+                        int(tokens[index + 3].key),
+                    )
+                index = close + 2
+            else:
+                for name in names:
+                    if counts[name] == 1:
+                        self.types[name] = self.dtypes.get(dtype)
+                index += 1
+
+        # passed around whole, or written by a routine
+        for conjuntos in (self.arrays, self.matrices):
+            for index, token in enumerate(tokens):
+                if token.key not in conjuntos or var < index < self.main:
+                    continue
+                if tokens[index + 1].type != TokenTypes.lSquare or (
+                    index < var and self.isTarget(index)
+                ):
+                    del conjuntos[token.key]
+
+    def infer(self) -> None:
+        tokens = self.tokens
+        assignments = []
+        counters = []
+        for index in range(self.main, len(tokens)):
+            if tokens[index].type == TokenTypes.rArrow:
+                target = index - 1
+                if tokens[target].type == TokenTypes.rSquare:
+                    while tokens[target].type != TokenTypes.lSquare:
+                        target -= 1
+                    target -= 1
+                end = self.exprEnd(index + 1)
+                assignments.append(
+                    (tokens[target].key, target < index - 1, index + 1, end)
+                )
+            elif tokens[index].type == TokenTypes.para:
+                counters.append(tokens[index + 1].key)
+
+        changed = True
+        while changed:
+            changed = False
+            for name, element, start, end in assignments:
+                dtype = self.exprType(start, end)
+                conjuntos = self.matrices if name in self.matrices else self.arrays
+                if element and name in conjuntos and conjuntos[name][0] != dtype:
+                    del conjuntos[name]
+                    changed = True
+                elif not element and self.types.get(name) not in (None, dtype):
+                    self.types[name] = None
+                    changed = True
+            for name in counters:
+                if self.types.get(name) not in (None, "int"):
+                    self.types[name] = None
+                    changed = True
+
+    def exprEnd(self, index: int) -> int:
+        tokens = self.tokens
+        operand = True
+        depth = 0
+        while index < len(tokens):
+            token = tokens[index]
+            if operand and token.type == TokenTypes.lParen:
+                depth += 1
+            elif operand and token.type in (
+                TokenTypes.numb,
+                TokenTypes.str,
+                TokenTypes.id,
+                TokenTypes.verdadeiro,
+                TokenTypes.falso,
+            ):
+                operand = False
+                if index + 1 < len(tokens) and tokens[index + 1].type in (
+                    TokenTypes.lSquare,
+                    TokenTypes.lParen,
+                ):
+                    close = (
+                        TokenTypes.rSquare
+                        if tokens[index + 1].type == TokenTypes.lSquare
+                        else TokenTypes.rParen
+                    )
+                    while tokens[index].type != close:
+                        index += 1
+            elif not operand and token.type in (
+                TokenTypes.mathOps,
+                TokenTypes.logicalOps,
+            ):
+                operand = True
+            elif not operand and token.type == TokenTypes.rParen and depth:
+                depth -= 1
+            else:
+                break
+            index += 1
+        return index
+
+    def exprType(self, start: int, end: int) -> str:
+        tokens = self.tokens
+        kinds = set()
+        division = False
+        index = start
+        while index < end:
+            token = tokens[index]
+            if token.type == TokenTypes.numb:
+                kinds.add("float" if "." in token.key else "int")
+            elif (
+                token.type == TokenTypes.id
+                and tokens[index + 1].type == TokenTypes.lSquare
+            ):
+                conjunto = self.arrays.get(token.key) or self.matrices.get(token.key)
+                kinds.add(conjunto[0] if conjunto else None)
+                while tokens[index].type != TokenTypes.rSquare:
+                    index += 1
+            elif (
+                token.type == TokenTypes.id
+                and tokens[index + 1].type != TokenTypes.lParen
+            ):
+                kinds.add(self.types.get(token.key))
+            elif token.type == TokenTypes.mathOps:
+                division = division or token.key == TokenKeys.div
+                # int ↑ int is only an int for exponents that aren't negative
+                following = tokens[index + 1]
+                if token.key == TokenKeys.exponent and (
+                    following.type != TokenTypes.numb
+                    or "." in following.key
+                    or following.key[0] == "-"
+                ):
+                    return None
+            elif token.type not in (TokenTypes.lParen, TokenTypes.rParen):
+                return None
+            index += 1
+
+        if not kinds or None in kinds:
+            return None
+        return "float" if division or "float" in kinds else "int"
+
+    def isTarget(self, index: int) -> bool:
+        while self.tokens[index].type != TokenTypes.rSquare:
+            index += 1
+        return self.tokens[self.fieldEnd(index + 1)].type == TokenTypes.rArrow
+
+    def fieldEnd(self, index: int) -> int:
+        # past a .CAMPO at index, and the [J] of a conjunto field
+        if self.tokens[index].type == TokenTypes.field:
+            index += 1
+            if self.tokens[index].type == TokenTypes.lSquare:
+                while self.tokens[index].type != TokenTypes.rSquare:
+                    index += 1
+                index += 1
+        return index
+
+    def accumulation(self, index: int) -> tuple[str, str, int, int, int]:
+        # S ← S + E, S ← E + S and the same with *: the accumulator, the
+        # operator, where E starts and stops and where the statement ends
+        tokens = self.tokens
+        if not (
+            tokens[index].type == TokenTypes.id
+            and tokens[index + 1].type == TokenTypes.rArrow
+        ):
+            return None
+        accumulator = tokens[index].key
+        start, end = index + 2, self.exprEnd(index + 2)
+        if end - start < 3:
+            return None
+        if tokens[start].key == accumulator:
+            operator, first, last = tokens[start + 1], start + 2, end
+        elif tokens[end - 1].key == accumulator:
+            operator, first, last = tokens[end - 2], start, end - 2
+        else:
+            return None
+        if operator.key not in (TokenKeys.plus, TokenKeys.mult):
+            return None
+
+        # E has to be a single operand of the operator: S + A[I] - 1 is
+        # (S + A[I]) - 1, while A[I] - 1 + S is fine
+        precedence = ConstantFolding.precedence
+        depth = 0
+        for token in tokens[first:last]:
+            if token.type == TokenTypes.lParen:
+                depth += 1
+            elif token.type == TokenTypes.rParen:
+                depth -= 1
+            elif depth == 0 and token.type == TokenTypes.mathOps:
+                if precedence[token.key] < precedence[operator.key] or (
+                    first == start + 2
+                    and precedence[token.key] == precedence[operator.key]
+                ):
+                    return None
+        return accumulator, operator.key, first, last, end
+
+    def uses(self, start: int, end: int, name: str) -> bool:
+        return any(token.key == name for token in self.tokens[start:end])
+
+    def header(self, index: int) -> tuple[str, int, int, int]:
+        # para V de s até e passo st faça, with V an int and s, e, st numbers
+        header = self.tokens[index : index + 8]
+        if len(header) < 8 or [token.type for token in header[1:]] != [
+            TokenTypes.id,
+            TokenTypes.numb,
+            TokenTypes.ate,
+            TokenTypes.numb,
+            TokenTypes.passo,
+            TokenTypes.numb,
+            TokenTypes.faca,
+        ]:
+            return None
+        try:
+            start, stop, step = (int(header[offset].key) for offset in (2, 4, 6))
+        except ValueError:
+            return None
+        counter = header[1].key
+        if step <= 0 or not 0 <= start < stop or self.types.get(counter) != "int":
+            return None
+        return counter, start, stop, step
+
+    def last(self, counter: str, start: int, stop: int, step: int) -> str:
+        # the counter keeps the value of the last iteration
+        return f"{counter} = {start + (stop - start - 1) // step * step}"
+
+    # the expression over the whole range, with conjuntos only indexed by the
+    # counter; None if it is anything else
+    def render(
+        self,
+        start: int,
+        end: int,
+        counter: str,
+        subscript: str,
+        value: str,
+        names: set[str],
+        fixed: bool = False,
+    ) -> str:
+        # with fixed, conjuntos may also be indexed by numbers and by scalars
+        # the loop doesn't change
+        tokens = self.tokens
+        expression = ""
+        index = start
+        while index < end:
+            token = tokens[index]
+            if token.type == TokenTypes.numb:
+                expression += token.key
+            elif (
+                token.type == TokenTypes.id
+                and tokens[index + 1].type == TokenTypes.lSquare
+            ):
+                position = tokens[index + 2]
+                if (
+                    token.key not in self.arrays
+                    or tokens[index + 3].type != TokenTypes.rSquare
+                ):
+                    return None
+                if position.key == counter:
+                    names.add(token.key)
+                    expression += f"{token.key}[{subscript}]"
+                elif fixed and (
+                    position.type == TokenTypes.numb
+                    and "." not in position.key
+                    or self.types.get(position.key) == "int"
+                ):
+                    expression += f"{token.key}[{position.key}]"
+                else:
+                    return None
+                index += 3
+            elif token.type == TokenTypes.id and token.key == counter:
+                expression += value
+            elif token.type == TokenTypes.id and self.types.get(token.key):
+                expression += token.key
+            elif token.type == TokenTypes.mathOps:
+                operator = "**" if token.key == TokenKeys.exponent else token.key
+                expression += f" {operator} "
+            elif token.type == TokenTypes.lParen:
+                expression += "("
+            elif token.type == TokenTypes.rParen:
+                expression += ")"
+            else:
+                return None
+            index += 1
+        return expression
+
+
+class Vectorize(LoopPass):
+    name: str = "vectorize"
+    level: int = 2
+    available: bool = importlib.util.find_spec("numpy") is not None
+
+    def run(self, tokens: list[Token], symtab: Symtab) -> int:
+        if not self.available:
+            return 0
+
+        self.analyse(tokens, symtab)
+        loops = {}
+        for index in range(self.main, len(tokens)):
+            if tokens[index].type == TokenTypes.para:
+                loop = self.vectorizeLoop(index)
+                if loop:
+                    loops[index] = loop
+
+        # conjuntos become ndarrays, so one read by a scalar loop or expression
+        # would be slower and leak numpy numbers into the program; leia and
+        # escreva are fine
+        while True:
+            inside = {
+                index
+                for start, (stop, _, _) in loops.items()
+                for index in range(start, stop + 1)
+            }
+            scalar = {
+                tokens[index].key for index in self.reads() if index not in inside
+            }
+            dropped = [
+                start for start, (_, _, names) in loops.items() if names & scalar
+            ]
+            if not dropped:
+                break
+            for start in dropped:
+                del loops[start]
+
+        changed = 0
+        for start in sorted(loops, reverse=True):
+            stop, code, names = loops[start]
+            token = tokens[start]
+            tokens[start : stop + 1] = [
+                Token(code, TokenTypes.python, token.line, token.column)
+            ]
+            for name in names:
+                symtab.vectors[name] = self.arrays[name][0]
+            changed += 1
+        return changed
+
+    def reads(self) -> list[int]:
+        tokens = self.tokens
+        io = set()
+        for index, token in enumerate(tokens):
+            if token.type in (TokenTypes.leia, TokenTypes.escreva):
+                end = index + 1
+                while tokens[end].type in (
+                    TokenTypes.str,
+                    TokenTypes.numb,
+                    TokenTypes.id,
+                ):
+                    if tokens[end + 1].type == TokenTypes.lSquare:
+                        while tokens[end].type != TokenTypes.rSquare:
+                            end += 1
+                    end += 1
+                    if tokens[end].type not in (TokenTypes.mathOps, TokenTypes.comma):
+                        break
+                    end += 1
+                io.update(range(index, end))
+
+        return [
+            index
+            for index, token in enumerate(tokens)
+            if token.key in self.arrays
+            and token.type == TokenTypes.id
+            and tokens[index + 1].type == TokenTypes.lSquare
+            and index not in io
+            and not self.isTarget(index)
+        ]
+
+    def vectorizeLoop(self, index: int) -> tuple[int, str, set[str]]:
+        tokens = self.tokens
+        header = self.header(index)
+        if not header:
+            return None
+        counter, start, stop, step = header
+        span = f"{start}:{stop}:{step}"
+
+        # only A[V] ← expr, so no iteration depends on another
+        names = set()
+        statements = []
+        index += 8
+        while tokens[index].type != TokenTypes.fimpara:
+            target = tokens[index]
+            if not (
+                target.type == TokenTypes.id
+                and target.key in self.arrays
+                and tokens[index + 1].type == TokenTypes.lSquare
+                and tokens[index + 2].key == counter
+                and tokens[index + 3].type == TokenTypes.rSquare
+                and tokens[index + 4].type == TokenTypes.rArrow
+            ):
+                return None
+            end = self.exprEnd(index + 5)
+            expression = self.render(
+                index + 5,
+                end,
+                counter,
+                span,
+                f"numpy.arange({start}, {stop}, {step})",
+                names,
+            )
+            if (
+                expression is None
+                or self.exprType(index + 5, end) != self.arrays[target.key][0]
+            ):
+                return None
+            names.add(target.key)
+            statements.append(f"{target.key}[{span}] = {expression}")
+            index = end
+
+        # int64 wraps around where Python ints grow, so only reals are safe
+        if not statements or any(
+            self.arrays[name][1] < stop or self.arrays[name][0] != "float"
+            for name in names
+        ):
+            return None
+        statements.append(self.last(counter, start, stop, step))
+        return index, "\n".join(statements), names
+
+
+class Reduction(LoopPass):
+    name: str = "reduce"
+    level: int = 2
+    # what "se (E > M) então M ← E" keeps, for E on either side
+    bounds: dict[tuple[str, bool], str] = {
+        (TokenKeys.grater, True): "max",
+        (TokenKeys.less, False): "max",
+        (TokenKeys.less, True): "min",
+        (TokenKeys.grater, False): "min",
+    }
+    comparisons: dict[str, str] = {
+        TokenKeys.equal: "==",
+        TokenKeys.NotEq: "!=",
+        TokenKeys.grater: ">",
+        TokenKeys.less: "<",
+        TokenKeys.graterEq: ">=",
+        TokenKeys.lessEq: "<=",
+    }
+
+    def run(self, tokens: list[Token], symtab: Symtab) -> int:
+        self.analyse(tokens, symtab)
+        # ndarrays would sum in numpy numbers
+        for name in symtab.vectors:
+            self.arrays.pop(name, None)
+
+        changed = 0
+        for index in range(len(tokens) - 1, self.main, -1):
+            if tokens[index].type != TokenTypes.para:
+                continue
+            loop = self.reduceLoop(index)
+            if loop:
+                stop, code = loop
+                token = tokens[index]
+                tokens[index : stop + 1] = [
+                    Token(code, TokenTypes.python, token.line, token.column)
+                ]
+                changed += 1
+        return changed
+
+    def reduceLoop(self, index: int) -> tuple[int, str]:
+        tokens = self.tokens
+        header = self.header(index)
+        if not header:
+            return None
+        counter = header[0]
+
+        # every statement accumulates into its own scalar, which no other
+        # statement reads
+        names = set()
+        statements = []
+        accumulators = set()
+        reads = set()
+        index += 8
+        while tokens[index].type != TokenTypes.fimpara:
+            if tokens[index].type == TokenTypes.se:
+                reduction = self.reduceSe(index, header, names)
+            else:
+                reduction = self.reduceAssign(index, header, names)
+            if not reduction:
+                return None
+            end, accumulator, statement = reduction
+            if accumulator in accumulators or accumulator == counter:
+                return None
+            accumulators.add(accumulator)
+            reads |= {
+                token.key
+                for token in tokens[index:end]
+                if token.type == TokenTypes.id and token.key != accumulator
+            }
+            statements.append(statement)
+            index = end
+
+        if (
+            not statements
+            or accumulators & reads
+            or any(self.arrays[name][1] < header[2] for name in names)
+        ):
+            return None
+        statements.append(self.last(*header))
+        return index, "\n".join(statements)
+
+    def reduceAssign(
+        self, index: int, header: tuple, names: set[str]
+    ) -> tuple[int, str, str]:
+        accumulation = self.accumulation(index)
+        if not accumulation:
+            return None
+        accumulator, operator, first, last, end = accumulation
+
+        dtype = self.exprType(first, last)
+        elements = self.elements(first, last, header, names)
+        if (
+            elements is None
+            or not dtype
+            or not self.types.get(accumulator)
+            or self.uses(first, last, accumulator)
+        ):
+            return None
+
+        if operator == TokenKeys.mult:
+            code = f"import math\n{accumulator} = math.prod({elements}, start={accumulator})"
+        elif dtype == "int" and self.types[accumulator] == "int":
+            code = f"{accumulator} = sum({elements}, {accumulator})"
+        else:
+            # sum() may add floats in another order than the loop
+            code = (
+                "import functools\nimport operator\n"
+                f"{accumulator} = functools.reduce(operator.add, {elements}, {accumulator})"
+            )
+        return end, accumulator, code
+
+    def reduceSe(
+        self, index: int, header: tuple, names: set[str]
+    ) -> tuple[int, str, str]:
+        # se (E > M) então M ← E fim_se, or a count with C ← C + 1
+        tokens = self.tokens
+        close = index + 1
+        depth = 0
+        while True:
+            if tokens[close].type == TokenTypes.lParen:
+                depth += 1
+            elif tokens[close].type == TokenTypes.rParen:
+                depth -= 1
+                if not depth:
+                    break
+            close += 1
+        comparisons = [
+            position
+            for position in range(index + 2, close)
+            if tokens[position].type == TokenTypes.logicalOps
+        ]
+        target = close + 2
+        if (
+            len(comparisons) != 1
+            or tokens[comparisons[0]].key not in self.comparisons
+            or tokens[close + 1].type != TokenTypes.entao
+            or tokens[target].type != TokenTypes.id
+            or tokens[target + 1].type != TokenTypes.rArrow
+        ):
+            return None
+        comparison = comparisons[0]
+        accumulator = tokens[target].key
+        end = self.exprEnd(target + 2)
+        if tokens[end].type != TokenTypes.fimse or not self.types.get(accumulator):
+            return None
+
+        sides = [(index + 2, comparison), (comparison + 1, close)]
+        value = [token.key for token in tokens[target + 2 : end]]
+        if value in (
+            [accumulator, TokenKeys.plus, "1"],
+            ["1", TokenKeys.plus, accumulator],
+        ):
+            if self.types[accumulator] != "int" or any(
+                self.uses(first, last, accumulator) or not self.exprType(first, last)
+                for first, last in sides
+            ):
+                return None
+            counter, start, stop, step = header
+            condition = [
+                self.render(first, last, counter, counter, counter, names, True)
+                for first, last in sides
+            ]
+            if None in condition:
+                return None
+            code = (
+                f"{accumulator} = {accumulator} + sum(1 for {counter} in"
+                f" range({start}, {stop}, {step}) if {condition[0]}"
+                f" {self.comparisons[tokens[comparison].key]} {condition[1]})"
+            )
+            return end + 1, accumulator, code
+
+        # max() and min() replace the kept value on the same > and < as the loop
+        for (first, last), (other, _) in zip(sides, reversed(sides)):
+            bound = self.bounds.get((tokens[comparison].key, first == index + 2))
+            if (
+                bound
+                and [token.key for token in tokens[first:last]] == value
+                and tokens[other].key == accumulator
+                and other + 1 in (comparison, close)
+                and not self.uses(first, last, accumulator)
+                and self.exprType(first, last)
+            ):
+                elements = self.elements(first, last, header, names)
+                if elements is None:
+                    return None
+                code = f"{accumulator} = {bound}({accumulator}, *{elements})"
+                return end + 1, accumulator, code
+        return None
+
+    def elements(self, start: int, end: int, header: tuple, names: set[str]) -> str:
+        # the values of E over the range, sliced when E is just V[I]
+        counter, first, stop, step = header
+        tokens = self.tokens
+        if (
+            end - start == 4
+            and tokens[start].key in self.arrays
+            and tokens[start + 1].type == TokenTypes.lSquare
+            and tokens[start + 2].key == counter
+        ):
+            names.add(tokens[start].key)
+            return f"{tokens[start].key}[{first}:{stop}:{step}]"
+
+        expression = self.render(start, end, counter, counter, counter, names, True)
+        if expression is None:
+            return None
+        return f"({expression} for {counter} in range({first}, {stop}, {step}))"
+
+
+class MatrixLoops(LoopPass):
+    name: str = "matrix"
+    level: int = 2
+
+    def run(self, tokens: list[Token], symtab: Symtab) -> int:
+        self.analyse(tokens, symtab)
+        for name in symtab.vectors:
+            self.arrays.pop(name, None)
+
+        changed = 0
+        for index in range(len(tokens) - 1, self.main, -1):
+            if tokens[index].type != TokenTypes.para:
+                continue
+            nest = self.matmul(index) or self.transpose(index) or self.matvec(index)
+            if nest:
+                stop, code = nest
+                token = tokens[index]
+                tokens[index : stop + 1] = [
+                    Token(code, TokenTypes.python, token.line, token.column)
+                ]
+                changed += 1
+        return changed
+
+    def loop(self, index: int) -> tuple[str, int, int, int]:
+        if self.tokens[index].type != TokenTypes.para:
+            return None
+        header = self.header(index)
+        return header if header and header[3] == 1 else None
+
+    def keys(self, start: int, end: int) -> list[str]:
+        return [token.key for token in self.tokens[start:end]]
+
+    def closes(self, index: int, count: int) -> bool:
+        return all(
+            token.type == TokenTypes.fimpara
+            for token in self.tokens[index : index + count]
+        )
+
+    def zero(self, index: int, target: list[str]) -> str:
+        # C[I,J] ← 0 before the innermost loop
+        if index + len(target) + 1 >= len(self.tokens):
+            return None
+        token = self.tokens[index + len(target) + 1]
+        if (
+            self.keys(index, index + len(target) + 1) == target + [TokenKeys.rArrow]
+            and token.type == TokenTypes.numb
+            and float(token.key) == 0
+        ):
+            return token.key
+        return None
+
+    def matmul(self, index: int) -> tuple[int, str]:
+        # para I, para J, [C[I,J] ← 0,] para K: C[I,J] ← C[I,J] + A[I,K] * B[K,J]
+        rows, columns = self.loop(index), self.loop(index + 8)
+        if not rows or not columns:
+            return None
+        i, a, b, _ = rows
+        j, c, d, _ = columns
+        index += 16
+        zero = self.zero(index, [self.tokens[index].key, "[", i, ",", j, "]"])
+        if zero:
+            index += 8
+        inner = self.loop(index)
+        if not inner:
+            return None
+        k, e, f, _ = inner
+        index += 8
+        target = [self.tokens[index].key, "[", i, ",", j, "]"]
+        if zero and self.tokens[index - 16].key != target[0]:
+            return None
+
+        statement = self.keys(index, index + 27)
+        if (
+            statement[:14] != target + [TokenKeys.rArrow] + target + [TokenKeys.plus]
+            or statement[20] != TokenKeys.mult
+            or not self.closes(index + 27, 3)
+            or len({i, j, k}) < 3
+        ):
+            return None
+        factors = statement[14:20], statement[21:27]
+        for left, right in (factors, factors[::-1]):
+            if left[1:] == ["[", i, ",", k, "]"] and right[1:] == ["[", k, ",", j, "]"]:
+                break
+        else:
+            return None
+        C, A, B = target[0], left[0], right[0]
+        if (
+            not all(name in self.matrices for name in (A, B, C))
+            or C in (A, B)
+            or b > min(self.matrices[C][1], self.matrices[A][1])
+            or d > min(self.matrices[C][1], self.matrices[B][1])
+            or f > min(self.matrices[A][1], self.matrices[B][1])
+        ):
+            return None
+
+        dtype = self.dtype(A, B, C)
+        if Vectorize.available:
+            product = self.product(
+                f"[row[{e}:{f}] for row in {A}[{a}:{b}]]",
+                f"[row[{c}:{d}] for row in {B}[{e}:{f}]]",
+                f - e,
+                dtype,
+            )
+            values = (
+                f"[{zero} + s for s in p]"
+                if zero
+                else f"[v + s for v, s in zip(row[{c}:{d}], p)]"
+            )
+            code = (
+                f"{C}[{a}:{b}] = [row[:{c}] + {values} + row[{d}:]"
+                f" for row, p in zip({C}[{a}:{b}], {product})]"
+            )
+        else:
+            # B's columns once, then each C[I,J] is a dot product in K order
+            dot = self.dot(zero or "v", f"x[{e}:{f}]", "y", dtype)
+            code = (
+                f"{C}[{a}:{b}] = [row[:{c}] + [{dot} for v, y in zip(row[{c}:{d}], t)]"
+                f" + row[{d}:] for t in [list(zip(*{B}[{e}:{f}]))[{c}:{d}]]"
+                f" for row, x in zip({C}[{a}:{b}], {A}[{a}:{b}])]"
+            )
+        return index + 29, "\n".join(
+            self.imports(dtype)
+            + [code, self.last(*rows), self.last(*columns), self.last(*inner)]
+        )
+
+    def transpose(self, index: int) -> tuple[int, str]:
+        # para I, para J: T[I,J] ← A[J,I]
+        rows, columns = self.loop(index), self.loop(index + 8)
+        if not rows or not columns:
+            return None
+        i, a, b, _ = rows
+        j, c, d, _ = columns
+        index += 16
+        statement = self.keys(index, index + 13)
+        T, A = statement[0], statement[7]
+        if (
+            statement
+            != [T, "[", i, ",", j, "]", TokenKeys.rArrow, A, "[", j, ",", i, "]"]
+            or not self.closes(index + 13, 2)
+            or i == j
+            or T == A
+            or T not in self.matrices
+            or A not in self.matrices
+            or max(b, d) > min(self.matrices[T][1], self.matrices[A][1])
+        ):
+            return None
+
+        code = (
+            f"{T}[{a}:{b}] = [row[:{c}] + list(column[{c}:{d}]) + row[{d}:]"
+            f" for row, column in zip({T}[{a}:{b}], list(zip(*{A}))[{a}:{b}])]"
+        )
+        return index + 14, "\n".join([code, self.last(*rows), self.last(*columns)])
+
+    def matvec(self, index: int) -> tuple[int, str]:
+        # para I, [Y[I] ← 0,] para J: Y[I] ← Y[I] + A[I,J] * X[J]
+        rows = self.loop(index)
+        if not rows:
+            return None
+        i, a, b, _ = rows
+        index += 8
+        zero = self.zero(index, [self.tokens[index].key, "[", i, "]"])
+        if zero:
+            index += 6
+        columns = self.loop(index)
+        if not columns:
+            return None
+        j, c, d, _ = columns
+        index += 8
+        target = [self.tokens[index].key, "[", i, "]"]
+        if zero and self.tokens[index - 14].key != target[0]:
+            return None
+
+        statement = self.keys(index, index + 21)
+        if (
+            statement[:10] != target + [TokenKeys.rArrow] + target + [TokenKeys.plus]
+            or not self.closes(index + 21, 2)
+            or i == j
+        ):
+            return None
+        if statement[14] == TokenKeys.mult:
+            vector, matrix = statement[10:14], statement[15:21]
+        elif statement[16] == TokenKeys.mult:
+            matrix, vector = statement[10:16], statement[17:21]
+        else:
+            return None
+        Y, A, X = target[0], matrix[0], vector[0]
+        if (
+            matrix[1:] != ["[", i, ",", j, "]"]
+            or vector[1:] != ["[", j, "]"]
+            or Y not in self.arrays
+            or X not in self.arrays
+            or A not in self.matrices
+            or X == Y
+            or b > min(self.arrays[Y][1], self.matrices[A][1])
+            or d > min(self.arrays[X][1], self.matrices[A][1])
+        ):
+            return None
+
+        dtype = self.dtype(A, X, Y)
+        if Vectorize.available:
+            product = self.product(
+                f"[row[{c}:{d}] for row in {A}[{a}:{b}]]",
+                f"{X}[{c}:{d}]",
+                d - c,
+                dtype,
+                False,
+            )
+            values = (
+                f"[{zero} + s for s in {product}]"
+                if zero
+                else f"[v + s for v, s in zip({Y}[{a}:{b}], {product})]"
+            )
+            code = f"{Y}[{a}:{b}] = {values}"
+        else:
+            dot = self.dot(zero or "v", f"row[{c}:{d}]", "x", dtype)
+            code = (
+                f"{Y}[{a}:{b}] = [{dot} for x in [{X}[{c}:{d}]]"
+                f" for v, row in zip({Y}[{a}:{b}], {A}[{a}:{b}])]"
+            )
+        return index + 22, "\n".join(
+            self.imports(dtype) + [code, self.last(*rows), self.last(*columns)]
+        )
+
+    def imports(self, dtype: str) -> list[str]:
+        if Vectorize.available:
+            return ["import numpy"] + (["import itertools"] if dtype == "int" else [])
+        return ["import operator"] + (["import functools"] if dtype == "float" else [])
+
+    def dtype(self, *names: str) -> str:
+        conjuntos = {**self.arrays, **self.matrices}
+        if all(conjuntos[name][0] == "int" for name in names):
+            return "int"
+        return "float"
+
+    def product(
+        self, left: str, right: str, size: int, dtype: str, matrix: bool = True
+    ) -> str:
+        if dtype == "float":
+            return (
+                f"(numpy.array({left}, dtype=numpy.float64)"
+                f" @ numpy.array({right}, dtype=numpy.float64)).tolist()"
+            )
+        # int64 as long as no sum can overflow, Python ints otherwise
+        flat = "*b" if matrix else "b"
+        return (
+            "[(numpy.array(a, dtype=t) @ numpy.array(b, dtype=t)).tolist()"
+            f" for a, b in [({left}, {right})]"
+            f" for t in [numpy.int64 if max(map(abs, itertools.chain(*a, {flat})),"
+            f" default=0) ** 2 * {size} < 2 ** 63 else object]][0]"
+        )
+
+    def dot(self, start: str, left: str, right: str, dtype: str) -> str:
+        if dtype == "int":
+            return f"sum(map(operator.mul, {left}, {right}), {start})"
+        # sum() may add floats in another order than the loop
+        return f"functools.reduce(operator.add, map(operator.mul, {left}, {right}), {start})"
+
+
+class Parallel(LoopPass):
+    name: str = "parallel"
+    # paralelo is asked for by the program, so it runs at every level
+    level: int = 0
+    # output and input have to stay in order
+    serial: list[TokenTypes] = [
+        TokenTypes.leia,
+        TokenTypes.escreva,
+        TokenTypes.python,
+    ]
+    opens: list[TokenTypes] = [TokenTypes.se, TokenTypes.enquanto, TokenTypes.para]
+    closes: list[TokenTypes] = [
+        TokenTypes.fimse,
+        TokenTypes.fimenq,
+        TokenTypes.fimpara,
+    ]
+    routines: set[str] = set()
+
+    def run(self, tokens: list[Token], symtab: Symtab) -> int:
+        self.analyse(tokens, symtab)
+        self.routines = {
+            tokens[index + 1].key
+            for index in range(self.main)
+            if tokens[index].type in (TokenTypes.procedimento, TokenTypes.funcao)
+        }
+
+        # the outermost loops run in workers, the ones inside them in order
+        markers = [
+            index
+            for index, token in enumerate(tokens)
+            if token.type == TokenTypes.paralelo
+        ]
+        loops = {}
+        for marker in markers:
+            if marker < self.main or any(
+                start < marker < stop for start, (stop, _, _) in loops.items()
+            ):
+                continue
+            loop = self.parallelLoop(marker)
+            if loop:
+                loops[marker] = loop
+
+        # the marker of a loop that can't run in workers goes away, so the loop
+        # runs in order; the one of a loop that can lists its scalars
+        for marker in reversed(markers):
+            if marker not in loops:
+                del tokens[marker]
+                continue
+            _, names, written = loops[marker]
+            token = tokens[marker]
+            tokens[marker] = Token(names, TokenTypes.paralelo, token.line, token.column)
+            for name in written:
+                symtab.shared[name] = self.arrays[name][0]
+        return len(loops)
+
+    def parallelLoop(self, marker: int) -> tuple[int, str, set[str]]:
+        # iterations only write their own element, V[I], of conjuntos and
+        # scalars that are either accumulated (S ← S + E or S ← S * E) or set
+        # before they're read
+        tokens = self.tokens
+        para = marker
+        while tokens[para].type != TokenTypes.para:
+            para -= 1
+        counter = tokens[para + 1].key
+        if self.types.get(counter) != "int":
+            return None
+
+        elements = []
+        scalars = {}
+        definitions = {}
+        depth = 0
+        stop = marker + 1
+        while depth or tokens[stop].type != TokenTypes.fimpara:
+            token = tokens[stop]
+            if token.type in self.serial or token.key in self.routines:
+                return None
+            if token.type in self.opens:
+                depth += 1
+            elif token.type in self.closes:
+                depth -= 1
+            elif (
+                token.type == TokenTypes.id
+                and tokens[stop + 1].type == TokenTypes.lSquare
+            ):
+                close = stop + 1
+                while tokens[close].type != TokenTypes.rSquare:
+                    close += 1
+                own = [part.key for part in tokens[stop + 2 : close]] == [counter]
+                elements.append((token.key, own, self.isTarget(stop)))
+            elif (
+                token.type == TokenTypes.id
+                and tokens[stop + 1].type == TokenTypes.field
+            ):
+                # the workers' copies of a registro aren't sent back
+                if tokens[self.fieldEnd(stop + 1)].type == TokenTypes.rArrow:
+                    return None
+            elif token.type == TokenTypes.id:
+                scalars.setdefault(token.key, []).append(stop)
+                if tokens[stop + 1].type == TokenTypes.rArrow:
+                    definitions.setdefault(token.key, []).append((stop, depth == 0))
+                elif tokens[stop - 1].type == TokenTypes.para:
+                    definitions.setdefault(token.key, []).append((stop, depth == 1))
+            stop += 1
+
+        written = {name for name, _, target in elements if target}
+        if any(
+            name in written and not (own and name in self.arrays)
+            for name, own, _ in elements
+        ):
+            return None
+
+        accumulators = []
+        privates = []
+        for name, uses in scalars.items():
+            if name not in definitions:
+                continue
+            if name == counter or not self.types.get(name):
+                return None
+            accumulations = [self.accumulation(index) for index, _ in definitions[name]]
+            operators = {
+                (
+                    accumulation[1]
+                    if accumulation and not self.uses(*accumulation[2:4], name)
+                    else None
+                )
+                for accumulation in accumulations
+            }
+            # every use is in one of its own accumulations
+            if len(uses) == 2 * len(accumulations) and operators in (
+                {TokenKeys.plus},
+                {TokenKeys.mult},
+            ):
+                accumulators.append(f"{name}{operators.pop()}")
+                continue
+            # the first use sets it, outside of se and enquanto
+            index, top = definitions[name][0]
+            if (
+                index != uses[0]
+                or not top
+                or tokens[index + 1].type == TokenTypes.rArrow
+                and self.uses(index + 2, self.exprEnd(index + 2), name)
+            ):
+                return None
+            privates.append(name)
+
+        return stop, " ".join(accumulators + privates + [counter]), written
+
+
+class StrengthReduction(LoopPass):
+    name: str = "strength"
+    level: int = 2
+    # operators after which X ↑ 2 can become X * X without parentheses
+    before: list[str] = [TokenKeys.plus, TokenKeys.minus]
+
+    def run(self, tokens: list[Token], symtab: Symtab) -> int:
+        # ** goes through the generic power, * of two ints is much faster; a
+        # real squared past ~1e308 would be inf instead of an OverflowError
+        self.analyse(tokens, symtab)
+        changed = 0
+        index = len(tokens) - 2
+        while index > self.main:
+            token = tokens[index]
+            if (
+                token.key == TokenKeys.exponent
+                and tokens[index + 1].key == "2"
+                and tokens[index + 2].key != TokenKeys.exponent
+            ):
+                first = self.operand(index - 1)
+                if first is not None:
+                    operand = tokens[first:index]
+                    tokens[index : index + 2] = [
+                        Token(
+                            TokenKeys.mult, TokenTypes.mathOps, token.line, token.column
+                        )
+                    ] + operand
+                    changed += 1
+                    index = first
+            index -= 1
+        return changed
+
+    def operand(self, last: int) -> int:
+        # where the operand that ends at last starts, if it is an int scalar or
+        # element and nothing before it binds tighter than +
+        tokens = self.tokens
+        first = last
+        if tokens[last].type == TokenTypes.rSquare:
+            while tokens[first].type != TokenTypes.lSquare:
+                first -= 1
+            first -= 1
+            conjunto = self.arrays.get(tokens[first].key) or self.matrices.get(
+                tokens[first].key
+            )
+            if not conjunto or conjunto[0] != "int" or last - first not in (3, 5):
+                return None
+        elif (
+            tokens[last].type != TokenTypes.id
+            or self.types.get(tokens[last].key) != "int"
+        ):
+            return None
+
+        previous = tokens[first - 1]
+        if previous.type == TokenTypes.mathOps and (
+            previous.key not in self.before
+            or tokens[first - 2].type == TokenTypes.mathOps
+        ):
+            return None
+        if previous.type not in (
+            TokenTypes.mathOps,
+            TokenTypes.rArrow,
+            TokenTypes.lParen,
+            TokenTypes.logicalOps,
+        ):
+            return None
+        return first
+
+
+class Unroll(LoopPass):
+    name: str = "unroll"
+    level: int = 2
+    # loops of up to this many iterations, and tokens once unrolled
+    iterations: int = 8
+    size: int = 400
+
+    def run(self, tokens: list[Token], symtab: Symtab) -> int:
+        # each iteration becomes the counter assignment and a copy of the
+        # body, which spares the range and its iterator; the counter ends with
+        # the value of the last iteration, like after the for
+        self.analyse(tokens, symtab)
+        changed = 0
+        for index in reversed(range(self.main, len(tokens))):
+            if tokens[index].type != TokenTypes.para:
+                continue
+            header = self.header(index)
+            if not header or tokens[index + 8].type == TokenTypes.paralelo:
+                continue
+            counter, start, stop, step = header
+            values = range(start, stop, step)
+
+            depth = 0
+            end = index + 8
+            while depth or tokens[end].type != TokenTypes.fimpara:
+                if tokens[end].type == TokenTypes.para:
+                    depth += 1
+                elif tokens[end].type == TokenTypes.fimpara:
+                    depth -= 1
+                end += 1
+            body = tokens[index + 8 : end]
+            if (
+                len(values) > self.iterations
+                or len(values) * (len(body) + 3) > self.size
+            ):
+                continue
+
+            token = tokens[index]
+            unrolled = []
+            for value in values:
+                unrolled += [
+                    Token(counter, TokenTypes.id, token.line, token.column),
+                    Token(
+                        TokenKeys.rArrow, TokenTypes.rArrow, token.line, token.column
+                    ),
+                    Token(str(value), TokenTypes.numb, token.line, token.column),
+                ] + body
+            tokens[index : end + 1] = unrolled
+            changed += 1
+        return changed
+
+
+class Columns(LoopPass):
+    name: str = "columns"
+    level: int = 2
+    # fields that can become a conjunto of the same type
+    scalars: list[str] = [TokenKeys.inteiro, TokenKeys.real, TokenKeys.caractere]
+    # inteiro columns stay lists: knowing the type says nothing of the range,
+    # and an array("q") fails past 64 bits
+    typecodes: dict[str, str] = {"float": "d"}
+
+    def run(self, tokens: list[Token], symtab: Symtab) -> int:
+        # a conjunto of registros of the main program that is only used as
+        # V[I].CAMPO becomes one conjunto for each field it uses, so the other
+        # loop passes see plain conjuntos of inteiro or real
+        main = max(
+            index
+            for index, token in enumerate(tokens)
+            if token.type == TokenTypes.inicio
+        )
+        var = max(
+            index for index in range(main) if tokens[index].type == TokenTypes.var
+        )
+        registros = self.registros(tokens)
+        counts = {}
+        for symbol in symtab.symbols:
+            key = symbol["token"].key
+            counts[key] = counts.get(key, 0) + 1
+
+        candidates = []
+        index = var + 1
+        while index < main:
+            start = index
+            names = [tokens[index].key]
+            index += 1
+            while tokens[index].type == TokenTypes.comma:
+                names.append(tokens[index + 1].key)
+                index += 2
+
+            if tokens[index].key != TokenKeys.conjunto:
+                index += 1
+                continue
+            close = index + 1
+            while tokens[close].type != TokenTypes.rSquare:
+                close += 1
+            element = tokens[close + 1].key
+            if (
+                len(names) == 1
+                and counts[names[0]] == 1
+                and close == index + 4
+                and element in registros
+            ):
+                candidates.append((start, names[0], registros[element]))
+            index = close + 2
+
+        # the last declarations first, so the earlier ones stay where they are
+        columns = []
+        for start, name, fields in reversed(candidates):
+            accesses = [
+                index
+                for index, token in enumerate(tokens)
+                if token.key == name and token.type == TokenTypes.id and index != start
+            ]
+            if not accesses or any(
+                index < start
+                or tokens[index + 1].type != TokenTypes.lSquare
+                or tokens[index + 3].type != TokenTypes.rSquare
+                or tokens[index + 4].type != TokenTypes.field
+                or fields.get(tokens[index + 4].key[1:]) not in self.scalars
+                for index in accesses
+            ):
+                continue
+            used = {tokens[index + 4].key[1:] for index in accesses}
+            names = {field: f"lpp_{name}_{field}" for field in fields if field in used}
+            if any(column in counts for column in names.values()):
+                continue
+
+            for index in reversed(accesses):
+                token = tokens[index]
+                tokens[index] = Token(
+                    names[tokens[index + 4].key[1:]],
+                    TokenTypes.id,
+                    token.line,
+                    token.column,
+                )
+                del tokens[index + 4]
+
+            declaration = tokens[start : start + 7]
+            tokens[start : start + 7] = [
+                token
+                for field, column in names.items()
+                for token in [
+                    Token(column, TokenTypes.id, declaration[0].line, 0),
+                    *declaration[1:6],
+                    Token(fields[field], TokenTypes.dType, declaration[6].line, 0),
+                ]
+            ]
+            for field, column in names.items():
+                symtab.push(tokens[start], fields[field])
+                columns.append(column)
+                start += 7
+
+        # real columns that only ever hold reals are typed arrays
+        if columns:
+            self.analyse(tokens, symtab)
+            for column in columns:
+                dtype = self.arrays.get(column, (None,))[0]
+                if dtype in self.typecodes:
+                    symtab.columns[column] = self.typecodes[dtype]
+        return len(columns)
+
+    def registros(self, tokens: list[Token]) -> dict[str, dict[str, str]]:
+        # the type of each field of each registro, conjunto for the conjuntos
+        registros = {}
+        index = next(
+            (
+                index + 1
+                for index, token in enumerate(tokens)
+                if token.type == TokenTypes.tipo
+            ),
+            len(tokens),
+        )
+        while index + 2 < len(tokens) and tokens[index + 2].type == TokenTypes.registro:
+            fields = registros.setdefault(tokens[index].key, {})
+            index += 3
+            while tokens[index].type != TokenTypes.fimreg:
+                names = [tokens[index].key]
+                index += 1
+                while tokens[index].type == TokenTypes.comma:
+                    names.append(tokens[index + 1].key)
+                    index += 2
+                fields.update(dict.fromkeys(names, tokens[index].key))
+                if tokens[index].key == TokenKeys.conjunto:
+                    while tokens[index].type != TokenTypes.rSquare:
+                        index += 1
+                    index += 1
+                index += 1
+            index += 1
+        return registros
+
+
+class PassManager:
+    # in the order they run; a pass is enabled from its level up
+    passes: list[type[Pass]] = [
+        Columns,
+        Parallel,
+        ConstantFolding,
+        Memoize,
+        Recursion,
+        Unroll,
+        Vectorize,
+        Reduction,
+        MatrixLoops,
+        StrengthReduction,
+    ]
+    level: int = 0
+    dumpAfter: str = None
+    dump: str = None
+    stats: Stats = None
+    # passes enabled below their level by a flag
+    include: list[str] = []
+
+    def __init__(
+        self,
+        level: int,
+        dumpAfter: str = None,
+        stats: Stats = None,
+        include: list[str] = None,
+    ) -> None:
+        self.level = level
+        self.dumpAfter = dumpAfter
+        self.stats = stats or Stats()
+        self.include = include or []
+
+    def names(self) -> list[str]:
+        return ["parse"] + [kind.name for kind in self.passes]
+
+    def enabled(self) -> list[Pass]:
+        return [
+            kind()
+            for kind in self.passes
+            if kind.level <= self.level or kind.name in self.include
+        ]
+
+    def run(self, tokens: list[Token], symtab: Symtab) -> list[Token]:
+        tokens = list(tokens)
+        if self.dumpAfter == "parse":
+            self.dump = self.format(tokens)
+
+        for optimization in self.enabled():
+            with self.stats.measure(optimization.name) as stats:
+                stats["changed"] = optimization.run(tokens, symtab)
+                stats["nodes"] = len(tokens)
+            if self.dumpAfter == optimization.name:
+                self.dump = self.format(tokens)
+        return tokens
+
+    def format(self, tokens: list[Token]) -> str:
+        return "\n".join(
+            f"{token.line:5d}:{token.column:<4d} {token.type.name:<12} {token.key}"
+            for token in tokens
+        )
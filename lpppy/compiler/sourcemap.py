@@ -0,0 +1,64 @@
+from bisect import bisect_right
+import traceback
+import json
+
+
+class SourceMap:
+    lines: dict[int, tuple[int, int]] = {}
+    keys: list[int] = []
+    # the LPP file, for maps read back from disk
+    source: str = None
+
+    def __init__(self, lines: dict[int, tuple[int, int]] = None, offset: int = 0):
+        self.lines = {line + offset: pos for line, pos in (lines or {}).items()}
+        self.keys = sorted(self.lines)
+
+    def lookup(self, line: int) -> tuple[int, int]:
+        index = bisect_right(self.keys, line) - 1
+        if index < 0:
+            return None
+        return self.lines[self.keys[index]]
+
+    def dump(self, source: str = None) -> str:
+        data = {"version": 1, "lines": {str(k): list(v) for k, v in self.lines.items()}}
+        if source:
+            data["source"] = source
+        return json.dumps(data)
+
+    @staticmethod
+    def load(text: str) -> "SourceMap":
+        data = json.loads(text)
+        sourceMap = SourceMap({int(k): tuple(v) for k, v in data["lines"].items()})
+        sourceMap.source = data.get("source")
+        return sourceMap
+
+    def frames(self, tb, filename: str, source: str) -> traceback.StackSummary:
+        sourceLines = source.split("\n")
+        frames = []
+        # walk_tb ignores sys.tracebacklimit, which LPP sets to 0 outside of
+        # debug mode
+        for frame, lineno in traceback.walk_tb(tb):
+            if frame.f_code.co_filename != filename:
+                continue
+            position = self.lookup(lineno)
+            if not position:
+                continue
+            frames.append(
+                traceback.FrameSummary(
+                    self.source or filename,
+                    position[0],
+                    frame.f_code.co_name,
+                    lookup_line=False,
+                    line=sourceLines[position[0] - 1].strip(),
+                )
+            )
+        return traceback.StackSummary.from_list(frames)
+
+    def format(self, error: BaseException, filename: str, source: str) -> str:
+        frames = self.frames(error.__traceback__, filename, source)
+        text = "".join(traceback.format_exception_only(error))
+        if frames:
+            text = (
+                "Traceback (most recent call last):\n" + "".join(frames.format()) + text
+            )
+        return text
@@ -0,0 +1,50 @@
+from contextlib import contextmanager
+import tracemalloc
+import timeit
+import json
+
+
+class Stats:
+    memory: bool = False
+    phases: dict[str, dict] = {}
+
+    def __init__(self, memory: bool = False) -> None:
+        self.memory = memory
+        self.phases = {}
+
+    @contextmanager
+    def measure(self, phase: str):
+        tracing = self.memory and not tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.start()
+        elif self.memory:
+            tracemalloc.reset_peak()
+
+        base = tracemalloc.get_traced_memory()[0] if self.memory else 0
+        start = timeit.default_timer()
+        try:
+            yield self.phases.setdefault(phase, {})
+        finally:
+            self.phases[phase]["wall"] = timeit.default_timer() - start
+            if self.memory:
+                peak = tracemalloc.get_traced_memory()[1] - base
+                self.phases[phase]["peak"] = max(peak, 0)
+            if tracing:
+                tracemalloc.stop()
+
+    def json(self) -> str:
+        return json.dumps(self.phases, indent=2)
+
+    def report(self) -> str:
+        lines = [f"{'phase':<8} {'wall (ms)':>10} {'peak (KiB)':>11}  counters"]
+        for phase, stats in self.phases.items():
+            peak = f"{stats['peak'] / 1024:11.1f}" if "peak" in stats else " " * 11
+            counters = " ".join(
+                f"{key}={value}"
+                for key, value in stats.items()
+                if key not in ("wall", "peak")
+            )
+            lines.append(
+                f"{phase:<8} {stats['wall'] * 1000:10.3f} {peak}  {counters}".rstrip()
+            )
+        return "\n".join(lines)
@@ -4,6 +4,22 @@ from lpppy.compiler.token import Token, TokenTypes
 class Symtab:
     symbols = []
     dtypes = []
+    vectors = {}
+    shared = {}
+    pure = []
+    recursive = {}
+    loops = []
+    columns = {}
+
+    def __init__(self) -> None:
+        self.symbols = []
+        self.dtypes = []
+        self.vectors = {}
+        self.shared = {}
+        self.pure = []
+        self.recursive = {}
+        self.loops = []
+        self.columns = {}
 
     def push(self, token: Token, dtype: TokenTypes) -> None:
         self.symbols.append(
@@ -57,6 +57,7 @@ class TokenKeys:
     logico = "lógico"
     falso = ".Falso."
     verdadeiro = ".Verdadeiro."
+    paralelo = "paralelo"
 
 
 class TokenTypes(Enum):
@@ -104,89 +105,83 @@ class TokenTypes(Enum):
     logico = 42
     falso = 43
     verdadeiro = 44
+    # a statement that a pass already turned into Python source
+    python = 45
+    paralelo = 46
+    # .CAMPO after a registro, or after an element of a conjunto of them
+    field = 47
 
 
 class Token:
-    key = ""
-    type = 0
-    line = 0
+    __slots__ = ("key", "type", "line", "column")
+    key: str
+    type: TokenTypes
+    line: int
+    column: int
 
-    def __init__(self, key: TokenKeys, type: TokenTypes, line: int) -> None:
+    types: dict[str, TokenTypes] = {
+        TokenKeys.var: TokenTypes.var,
+        TokenKeys.programa: TokenTypes.programa,
+        TokenKeys.inicio: TokenTypes.inicio,
+        TokenKeys.leia: TokenTypes.leia,
+        TokenKeys.escreva: TokenTypes.escreva,
+        TokenKeys.fim: TokenTypes.fim,
+        TokenKeys.se: TokenTypes.se,
+        TokenKeys.entao: TokenTypes.entao,
+        TokenKeys.tipo: TokenTypes.tipo,
+        TokenKeys.registro: TokenTypes.registro,
+        TokenKeys.senao: TokenTypes.senao,
+        TokenKeys.fimse: TokenTypes.fimse,
+        TokenKeys.rArrow: TokenTypes.rArrow,
+        TokenKeys.lArrow: TokenTypes.lArrow,
+        TokenKeys.colon: TokenTypes.colon,
+        TokenKeys.dPeriod: TokenTypes.dPeriod,
+        TokenKeys.comma: TokenTypes.comma,
+        TokenKeys.rSquare: TokenTypes.rSquare,
+        TokenKeys.lSquare: TokenTypes.lSquare,
+        TokenKeys.rParen: TokenTypes.rParen,
+        TokenKeys.lParen: TokenTypes.lParen,
+        TokenKeys.de: TokenTypes.de,
+        TokenKeys.para: TokenTypes.para,
+        TokenKeys.fimpara: TokenTypes.fimpara,
+        TokenKeys.fimreg: TokenTypes.fimreg,
+        TokenKeys.ate: TokenTypes.ate,
+        TokenKeys.passo: TokenTypes.passo,
+        TokenKeys.enquanto: TokenTypes.enquanto,
+        TokenKeys.fimenq: TokenTypes.fimenq,
+        TokenKeys.procedimento: TokenTypes.procedimento,
+        TokenKeys.funcao: TokenTypes.funcao,
+        TokenKeys.faca: TokenTypes.faca,
+        TokenKeys.paralelo: TokenTypes.paralelo,
+        TokenKeys.caractere: TokenTypes.dType,
+        TokenKeys.real: TokenTypes.dType,
+        TokenKeys.inteiro: TokenTypes.dType,
+        TokenKeys.conjunto: TokenTypes.dType,
+        TokenKeys.logico: TokenTypes.dType,
+        TokenKeys._and: TokenTypes.logicalOps,
+        TokenKeys._or: TokenTypes.logicalOps,
+        TokenKeys._not: TokenTypes.logicalOps,
+        TokenKeys.grater: TokenTypes.logicalOps,
+        TokenKeys.graterEq: TokenTypes.logicalOps,
+        TokenKeys.less: TokenTypes.logicalOps,
+        TokenKeys.lessEq: TokenTypes.logicalOps,
+        TokenKeys.NotEq: TokenTypes.logicalOps,
+        TokenKeys.equal: TokenTypes.logicalOps,
+        TokenKeys.plus: TokenTypes.mathOps,
+        TokenKeys.minus: TokenTypes.mathOps,
+        TokenKeys.mult: TokenTypes.mathOps,
+        TokenKeys.div: TokenTypes.mathOps,
+        TokenKeys.mod: TokenTypes.mathOps,
+        TokenKeys.exponent: TokenTypes.mathOps,
+    }
+
+    def __init__(
+        self, key: TokenKeys, type: TokenTypes, line: int, column: int = 0
+    ) -> None:
         self.key = key
         self.type = type
         self.line = line
+        self.column = column
 
     def getType(key: TokenKeys) -> TokenTypes:
-        match key:
-            case TokenKeys.var:
-                return TokenTypes.var
-            case TokenKeys.programa:
-                return TokenTypes.programa
-            case TokenKeys.inicio:
-                return TokenTypes.inicio
-            case TokenKeys.leia:
-                return TokenTypes.leia
-            case TokenKeys.escreva:
-                return TokenTypes.escreva
-            case TokenKeys.fim:
-                return TokenTypes.fim
-            case TokenKeys.se:
-                return TokenTypes.se
-            case TokenKeys.entao:
-                return TokenTypes.entao
-            case TokenKeys.tipo:
-                return TokenTypes.tipo
-            case TokenKeys.registro:
-                return TokenTypes.registro
-            case TokenKeys.senao:
-                return TokenTypes.senao
-            case TokenKeys.fimse:
-                return TokenTypes.fimse
-            case TokenKeys.rArrow:
-                return TokenTypes.rArrow
-            case TokenKeys.lArrow:
-                return TokenTypes.lArrow
-            case TokenKeys.colon:
-                return TokenTypes.colon
-            case TokenKeys.dPeriod:
-                return TokenTypes.dPeriod
-            case TokenKeys.comma:
-                return TokenTypes.comma
-            case TokenKeys.rSquare:
-                return TokenTypes.rSquare
-            case TokenKeys.lSquare:
-                return TokenTypes.lSquare
-            case TokenKeys.rParen:
-                return TokenTypes.rParen
-            case TokenKeys.lParen:
-                return TokenTypes.lParen
-            case TokenKeys.de:
-                return TokenTypes.de
-            case TokenKeys.para:
-                return TokenTypes.para
-            case TokenKeys.fimpara:
-                return TokenTypes.fimpara
-            case TokenKeys.fimreg:
-                return TokenTypes.fimreg
-            case TokenKeys.ate:
-                return TokenTypes.ate
-            case TokenKeys.passo:
-                return TokenTypes.passo
-            case TokenKeys.enquanto:
-                return TokenTypes.enquanto
-            case TokenKeys.fimenq:
-                return TokenTypes.fimenq
-            case TokenKeys.procedimento:
-                return TokenTypes.procedimento
-            case TokenKeys.funcao:
-                return TokenTypes.funcao
-            case TokenKeys.faca:
-                return TokenTypes.faca
-            case TokenKeys.caractere | TokenKeys.real | TokenKeys.inteiro | TokenKeys.conjunto | TokenKeys.logico:
-                return TokenTypes.dType
-            case TokenKeys._and | TokenKeys._or | TokenKeys._not | TokenKeys.grater | TokenKeys.graterEq | TokenKeys.less | TokenKeys.lessEq | TokenKeys.NotEq | TokenKeys.equal:
-                return TokenTypes.logicalOps
-            case TokenKeys.plus | TokenKeys.minus | TokenKeys.mult | TokenKeys.div | TokenKeys.mod | TokenKeys.exponent:
-                return TokenTypes.mathOps
-            case _:
-                return TokenTypes.id
+        return Token.types.get(key, TokenTypes.id)
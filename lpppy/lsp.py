@@ -0,0 +1,289 @@
+from lpppy.compiler.lex import Lexer
+from lpppy.compiler.parse import Parse
+from lpppy.compiler.symtab import Symtab
+from lpppy.compiler.error import CompileError
+from lpppy.compiler.token import Token
+import timeit
+import json
+import sys
+
+
+class Unit:
+    kind: str = ""
+    start: int = 0
+    text: str = ""
+    tokens: list[Token] = []
+    nodes: list[Token] = []
+    errors: list[CompileError] = []
+
+    def __init__(self, kind: str, start: int, text: str) -> None:
+        self.kind = kind
+        self.start = start
+        self.text = text
+        self.tokens = []
+        self.nodes = []
+        self.errors = []
+
+
+class Document:
+    order: list[str] = ["programa", "procedimento", "função", "tipo", "var"]
+    prefix: list[Token] = []
+    suffix: list[Token] = []
+    lines: list[str] = []
+    units: list[Unit] = []
+    cache: dict[tuple[str, str], Unit] = {}
+    analysed: int = 0
+
+    def __init__(self, text: str) -> None:
+        # a unit is parsed between a synthetic program header and main block,
+        # so each one can be checked on its own
+        if not Document.prefix:
+            Document.prefix = self.lex("programa _\n")
+            Document.suffix = self.lex("var\n  _: inteiro\ninício\nfim\n")
+        self.lines = text.split("\n")
+        self.units = []
+        self.cache = {}
+
+    def lex(self, text: str) -> list[Token]:
+        lexer = Lexer(text)
+        lexer.run()
+        return lexer.tokens
+
+    def change(self, change: dict) -> None:
+        if "range" not in change:
+            self.lines = change["text"].split("\n")
+            return
+
+        start, end = change["range"]["start"], change["range"]["end"]
+        head = self.lines[start["line"]][: start["character"]]
+        tail = self.lines[end["line"]][end["character"] :]
+        self.lines[start["line"] : end["line"] + 1] = (
+            head + change["text"] + tail
+        ).split("\n")
+
+    def split(self) -> list[Unit]:
+        units = [Unit("programa", 0, "")]
+        routine = False
+        for number, line in enumerate(self.lines):
+            word = line.split(maxsplit=1)[0] if line.strip() else ""
+            if units[-1].kind == "var":
+                pass
+            elif routine:
+                routine = word != "fim"
+            elif word in ("procedimento", "função", "tipo", "var", "início"):
+                routine = word in ("procedimento", "função")
+                units.append(Unit("var" if word == "início" else word, number, ""))
+            units[-1].text += line + "\n"
+        return units
+
+    def analyse(self) -> None:
+        units = self.split()
+        cache = {}
+        self.analysed = 0
+        for unit in units:
+            cached = self.cache.get((unit.kind, unit.text))
+            if cached:
+                unit.tokens, unit.nodes = cached.tokens, cached.nodes
+                unit.errors = cached.errors
+            else:
+                self.parse(unit)
+                self.analysed += 1
+            cache[(unit.kind, unit.text)] = unit
+        self.units = units
+        self.cache = cache
+
+    def parse(self, unit: Unit) -> None:
+        unit.tokens = self.lex(unit.text)
+        tokens = list(unit.tokens)
+        if unit.kind != "programa":
+            tokens = self.prefix + tokens
+        if unit.kind != "var":
+            tokens = tokens + self.suffix
+
+        lexer = Lexer("")
+        lexer.tokens = tokens
+        lexer.line = 0
+        parser = Parse(lexer, Symtab())
+        parser.recover = True
+        parser.run()
+        unit.errors = parser.errors
+        unit.nodes = parser.tokens
+
+    def diagnostics(self) -> list[dict]:
+        diagnostics = []
+        rank = -1
+        for unit in self.units:
+            index = self.order.index(unit.kind)
+            if index < rank or (
+                index == rank and unit.kind not in ("procedimento", "função")
+            ):
+                diagnostics.append(
+                    self.diagnostic(
+                        unit.start,
+                        0,
+                        len(unit.kind),
+                        f"'{unit.kind}' fora de ordem: o programa deve ter, nessa"
+                        " ordem, procedimentos, funções, tipo e var",
+                    )
+                )
+            else:
+                rank = index
+
+            for error in unit.errors:
+                diagnostics.append(self.errorDiagnostic(unit, error))
+                if self.pastEnd(error.token):
+                    break
+
+        if self.units[-1].kind != "var":
+            diagnostics.append(
+                self.diagnostic(
+                    len(self.lines) - 1, 0, 0, "bloco principal (var/início) ausente"
+                )
+            )
+        return diagnostics
+
+    def errorDiagnostic(self, unit: Unit, error: CompileError) -> dict:
+        token = error.token
+        if self.pastEnd(token):
+            line = unit.start + unit.text.rstrip("\n").count("\n")
+            return self.diagnostic(
+                line, 0, len(self.lines[line]), f"{error.getMsg()} 'eof'"
+            )
+
+        column = token.column - 1 if token.column else 0
+        return self.diagnostic(
+            unit.start + token.line - 1,
+            column,
+            column + len(str(token.key)),
+            str(error),
+        )
+
+    def pastEnd(self, token: Token) -> bool:
+        # ran past the end of the unit
+        return token.line == 0 or any(
+            token is synthetic for synthetic in self.prefix + self.suffix
+        )
+
+    def diagnostic(self, line: int, start: int, end: int, message: str) -> dict:
+        return {
+            "range": {
+                "start": {"line": line, "character": start},
+                "end": {"line": line, "character": end},
+            },
+            "severity": 1,
+            "source": "lpppy",
+            "message": message,
+        }
+
+
+class LanguageServer:
+    documents: dict[str, Document] = {}
+    budget: float = 0.1
+
+    def __init__(self, argv: list[str]) -> None:
+        self.documents = {}
+        for arg in argv:
+            if arg.startswith("--budget="):
+                self.budget = float(arg.split("=", 1)[1]) / 1000
+            elif arg != "--stdio":
+                sys.tracebacklimit = 0
+                print("usage: lpppy lsp [--stdio] [--budget=100]")
+                exit(2)
+
+    def read(self) -> dict:
+        length = 0
+        while True:
+            line = sys.stdin.buffer.readline()
+            if not line:
+                return None
+            line = line.strip()
+            if not line:
+                break
+            name, value = line.decode("ascii").split(":", 1)
+            if name.lower() == "content-length":
+                length = int(value)
+        return json.loads(sys.stdin.buffer.read(length))
+
+    def send(self, message: dict) -> None:
+        body = json.dumps({"jsonrpc": "2.0", **message}).encode()
+        sys.stdout.buffer.write(f"Content-Length: {len(body)}\r\n\r\n".encode())
+        sys.stdout.buffer.write(body)
+        sys.stdout.buffer.flush()
+
+    def notify(self, method: str, params: dict) -> None:
+        self.send({"method": method, "params": params})
+
+    def run(self) -> int:
+        # the parser recurses once per declaration
+        sys.setrecursionlimit(max(sys.getrecursionlimit(), 10000))
+        exitCode = 1
+        while True:
+            message = self.read()
+            if message is None:
+                return exitCode
+
+            method = message.get("method")
+            params = message.get("params", {})
+            result = None
+            match method:
+                case "initialize":
+                    result = {
+                        "capabilities": {
+                            "textDocumentSync": {"openClose": True, "change": 2}
+                        },
+                        "serverInfo": {"name": "lpppy"},
+                    }
+                case "shutdown":
+                    exitCode = 0
+                case "exit":
+                    return exitCode
+                case "textDocument/didOpen":
+                    document = params["textDocument"]
+                    self.documents[document["uri"]] = Document(document["text"])
+                    self.publish(document["uri"])
+                case "textDocument/didChange":
+                    uri = params["textDocument"]["uri"]
+                    for change in params["contentChanges"]:
+                        self.documents[uri].change(change)
+                    self.publish(uri)
+                case "textDocument/didClose":
+                    uri = params["textDocument"]["uri"]
+                    self.documents.pop(uri, None)
+                    self.notify(
+                        "textDocument/publishDiagnostics",
+                        {"uri": uri, "diagnostics": []},
+                    )
+
+            # messages with an id but no method are replies, and the server
+            # sends no requests
+            if "id" in message and method:
+                if method in ("initialize", "shutdown"):
+                    self.send({"id": message["id"], "result": result})
+                else:
+                    self.send(
+                        {
+                            "id": message["id"],
+                            "error": {"code": -32601, "message": f"{method}?"},
+                        }
+                    )
+
+    def publish(self, uri: str) -> None:
+        start = timeit.default_timer()
+        document = self.documents[uri]
+        document.analyse()
+        diagnostics = document.diagnostics()
+        self.notify(
+            "textDocument/publishDiagnostics", {"uri": uri, "diagnostics": diagnostics}
+        )
+
+        elapsed = timeit.default_timer() - start
+        if elapsed > self.budget:
+            self.notify(
+                "window/logMessage",
+                {
+                    "type": 2,
+                    "message": f"{uri}: diagnósticos em {elapsed * 1000:.1f} ms"
+                    f" ({document.analysed} de {len(document.units)} unidades"
+                    " analisadas)",
+                },
+            )
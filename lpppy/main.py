@@ -1,6 +1,16 @@
 from lpppy.compiler.main import Compiler
-from types import SimpleNamespace
+from lpppy.compiler.error import CompileError
+from lpppy.tester import Tester
+from lpppy.builder import Builder
+from lpppy.runner import Runner
+from lpppy.watcher import Watcher
+from lpppy.lsp import LanguageServer
+from lpppy.cache import ResultCache
+from lpppy.profiler import Profiler
+from lpppy.native import NativeBuild
+from types import SimpleNamespace, CodeType
 from pathlib import Path
+import json
 import sys
 import os
 
@@ -8,34 +18,229 @@ import os
 class LPP:
     compiler = None
     file = None
-    config = SimpleNamespace(debug=False)
+    config = SimpleNamespace(
+        debug=False,
+        cache=False,
+        evaluate=False,
+        budget=100000,
+        timings=None,
+        memory=False,
+        profile=False,
+        check=None,
+        optimize=0,
+        dumpAfter=None,
+        native=False,
+        memo=1024,
+        depth=None,
+    )
 
     def __init__(self):
         if len(sys.argv) <= 1:
             sys.tracebacklimit = 0
             print("nothing to do!")
             exit(0)
-        else:
-            self.file = sys.argv[1]
+        elif sys.argv[1] == "test":
+            exit(Tester(sys.argv[2:]).run())
+        elif sys.argv[1] == "build":
+            exit(Builder(sys.argv[2:]).run())
+        elif sys.argv[1] == "run":
+            exit(Runner(sys.argv[2:]).run())
+        elif sys.argv[1] == "watch":
+            exit(Watcher(sys.argv[2:]).run())
+        elif sys.argv[1] == "lsp":
+            exit(LanguageServer(sys.argv[2:]).run())
 
-        if len(sys.argv) > 2:
-            if sys.argv[1] == "--debug-mode":
-                self.file = sys.argv[2]
+        files = []
+        for arg in sys.argv[1:]:
+            if arg == "--debug-mode":
                 self.config.debug = True
-        else:
+            elif arg == "--cache":
+                self.config.cache = True
+            elif arg == "--evaluate":
+                self.config.evaluate = True
+            elif arg.startswith("--budget="):
+                self.config.budget = int(arg.split("=", 1)[1])
+            elif arg == "--profile":
+                self.config.profile = True
+            elif arg == "--timings":
+                self.config.timings = "text"
+            elif arg.startswith("--timings="):
+                self.config.timings = arg.split("=", 1)[1]
+            elif arg == "--memory":
+                # tracemalloc slows every phase down, so the peaks are opt-in
+                self.config.memory = True
+                self.config.timings = self.config.timings or "text"
+            elif arg in ("-O0", "-O1", "-O2"):
+                self.config.optimize = int(arg[2])
+            elif arg.startswith("--dump-after="):
+                self.config.dumpAfter = arg.split("=", 1)[1]
+            elif arg.startswith("--memo="):
+                self.config.memo = int(arg.split("=", 1)[1])
+            elif arg.startswith("--max-depth="):
+                self.config.depth = int(arg.split("=", 1)[1])
+            elif arg == "--native":
+                self.config.native = True
+            elif arg == "--check":
+                self.config.check = "text"
+            elif arg.startswith("--check="):
+                self.config.check = arg.split("=", 1)[1]
+            else:
+                self.file = arg
+                files.append(arg)
+
+        if not self.config.debug:
             sys.tracebacklimit = 0
 
-        self.compiler = Compiler(Path(self.file).read_text())
-        self.compiler.run()
+        if self.config.check:
+            exit(self.check(files))
+
+        self.compiler = Compiler(Path(self.file).read_text(), self.config)
+        if self.config.dumpAfter and self.config.dumpAfter not in [
+            optimization.name for optimization in self.compiler.passes.enabled()
+        ] + ["parse"]:
+            print(
+                f"--dump-after: passo '{self.config.dumpAfter}' não roda em"
+                f" -O{self.config.optimize} (passos:"
+                f" {', '.join(self.compiler.passes.names())})",
+                file=sys.stderr,
+            )
+            exit(2)
+
+        try:
+            self.compiler.run()
+        except CompileError as error:
+            print(error.report(), file=sys.stderr)
+            exit(1)
+
+        if self.compiler.passes.dump is not None:
+            print(self.compiler.passes.dump, file=sys.stderr)
+
+        try:
+            self.execute()
+        finally:
+            if self.config.timings:
+                self.reportTimings()
+
+        exit(0)
+
+    def check(self, files: list[str]) -> int:
+        errors = []
+        for file in files:
+            compiler = Compiler(Path(file).read_text(), self.config)
+            for error in compiler.check():
+                errors.append(
+                    {
+                        "file": file,
+                        "line": error.token.line,
+                        "column": error.token.column,
+                        "message": str(error),
+                    }
+                )
+
+        if self.config.check == "json":
+            print(json.dumps(errors, ensure_ascii=False, indent=2))
+        else:
+            for error in errors:
+                print(
+                    f"{error['file']}:{error['line']}:{error['column']}:"
+                    f" {error['message']}"
+                )
+        return 1 if errors else 0
 
+    def execute(self) -> None:
         if self.config.debug:
             if not os.path.exists("build"):
                 os.mkdir("build")
 
-            build = open(f"build/{Path(self.file).name.split('.')[0]}.py", "w")
+            name = Path(self.file).name.split(".")[0]
+            build = open(f"build/{name}.py", "w")
             build.write(self.compiler.stdout)
             build.close
-        else:
-            exec(self.compiler.stdout)
+            Path(f"build/{name}.map.json").write_text(
+                self.compiler.sourceMap.dump(str(Path(self.file).resolve()))
+            )
+            if self.compiler.native:
+                Path(f"build/{name}.c").write_text(self.compiler.native)
+            return
 
-        exit(0)
+        if self.config.native and not self.config.profile:
+            status = self.executeNative()
+            if status is not None:
+                if status:
+                    exit(status)
+                return
+
+        code = self.compiler.compile(self.file)
+        namespace = {"__name__": "__main__"}
+        with self.compiler.stats.measure("exec") as stats:
+            if self.config.cache:
+                cache = ResultCache()
+                if cache.isDeterministic(code):
+                    status = cache.run(self.compiler.codegen.stdout, code, self.format)
+                    if status:
+                        exit(status)
+                    return
+            try:
+                if self.config.profile:
+                    self.profile(code, namespace)
+                else:
+                    exec(code, namespace)
+            except Exception as error:
+                print(self.format(error), file=sys.stderr, end="")
+                exit(1)
+            finally:
+                self.countMemo(namespace, stats)
+
+    def executeNative(self) -> int:
+        # None when the program runs on the Python backend instead
+        error = self.compiler.nativeError
+        if error:
+            print(
+                f"--native: {error} na linha {error.token.line};"
+                " usando o backend Python",
+                file=sys.stderr,
+            )
+            return None
+
+        build = NativeBuild()
+        with self.compiler.stats.measure("cc") as stats:
+            executable = build.build(self.compiler.native)
+            stats["cached"] = build.cached
+        if not executable:
+            print(f"--native: {build.error}; usando o backend Python", file=sys.stderr)
+            return None
+
+        with self.compiler.stats.measure("exec"):
+            return build.run(executable, self.file)
+
+    def countMemo(self, namespace: dict, stats: dict) -> None:
+        # calls of the pure funções answered by their caches
+        caches = [
+            namespace[name].cache_info()
+            for name in self.compiler.symtab.pure
+            if hasattr(namespace.get(name), "cache_info")
+        ]
+        if caches:
+            stats["hits"] = sum(cache.hits for cache in caches)
+            stats["misses"] = sum(cache.misses for cache in caches)
+
+    def profile(self, code: CodeType, namespace: dict) -> None:
+        profiler = Profiler(self.compiler, self.file)
+        try:
+            profiler.run(code, namespace)
+        finally:
+            sys.stdout.flush()
+            print(profiler.report(), file=sys.stderr)
+
+    def format(self, error: BaseException) -> str:
+        return self.compiler.sourceMap.format(error, self.file, self.compiler.stdin)
+
+    def reportTimings(self) -> None:
+        stats = self.compiler.stats
+        match self.config.timings:
+            case "text":
+                print(stats.report(), file=sys.stderr)
+            case "json":
+                print(stats.json(), file=sys.stderr)
+            case path:
+                Path(path).write_text(stats.json())
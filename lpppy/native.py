@@ -0,0 +1,74 @@
+from pathlib import Path
+import subprocess
+import hashlib
+import shutil
+import signal
+import sys
+import os
+
+
+class NativeBuild:
+    path: Path = None
+    compiler: str = "cc"
+    flags: list[str] = ["-std=c99", "-O2"]
+    cached: bool = False
+    error: str = ""
+    signals: dict[int, str] = {
+        signal.SIGSEGV: "falha de segmentação, talvez pilha esgotada",
+        signal.SIGFPE: "erro aritmético",
+        signal.SIGABRT: "programa abortado",
+        signal.SIGKILL: "programa encerrado à força, talvez sem memória",
+    }
+
+    def __init__(self, path: str = None, compiler: str = None) -> None:
+        self.path = Path(
+            path
+            or os.environ.get("LPPPY_NATIVE_DIR")
+            or Path.home() / ".cache" / "lpppy" / "native"
+        )
+        self.compiler = compiler or os.environ.get("CC") or self.compiler
+
+    def key(self, source: str) -> str:
+        digest = hashlib.sha256()
+        digest.update(" ".join([self.compiler] + self.flags).encode())
+        digest.update(hashlib.sha256(source.encode()).digest())
+        return digest.hexdigest()
+
+    def build(self, source: str) -> Path:
+        executable = self.path / self.key(source)
+        self.cached = executable.exists()
+        if self.cached:
+            return executable
+
+        if not shutil.which(self.compiler):
+            self.error = f"compilador C '{self.compiler}' não encontrado"
+            return None
+
+        self.path.mkdir(parents=True, exist_ok=True)
+        file = executable.with_suffix(".c")
+        file.write_text(source)
+        temp = executable.with_suffix(f".{os.getpid()}.tmp")
+        result = subprocess.run(
+            [self.compiler, *self.flags, "-o", str(temp), str(file), "-lm"],
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode:
+            self.error = f"{self.compiler} falhou:\n{result.stderr.strip()}"
+            temp.unlink(missing_ok=True)
+            return None
+        os.replace(temp, executable)
+        return executable
+
+    def run(self, executable: Path, file: str) -> int:
+        sys.stdout.flush()
+        status = subprocess.run([str(executable), file]).returncode
+        if status < 0:
+            # killed by a signal, which says nothing on its own
+            print(
+                f"--native: o programa terminou com o sinal {-status}"
+                f" ({self.signals.get(-status, signal.strsignal(-status))})",
+                file=sys.stderr,
+            )
+            return 128 - status
+        return status
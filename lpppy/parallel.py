@@ -0,0 +1,107 @@
+import multiprocessing
+import operator
+import mmap
+import sys
+import os
+
+operators = {"+": operator.add, "*": operator.mul}
+identities = {"+": 0, "*": 1}
+# the iterations are split in the same blocks whatever the number of workers,
+# so real accumulations add up in the same order on every machine
+blocks = 256
+
+
+def workers() -> int:
+    if os.environ.get("LPPPY_WORKERS"):
+        return max(int(os.environ["LPPPY_WORKERS"]), 1)
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def array(typecode: str, size: int) -> memoryview:
+    # anonymous shared memory, so forked workers write to the same pages
+    memory = mmap.mmap(-1, max(size, 1) * 8)
+    return memoryview(memory).cast(typecode)[:size]
+
+
+def work(send, function, parts: list[range], starts: list[tuple]) -> None:
+    # a block that fails and the ones after it are left for the parent
+    results = [None] * len(parts)
+    try:
+        for index, part in enumerate(parts):
+            results[index] = function(part, *starts[index])
+    except Exception:
+        pass
+    send.send(results)
+
+
+def run(function, iterations: range, values: tuple, accumulators: str) -> tuple:
+    # values are the accumulated scalars, one for each operator in
+    # accumulators, then the ones the last iteration sets
+    if not iterations:
+        return values
+
+    size = min(blocks, len(iterations))
+    parts = [
+        iterations[
+            len(iterations) * block // size : len(iterations) * (block + 1) // size
+        ]
+        for block in range(size)
+    ]
+    # only the first block starts from the values before the loop
+    identity = tuple(identities[accumulator] for accumulator in accumulators)
+    starts = [values] + [identity + values[len(accumulators) :]] * (size - 1)
+
+    count = min(workers(), len(iterations))
+    if (
+        count < 2
+        or "fork" not in multiprocessing.get_all_start_methods()
+        or multiprocessing.current_process().daemon
+    ):
+        # the same blocks in a single process, so the result doesn't depend
+        # on the number of workers
+        results = [function(part, *start) for part, start in zip(parts, starts)]
+        return combine(results, accumulators)
+
+    # blocks go round robin to the workers, so iterations that get slower
+    # towards the end are spread too
+    context = multiprocessing.get_context("fork")
+    sys.stdout.flush()
+    sys.stderr.flush()
+    processes = []
+    for worker in range(count):
+        receive, send = context.Pipe(False)
+        process = context.Process(
+            target=work,
+            args=(send, function, parts[worker::count], starts[worker::count]),
+        )
+        process.start()
+        send.close()
+        processes.append((process, receive))
+
+    results = [None] * size
+    for worker, (process, receive) in enumerate(processes):
+        try:
+            results[worker::count] = receive.recv()
+        except EOFError:
+            pass
+        receive.close()
+        process.join()
+
+    # the blocks that failed run again here, in order, so the error is the
+    # first one the loop hits, with its traceback
+    for block, result in enumerate(results):
+        if result is None:
+            results[block] = function(parts[block], *starts[block])
+    return combine(results, accumulators)
+
+
+def combine(results: list[tuple], accumulators: str) -> tuple:
+    # in block order; the other values are the ones of the last block
+    combined = list(results[0])
+    for result in results[1:]:
+        for index, accumulator in enumerate(accumulators):
+            combined[index] = operators[accumulator](combined[index], result[index])
+    combined[len(accumulators) :] = results[-1][len(accumulators) :]
+    return tuple(combined)
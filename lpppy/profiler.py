@@ -0,0 +1,155 @@
+from lpppy.compiler.main import Compiler
+from types import CodeType
+import timeit
+import sys
+
+
+class Profiler:
+    compiler: Compiler = None
+    file: str = ""
+    hits: dict[int, int] = {}
+    times: dict[int, float] = {}
+    routines: dict[str, list] = {}
+    lines: dict[int, int] = {}
+    current: int = 0
+    last: float = 0.0
+
+    def __init__(self, compiler: Compiler, file: str) -> None:
+        self.compiler = compiler
+        self.file = file
+        self.hits = {}
+        self.times = {}
+        self.routines = {}
+        self.lines = {}
+
+    def lppLine(self, line: int) -> int:
+        if line not in self.lines:
+            position = self.compiler.sourceMap.lookup(line)
+            self.lines[line] = position[0] if position else 0
+        return self.lines[line]
+
+    def flush(self) -> None:
+        if self.current:
+            elapsed = timeit.default_timer() - self.last
+            self.times[self.current] = self.times.get(self.current, 0.0) + elapsed
+        self.current = 0
+
+    def hit(self, line: int) -> None:
+        self.flush()
+        self.current = self.lppLine(line)
+        self.hits[self.current] = self.hits.get(self.current, 0) + 1
+        self.last = timeit.default_timer()
+
+    def enter(self, name: str) -> None:
+        # [calls, inclusive time, active depth, start of the outermost call]
+        routine = self.routines.setdefault(name, [0, 0.0, 0, 0.0])
+        routine[0] += 1
+        routine[2] += 1
+        if routine[2] == 1:
+            routine[3] = timeit.default_timer()
+
+    def leave(self, name: str) -> None:
+        routine = self.routines[name]
+        routine[2] -= 1
+        if routine[2] == 0:
+            routine[1] += timeit.default_timer() - routine[3]
+
+    def run(self, code: CodeType, globals: dict) -> None:
+        if hasattr(sys, "monitoring"):
+            run = self.runMonitoring
+        else:
+            run = self.runTrace
+
+        self.last = timeit.default_timer()
+        try:
+            run(code, globals)
+        finally:
+            self.flush()
+            for name, routine in self.routines.items():
+                while routine[2]:
+                    self.leave(name)
+
+    def runTrace(self, code: CodeType, globals: dict) -> None:
+        def local(frame, event, arg):
+            if event == "line":
+                self.hit(frame.f_lineno)
+            elif event == "return":
+                self.leave(frame.f_code.co_name)
+            return local
+
+        def trace(frame, event, arg):
+            if frame.f_code.co_filename != self.file:
+                return None
+            self.enter(frame.f_code.co_name)
+            return local
+
+        restore = sys.gettrace()
+        sys.settrace(trace)
+        try:
+            exec(code, globals)
+        finally:
+            sys.settrace(restore)
+
+    def runMonitoring(self, code: CodeType, globals: dict) -> None:
+        monitoring = sys.monitoring
+        events = monitoring.events
+        tool = monitoring.PROFILER_ID
+
+        def line(code, lineno):
+            if code.co_filename != self.file:
+                return monitoring.DISABLE
+            self.hit(lineno)
+
+        def start(code, offset):
+            if code.co_filename != self.file:
+                return monitoring.DISABLE
+            self.enter(code.co_name)
+
+        def leave(code, offset, value):
+            if code.co_filename != self.file:
+                return monitoring.DISABLE
+            self.leave(code.co_name)
+
+        # unwinding can't be disabled per location, so it never returns DISABLE
+        def unwind(code, offset, error):
+            if code.co_filename == self.file:
+                self.leave(code.co_name)
+
+        monitoring.use_tool_id(tool, "lpppy")
+        monitoring.register_callback(tool, events.LINE, line)
+        monitoring.register_callback(tool, events.PY_START, start)
+        monitoring.register_callback(tool, events.PY_RETURN, leave)
+        monitoring.register_callback(tool, events.PY_UNWIND, unwind)
+        monitoring.set_events(
+            tool, events.LINE | events.PY_START | events.PY_RETURN | events.PY_UNWIND
+        )
+        try:
+            exec(code, globals)
+        finally:
+            monitoring.set_events(tool, 0)
+            monitoring.free_tool_id(tool)
+
+    def report(self) -> str:
+        source = self.compiler.stdin.splitlines()
+        total = sum(self.times.values()) or 1.0
+
+        lines = [f"{'hits':>9} {'time (ms)':>11} {'%':>6}  {'line':>4}  source"]
+        for number, text in enumerate(source, 1):
+            if number in self.hits:
+                time = self.times.get(number, 0.0)
+                lines.append(
+                    f"{self.hits[number]:9d} {time * 1000:11.3f} "
+                    f"{time / total * 100:6.1f}  {number:4d}  {text}"
+                )
+            else:
+                lines.append(f"{'':9} {'':11} {'':6}  {number:4d}  {text}")
+
+        lines.append("")
+        lines.append(f"{'routine':<24} {'calls':>9} {'time (ms)':>11}")
+        for name, routine in sorted(
+            self.routines.items(), key=lambda routine: -routine[1][1]
+        ):
+            if name == "<module>":
+                name = f"programa {self.compiler.codegen.programName}"
+            lines.append(f"{name:<24} {routine[0]:9d} {routine[1] * 1000:11.3f}")
+        return "\n".join(lines)
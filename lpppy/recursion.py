@@ -0,0 +1,64 @@
+from collections import OrderedDict, namedtuple
+import functools
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+
+def run(call, limit: int) -> None:
+    # routines that recurse are generators that yield the calls they make, so
+    # the calls pile up here instead of on the Python stack
+    stack = [call]
+    error = None
+    while stack:
+        try:
+            if error is None:
+                call = stack[-1].send(None)
+            else:
+                # an error goes up through the callers, so the traceback has
+                # the lines of each call
+                call, error = stack[-1].throw(error), None
+        except StopIteration:
+            stack.pop()
+            continue
+        except Exception as raised:
+            stack.pop()
+            if not stack:
+                raise
+            error = raised
+            continue
+
+        if len(stack) >= limit:
+            call.close()
+            error = RecursionError(
+                f"limite de {limit} chamadas recursivas excedido (--max-depth)"
+            )
+            continue
+        stack.append(call)
+
+
+def memo(maxsize: int):
+    # functools.lru_cache for the routines that run on the stack above, which
+    # return a new generator on each call; the calls that finished are cached
+    def decorate(function):
+        done = OrderedDict()
+        counts = {"hits": 0, "misses": 0}
+
+        @functools.wraps(function)
+        def cached(*arguments):
+            key = arguments + tuple(type(argument) for argument in arguments)
+            if key in done:
+                done.move_to_end(key)
+                counts["hits"] += 1
+                return
+            counts["misses"] += 1
+            yield from function(*arguments)
+            done[key] = None
+            if len(done) > maxsize:
+                done.popitem(last=False)
+
+        cached.cache_info = lambda: CacheInfo(
+            counts["hits"], counts["misses"], maxsize, len(done)
+        )
+        return cached
+
+    return decorate
@@ -0,0 +1,43 @@
+from lpppy.compiler.sourcemap import SourceMap
+from pathlib import Path
+import traceback
+import marshal
+import sys
+
+
+class Runner:
+    file: Path = None
+
+    def __init__(self, argv: list[str]) -> None:
+        if len(argv) != 1 or Path(argv[0]).suffix not in (".py", ".pyc"):
+            sys.tracebacklimit = 0
+            print("usage: lpppy run <file.py|file.pyc>")
+            exit(2)
+
+        self.file = Path(argv[0])
+
+    def load(self):
+        if self.file.suffix == ".pyc":
+            # the 16 byte header of a hash-based pyc, as lpppy build writes it
+            return marshal.loads(self.file.read_bytes()[16:])
+        return compile(self.file.read_text(), str(self.file), "exec")
+
+    def run(self) -> int:
+        code = self.load()
+        try:
+            exec(code, {"__name__": "__main__"})
+        except Exception as error:
+            sys.stdout.flush()
+            print(self.format(error, code.co_filename), file=sys.stderr, end="")
+            return 1
+        return 0
+
+    def format(self, error: BaseException, filename: str) -> str:
+        mapFile = self.file.with_suffix(".map.json")
+        if mapFile.exists():
+            sourceMap = SourceMap.load(mapFile.read_text())
+            if sourceMap.source and Path(sourceMap.source).exists():
+                source = Path(sourceMap.source).read_text()
+                return sourceMap.format(error, filename, source)
+        # without the map or the LPP source only the Python lines are known
+        return "".join(traceback.format_exception(error))
@@ -0,0 +1,165 @@
+from lpppy.compiler.main import Compiler
+from lpppy.compiler.error import CompileError
+from lpppy.compiler.sourcemap import SourceMap
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import timeit
+import sys
+import io
+
+
+class Mismatch(Exception):
+    pass
+
+
+class ExpectedOutput(io.TextIOBase):
+    expected: str = ""
+    index: int = 0
+
+    def __init__(self, expected: str) -> None:
+        self.expected = expected
+        self.index = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        end = self.index + len(text)
+        chunk = self.expected[self.index : end]
+
+        if chunk != text:
+            offset = 0
+            while offset < len(chunk) and chunk[offset] == text[offset]:
+                offset += 1
+            # past the end of the expected output only trailing whitespace is
+            # tolerated, anything else is a mismatch
+            if offset < len(chunk) or text[offset:].strip():
+                self.mismatch(self.index + offset, text[offset:])
+
+        self.index = end
+        return len(text)
+
+    def finish(self) -> None:
+        if self.expected[self.index :].strip():
+            self.mismatch(self.index, "")
+
+    def mismatch(self, offset: int, got: str) -> None:
+        line = self.expected.count("\n", 0, offset) + 1
+        expected = self.expected[offset:].split("\n")[0]
+        got = got.split("\n")[0]
+        raise Mismatch(f"linha {line}: esperado {expected!r}, obtido {got!r}")
+
+
+class Tester:
+    file: str = ""
+    directory: str = ""
+    cases: list[Path] = []
+    jobs: int = 1
+
+    def __init__(self, argv: list[str]) -> None:
+        args = []
+        index = 0
+        while index < len(argv):
+            if argv[index] == "-j":
+                index += 1
+                self.jobs = int(argv[index])
+            elif argv[index].startswith("-j"):
+                self.jobs = int(argv[index][2:])
+            else:
+                args.append(argv[index])
+            index += 1
+
+        if len(args) != 2:
+            sys.tracebacklimit = 0
+            print("usage: lpppy test <file.lpp> <cases-dir> [-j N]")
+            exit(2)
+
+        self.file = args[0]
+        self.directory = args[1]
+        self.cases = sorted(Path(args[1]).glob("*.in"))
+
+    def run(self) -> int:
+        # a mistyped directory must not pass as an empty suite
+        if not self.cases:
+            print(f"no test cases found in {self.directory}", file=sys.stderr)
+            return 2
+
+        start = timeit.default_timer()
+        compiler = Compiler(Path(self.file).read_text())
+        try:
+            compiler.run()
+        except CompileError as error:
+            print(error.report(), file=sys.stderr)
+            return 1
+        compileTime = timeit.default_timer() - start
+
+        if self.jobs > 1 and len(self.cases) > 1:
+            with ProcessPoolExecutor(
+                self.jobs, initializer=load, initargs=(compiler, self.file)
+            ) as pool:
+                results = list(pool.map(runCase, self.cases))
+        else:
+            load(compiler, self.file)
+            results = [runCase(case) for case in self.cases]
+
+        self.report(results, compileTime)
+        return 0 if all(result[1] == "pass" for result in results) else 1
+
+    def report(self, results: list[tuple], compileTime: float) -> None:
+        width = max([len("case")] + [len(result[0]) for result in results])
+        print(f"{'case'.ljust(width)}  result  time (ms)")
+        for name, status, time, detail in results:
+            line = f"{name.ljust(width)}  {status.ljust(6)}  {time * 1000:9.3f}"
+            if detail:
+                line += f"  {detail}"
+            print(line)
+
+        counts = {"pass": 0, "fail": 0, "error": 0}
+        for result in results:
+            counts[result[1]] += 1
+        total = sum(result[2] for result in results)
+        print(
+            f"{counts['pass']} passed, {counts['fail']} failed, {counts['error']} errors"
+            f" in {total * 1000:.3f} ms (compile {compileTime * 1000:.3f} ms)"
+        )
+
+
+code = None
+sourceMap = None
+source = ""
+
+
+def load(compiler: Compiler, file: str) -> None:
+    global code, sourceMap, source
+    code = compile(compiler.stdout, file, "exec")
+    sourceMap = compiler.sourceMap
+    source = compiler.stdin
+
+
+def runCase(case: Path) -> tuple:
+    expectedFile = case.with_suffix(".out")
+    if not expectedFile.exists():
+        return (case.name, "error", 0.0, f"{expectedFile.name} não encontrado")
+
+    stdout = ExpectedOutput(expectedFile.read_text())
+    stdin = io.StringIO(case.read_text())
+    status, detail = "pass", ""
+
+    restore = sys.stdin, sys.stdout
+    sys.stdin, sys.stdout = stdin, stdout
+    start = timeit.default_timer()
+    try:
+        exec(code, {"__name__": "__main__"})
+        stdout.finish()
+    except Mismatch as mismatch:
+        status, detail = "fail", str(mismatch)
+    except Exception as error:
+        status, detail = "error", f"{type(error).__name__}: {error}"
+        frames = sourceMap.frames(error.__traceback__, code.co_filename, source)
+        if frames:
+            detail = f"linha {frames[-1].lineno}: {detail}"
+    finally:
+        time = timeit.default_timer() - start
+        sys.stdin, sys.stdout = restore
+
+    return (case.name, status, time, detail)
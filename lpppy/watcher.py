@@ -0,0 +1,97 @@
+from lpppy.compiler.main import Compiler
+from lpppy.compiler.error import CompileError
+from pathlib import Path
+import hashlib
+import timeit
+import time
+import sys
+
+
+class Watcher:
+    file: Path = None
+    interval: float = 0.25
+    execute: bool = False
+    cache: dict = {}
+    digest: str = ""
+
+    def __init__(self, argv: list[str]) -> None:
+        self.cache = {}
+        for arg in argv:
+            if arg == "--run":
+                self.execute = True
+            elif arg.startswith("--interval="):
+                self.interval = float(arg.split("=", 1)[1])
+            else:
+                self.file = Path(arg)
+
+        if not self.file:
+            sys.tracebacklimit = 0
+            print("usage: lpppy watch <file.lpp> [--run] [--interval=0.25]")
+            exit(2)
+
+    def run(self) -> int:
+        print(f"observando {self.file} (Ctrl+C para sair)")
+        mtime = None
+        try:
+            while True:
+                try:
+                    current = self.file.stat().st_mtime_ns
+                except FileNotFoundError:
+                    current = None
+                if current is not None and current != mtime:
+                    mtime = current
+                    self.build()
+                time.sleep(self.interval)
+        except KeyboardInterrupt:
+            return 0
+
+    def build(self) -> None:
+        source = self.file.read_text()
+        # editors touch files without changing them on save
+        digest = hashlib.sha256(source.encode()).hexdigest()
+        if digest == self.digest:
+            return
+        self.digest = digest
+
+        start = timeit.default_timer()
+        compiler = Compiler(source)
+        compiler.codegen.cache = self.cache
+        try:
+            compiler.run()
+        except CompileError as error:
+            print(error.report(), file=sys.stderr)
+            return
+        self.cache = compiler.codegen.units
+
+        name = self.file.name.split(".")[0]
+        build = Path("build")
+        build.mkdir(exist_ok=True)
+        (build / f"{name}.py").write_text(compiler.stdout)
+        (build / f"{name}.map.json").write_text(
+            compiler.sourceMap.dump(str(self.file.resolve()))
+        )
+
+        units = len(compiler.codegen.units)
+        reused = compiler.codegen.reused
+        print(
+            f"[{time.strftime('%H:%M:%S')}] build/{name}.py:"
+            f" {units - reused} de {units} unidades recompiladas"
+            f" em {(timeit.default_timer() - start) * 1000:.1f} ms"
+        )
+
+        if self.execute:
+            self.executeProgram(compiler)
+
+    def executeProgram(self, compiler: Compiler) -> None:
+        try:
+            code = compiler.compile(str(self.file))
+            exec(code, {"__name__": "__main__"})
+        except KeyboardInterrupt:
+            print("\nexecução interrompida")
+        except Exception as error:
+            print(
+                compiler.sourceMap.format(error, str(self.file), compiler.stdin),
+                file=sys.stderr,
+                end="",
+            )
+        sys.stdout.flush()
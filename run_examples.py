@@ -0,0 +1,219 @@
+from lpppy.compiler.main import Compiler
+from lpppy.compiler.error import CompileError
+from lpppy.tester import ExpectedOutput, Mismatch
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from types import SimpleNamespace
+import timeit
+import signal
+import json
+import sys
+import io
+import os
+
+
+class Timeout(Exception):
+    pass
+
+
+class Regression:
+    examples: Path = Path(__file__).parent / "examples"
+    fixtures: Path = examples / "fixtures"
+    files: list[Path] = []
+    # each example runs at every level, the passes must not change its output
+    levels: list[int] = [0, 1, 2]
+    jobs: int = os.cpu_count() or 1
+    timeout: int = 10
+    tolerance: float = 0.5
+    # differences below this are noise whatever the tolerance
+    slack: float = 0.005
+    baseline: dict = None
+    output: str = None
+    update: bool = False
+
+    def __init__(self, argv: list[str]) -> None:
+        names = []
+        levels = []
+        index = 0
+        while index < len(argv):
+            arg = argv[index]
+            if arg == "-j":
+                index += 1
+                self.jobs = int(argv[index])
+            elif arg.startswith("-j"):
+                self.jobs = int(arg[2:])
+            elif arg == "--timeout":
+                index += 1
+                self.timeout = int(argv[index])
+            elif arg == "--tolerance":
+                index += 1
+                self.tolerance = float(argv[index])
+            elif arg == "--baseline":
+                index += 1
+                self.baseline = json.loads(Path(argv[index]).read_text())
+            elif arg == "-o":
+                index += 1
+                self.output = argv[index]
+            elif arg == "--update":
+                self.update = True
+            elif arg in ("-O0", "-O1", "-O2"):
+                levels.append(int(arg[2]))
+            elif arg.startswith("-"):
+                print(
+                    "usage: python run_examples.py [example ...] [-O0|-O1|-O2 ...] "
+                    "[-j N] [--timeout s] [--update] [-o timings.json] "
+                    "[--baseline timings.json] [--tolerance 0.5]"
+                )
+                exit(2)
+            else:
+                names.append(Path(arg).stem)
+            index += 1
+
+        self.files = sorted(self.examples.glob("*.lpp"))
+        if names:
+            self.files = [file for file in self.files if file.stem in names]
+        self.levels = sorted(set(levels)) or self.levels
+        # the expected outputs are written at a single level
+        if self.update:
+            self.levels = self.levels[:1]
+
+    def run(self) -> int:
+        start = timeit.default_timer()
+        results = []
+        # one level after the other, so the outputs a new example gets at the
+        # first level are what the others are compared with
+        for level in self.levels:
+            tasks = [
+                (file, self.fixtures, self.timeout, self.update, level)
+                for file in self.files
+            ]
+            if self.jobs > 1 and len(tasks) > 1:
+                with ProcessPoolExecutor(self.jobs) as pool:
+                    results += pool.map(runExample, tasks)
+            else:
+                results += [runExample(task) for task in tasks]
+        wall = timeit.default_timer() - start
+
+        slow = self.compareTimings(results)
+        self.report(results, slow, wall)
+
+        if self.output:
+            timings = {
+                name: {"compile": compileTime, "run": runTime}
+                for name, status, compileTime, runTime, detail in results
+                if status == "pass"
+            }
+            Path(self.output).write_text(json.dumps(timings, indent=2))
+
+        failed = any(result[1] not in ("pass", "new") for result in results)
+        return 1 if failed or slow else 0
+
+    def compareTimings(self, results: list[tuple]) -> dict[str, float]:
+        slow = {}
+        if not self.baseline:
+            return slow
+
+        for name, status, compileTime, runTime, detail in results:
+            base = self.baseline.get(name)
+            if status != "pass" or not base:
+                continue
+            before = base["compile"] + base["run"]
+            now = compileTime + runTime
+            if now > before * (1 + self.tolerance) and now - before > self.slack:
+                slow[name] = now / before
+        return slow
+
+    def report(self, results: list[tuple], slow: dict[str, float], wall: float) -> None:
+        width = max([len("example")] + [len(result[0]) for result in results])
+        print(f"{'example'.ljust(width)}  result   compile (ms)  run (ms)")
+        counts = {}
+        for name, status, compileTime, runTime, detail in results:
+            counts[status] = counts.get(status, 0) + 1
+            line = (
+                f"{name.ljust(width)}  {status.ljust(7)}  "
+                f"{compileTime * 1000:12.3f}  {runTime * 1000:8.3f}"
+            )
+            if name in slow:
+                line += f"  {slow[name]:.2f}x mais lento que a base"
+            if detail:
+                line += f"  {detail}"
+            print(line)
+
+        compileTotal = sum(result[2] for result in results)
+        runTotal = sum(result[3] for result in results)
+        print(
+            ", ".join(f"{count} {status}" for status, count in sorted(counts.items()))
+            + (f", {len(slow)} slow" if slow else "")
+            + f" in {wall * 1000:.3f} ms"
+            f" (compile {compileTotal * 1000:.3f} ms, run {runTotal * 1000:.3f} ms,"
+            f" -j {self.jobs})"
+        )
+
+
+def alarm(signum, frame) -> None:
+    raise Timeout()
+
+
+def runExample(task: tuple) -> tuple:
+    file, fixtures, timeout, update, level = task
+    name = f"{file.stem} -O{level}"
+    stdinFile = fixtures / f"{file.stem}.in"
+    expectedFile = fixtures / f"{file.stem}.out"
+
+    start = timeit.default_timer()
+    try:
+        compiler = Compiler(file.read_text(), SimpleNamespace(optimize=level))
+        compiler.run()
+        code = compiler.compile(str(file))
+    except Exception as error:
+        if isinstance(error, CompileError):
+            detail = error.report().split("\n")[0]
+        else:
+            detail = f"{type(error).__name__}: {error}"
+        return (name, "error", timeit.default_timer() - start, 0.0, detail)
+    compileTime = timeit.default_timer() - start
+
+    if update or not expectedFile.exists():
+        stdout = io.StringIO()
+    else:
+        stdout = ExpectedOutput(expectedFile.read_text())
+    stdin = io.StringIO(stdinFile.read_text() if stdinFile.exists() else "")
+    status, detail = "pass", ""
+
+    restore = sys.stdin, sys.stdout
+    sys.stdin, sys.stdout = stdin, stdout
+    if hasattr(signal, "SIGALRM"):
+        signal.signal(signal.SIGALRM, alarm)
+        signal.alarm(timeout)
+    start = timeit.default_timer()
+    try:
+        exec(code, {"__name__": "__main__"})
+        if isinstance(stdout, ExpectedOutput):
+            stdout.finish()
+    except Mismatch as mismatch:
+        status, detail = "fail", str(mismatch)
+    except Timeout:
+        status, detail = "timeout", f"mais de {timeout} s"
+    except (Exception, SystemExit) as error:
+        status, detail = "error", f"{type(error).__name__}: {error}"
+        frames = compiler.sourceMap.frames(
+            error.__traceback__, code.co_filename, compiler.stdin
+        )
+        if frames:
+            detail = f"linha {frames[-1].lineno}: {detail}"
+    finally:
+        runTime = timeit.default_timer() - start
+        if hasattr(signal, "SIGALRM"):
+            signal.alarm(0)
+        sys.stdin, sys.stdout = restore
+
+    if isinstance(stdout, io.StringIO) and status == "pass":
+        expectedFile.write_text(stdout.getvalue())
+        if not update:
+            status, detail = "new", f"{expectedFile.name} criado"
+
+    return (name, status, compileTime, runTime, detail)
+
+
+if __name__ == "__main__":
+    exit(Regression(sys.argv[1:]).run())
@@ -1,16 +0,0 @@
-#!/bin/bash
-example_dir=./examples
-
-for example in "$example_dir"/*
-do
-  if [[ $example == *.lpp ]]
-  then
-    python3 lpp.py --debug-mode $example
-    if [ $? -ne 0 ]; then
-      echo "$example ❌"
-      exit
-    else
-      echo "$example ✅"
-    fi
-  fi
-done
\ No newline at end of file
@@ -32,6 +32,10 @@ setup(
         # Universal dependencies
         'setuptools',
     ],
+    extras_require={
+        # vectorised conjuntos with -O2
+        'numpy': ['numpy'],
+    },
     entry_points={
         "console_scripts": [
             "lpppy=lpppy.main:LPP",